@@ -0,0 +1,142 @@
+package com.example.screenshotapp
+
+import android.content.ComponentCallbacks2
+import android.graphics.Bitmap
+import java.nio.ByteBuffer
+
+// Pool bitmap dan direct ByteBuffer per ukuran, dipakai ulang oleh jalur capture
+// dan encode supaya save beruntun tidak terus mengalokasi (dan memicu GC/OOM).
+// Total byte yang ditahan dibatasi maxBytes; entri tertua dibuang lebih dulu.
+class BufferPool(maxBytes: Long = Runtime.getRuntime().maxMemory() / 8) {
+
+    var maxBytes: Long = maxBytes
+        set(value) {
+            synchronized(this) {
+                field = value
+                trimTo(value)
+            }
+        }
+
+    private val bitmaps = HashMap<Long, ArrayDeque<Bitmap>>()
+    private val buffers = HashMap<Int, ArrayDeque<ByteBuffer>>()
+
+    // Urutan pengembalian untuk eviction, tertua di depan
+    private val lru = ArrayDeque<Any>()
+
+    var pooledBytes = 0L
+        private set
+    var hits = 0L
+        private set
+    var misses = 0L
+        private set
+
+    companion object {
+        const val MIN_BUFFER_BYTES = 4096
+    }
+
+    @Synchronized
+    fun acquireBitmap(width: Int, height: Int): Bitmap {
+        val bitmap = bitmaps[bitmapKey(width, height)]?.removeLastOrNull()
+        if (bitmap != null) {
+            hits++
+            removeEntry(lru, bitmap)
+            pooledBytes -= bitmap.allocationByteCount
+            return bitmap
+        }
+        misses++
+        return Bitmap.createBitmap(width, height, Bitmap.Config.ARGB_8888)
+    }
+
+    @Synchronized
+    fun releaseBitmap(bitmap: Bitmap) {
+        if (bitmap.isRecycled || !bitmap.isMutable || bitmap.allocationByteCount > maxBytes) {
+            bitmap.recycle()
+            return
+        }
+        bitmaps.getOrPut(bitmapKey(bitmap.width, bitmap.height)) { ArrayDeque() }.addLast(bitmap)
+        lru.addLast(bitmap)
+        pooledBytes += bitmap.allocationByteCount
+        trimTo(maxBytes)
+    }
+
+    // Kapasitas dibulatkan ke pangkat dua supaya ukuran yang mirip berbagi bucket;
+    // limit buffer diset tepat ke size
+    @Synchronized
+    fun acquireBuffer(size: Int): ByteBuffer {
+        val capacity = bufferBucket(size)
+        val buffer = buffers[capacity]?.removeLastOrNull()
+        if (buffer != null) {
+            hits++
+            removeEntry(lru, buffer)
+            pooledBytes -= capacity
+        } else {
+            misses++
+        }
+        val result = buffer ?: ByteBuffer.allocateDirect(capacity)
+        result.clear()
+        result.limit(size)
+        return result
+    }
+
+    @Synchronized
+    fun releaseBuffer(buffer: ByteBuffer) {
+        if (!buffer.isDirect || buffer.capacity() != bufferBucket(buffer.capacity()) || buffer.capacity() > maxBytes) {
+            return
+        }
+        buffers.getOrPut(buffer.capacity()) { ArrayDeque() }.addLast(buffer)
+        lru.addLast(buffer)
+        pooledBytes += buffer.capacity()
+        trimTo(maxBytes)
+    }
+
+    // Dipanggil dari Service.onTrimMemory: makin tinggi tekanan, makin banyak yang dibuang
+    @Synchronized
+    fun onTrimMemory(level: Int) {
+        when {
+            level >= ComponentCallbacks2.TRIM_MEMORY_MODERATE -> trimTo(0)
+            level >= ComponentCallbacks2.TRIM_MEMORY_UI_HIDDEN -> trimTo(pooledBytes / 2)
+            level >= ComponentCallbacks2.TRIM_MEMORY_RUNNING_CRITICAL -> trimTo(0)
+            level >= ComponentCallbacks2.TRIM_MEMORY_RUNNING_LOW -> trimTo(pooledBytes / 4)
+            level >= ComponentCallbacks2.TRIM_MEMORY_RUNNING_MODERATE -> trimTo(pooledBytes / 2)
+        }
+    }
+
+    @Synchronized
+    fun clear() {
+        trimTo(0)
+    }
+
+    @Synchronized
+    override fun toString(): String {
+        return "BufferPool(hits=$hits, misses=$misses, pooled=${pooledBytes / 1024} KB, max=${maxBytes / 1024} KB)"
+    }
+
+    private fun trimTo(bytes: Long) {
+        while (pooledBytes > bytes) {
+            when (val entry = lru.removeFirstOrNull() ?: break) {
+                is Bitmap -> {
+                    bitmaps[bitmapKey(entry.width, entry.height)]?.let { removeEntry(it, entry) }
+                    pooledBytes -= entry.allocationByteCount
+                    entry.recycle()
+                }
+                is ByteBuffer -> {
+                    buffers[entry.capacity()]?.let { removeEntry(it, entry) }
+                    pooledBytes -= entry.capacity()
+                }
+            }
+        }
+    }
+
+    // Dibandingkan per identitas: ByteBuffer.equals membandingkan isi buffer
+    private fun <T> removeEntry(deque: ArrayDeque<T>, entry: Any) {
+        val index = deque.indexOfFirst { it === entry }
+        if (index >= 0) deque.removeAt(index)
+    }
+
+    private fun bitmapKey(width: Int, height: Int): Long = (width.toLong() shl 32) or height.toLong()
+
+    private fun bufferBucket(size: Int): Int {
+        if (size <= MIN_BUFFER_BYTES) return MIN_BUFFER_BYTES
+        return Integer.highestOneBit(size - 1) shl 1
+    }
+}
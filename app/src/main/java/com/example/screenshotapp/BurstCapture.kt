@@ -0,0 +1,176 @@
+package com.example.screenshotapp
+
+import android.os.Handler
+import android.os.Looper
+import android.os.SystemClock
+import java.io.File
+import java.util.concurrent.atomic.AtomicInteger
+import java.util.concurrent.atomic.AtomicLong
+
+// Satu frame burst: crop semua rectangle dari satu frame layar
+class BurstFrame(val index: Int, val regions: List<CroppedRegion>)
+
+// Ring buffer ukuran tetap antara capture (produsen) dan worker encode (konsumen).
+// Kalau penuh, frame baru ditolak; tidak pernah menunggu.
+class FrameRing(capacity: Int) {
+
+    private val slots = arrayOfNulls<BurstFrame>(capacity)
+    private var head = 0
+    private var count = 0
+
+    @Synchronized
+    fun offer(frame: BurstFrame): Boolean {
+        if (count == slots.size) return false
+        slots[(head + count) % slots.size] = frame
+        count++
+        return true
+    }
+
+    @Synchronized
+    fun poll(): BurstFrame? {
+        if (count == 0) return null
+        val frame = slots[head]
+        slots[head] = null
+        head = (head + 1) % slots.size
+        count--
+        return frame
+    }
+}
+
+class BurstStats(val captured: Int, val dropped: Int, val failed: Int, val bytes: Long, val encodeMs: Long, val wallMs: Long)
+
+// Mode burst: rectangle yang sama di-capture tiap intervalMs selama durationMs dari
+// sesi capture yang sudah hangat. Crop masuk ring buffer lalu di-encode paralel;
+// kalau encoder tertinggal, frame di-drop dan dihitung, bukan ditunggu.
+class BurstCapture(
+    private val session: CaptureSession,
+    private val pipeline: EncodePipeline,
+    private val pool: BufferPool,
+    private val regions: RectangleStore,
+    private val dir: File,
+    private val baseName: String,
+    private val settings: EncoderSettings,
+    private val intervalMs: Long = DEFAULT_INTERVAL_MS,
+    private val durationMs: Long = DEFAULT_DURATION_MS,
+    private val onFinished: (BurstStats) -> Unit
+) {
+
+    companion object {
+        const val DEFAULT_INTERVAL_MS = 200L
+        const val DEFAULT_DURATION_MS = 30_000L
+        const val RING_CAPACITY = 8
+    }
+
+    private val mainHandler = Handler(Looper.getMainLooper())
+    private val ring = FrameRing(RING_CAPACITY)
+
+    // Semua field di bawah ini kecuali yang atomic hanya diakses dari main thread
+    private var startTime = 0L
+    private var nextTick = 0L
+    private var frameIndex = 0
+    private var awaitingFrame = false
+    private var running = false
+    private var finished = false
+
+    private val captured = AtomicInteger(0)
+    private val dropped = AtomicInteger(0)
+    private val failed = AtomicInteger(0)
+    private val inFlight = AtomicInteger(0)
+    private val bytes = AtomicLong(0)
+    private val encodeNanos = AtomicLong(0)
+
+    private val tick = Runnable { onTick() }
+
+    val isRunning: Boolean
+        get() = running
+
+    fun start() {
+        running = true
+        startTime = SystemClock.uptimeMillis()
+        nextTick = startTime
+        onTick()
+    }
+
+    fun stop() {
+        if (!running) return
+        running = false
+        mainHandler.removeCallbacks(tick)
+        finishIfIdle()
+    }
+
+    private fun onTick() {
+        if (!running) return
+        if (SystemClock.uptimeMillis() - startTime >= durationMs) {
+            stop()
+            return
+        }
+
+        val index = frameIndex++
+        if (awaitingFrame) {
+            // Frame sebelumnya belum datang; tick ini dilewati
+            dropped.incrementAndGet()
+        } else {
+            awaitingFrame = true
+            session.requestFrame(regions) { crops -> onFrame(index, crops) }
+        }
+
+        // Jadwal berdasarkan waktu mulai supaya interval tidak bergeser
+        nextTick += intervalMs
+        mainHandler.postAtTime(tick, nextTick)
+    }
+
+    private fun onFrame(index: Int, crops: List<CroppedRegion>?) {
+        awaitingFrame = false
+        if (crops == null) {
+            // Sesi capture berhenti di tengah burst
+            stop()
+            return
+        }
+        if (!running) {
+            // Frame yang datang setelah burst dihentikan tidak disimpan
+            crops.forEach { pool.releaseBitmap(it.bitmap) }
+            finishIfIdle()
+            return
+        }
+
+        if (ring.offer(BurstFrame(index, crops))) {
+            captured.incrementAndGet()
+            inFlight.incrementAndGet()
+            pipeline.execute { drainOne() }
+        } else {
+            dropped.incrementAndGet()
+            crops.forEach { pool.releaseBitmap(it.bitmap) }
+        }
+        finishIfIdle()
+    }
+
+    private fun drainOne() {
+        val frame = ring.poll() ?: return
+        frame.regions.forEach { region ->
+            try {
+                val fileName = settings.encoder.fileName(baseName, region.number, region.bitmap, frame.index)
+                bytes.addAndGet(pipeline.writeRegion(region, File(dir, fileName), settings, encodeNanos))
+            } catch (e: Exception) {
+                e.printStackTrace()
+                failed.incrementAndGet()
+            }
+        }
+        inFlight.decrementAndGet()
+        mainHandler.post { finishIfIdle() }
+    }
+
+    private fun finishIfIdle() {
+        if (running || finished || awaitingFrame || inFlight.get() > 0) return
+        finished = true
+        onFinished(
+            BurstStats(
+                captured.get(),
+                dropped.get(),
+                failed.get(),
+                bytes.get(),
+                encodeNanos.get() / 1_000_000,
+                SystemClock.uptimeMillis() - startTime
+            )
+        )
+    }
+}
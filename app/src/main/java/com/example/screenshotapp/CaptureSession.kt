@@ -0,0 +1,241 @@
+package com.example.screenshotapp
+
+import android.graphics.Bitmap
+import android.graphics.PixelFormat
+import android.hardware.display.DisplayManager
+import android.hardware.display.VirtualDisplay
+import android.media.Image
+import android.media.ImageReader
+import android.media.projection.MediaProjection
+import android.os.Handler
+import android.os.HandlerThread
+import android.os.Looper
+import android.os.SystemClock
+
+// Hasil crop satu rectangle, seukuran rectangle itu sendiri
+class CroppedRegion(val number: Int, val bitmap: Bitmap)
+
+// Sesi capture yang dibuat sekali per izin MediaProjection dan tetap hangat.
+// VirtualDisplay terus mengisi ImageReader; frame terakhir disimpan sehingga
+// permintaan save cukup menunggu satu frame, bukan delay tetap.
+class CaptureSession(
+    private val projection: MediaProjection,
+    private var width: Int,
+    private var height: Int,
+    private var densityDpi: Int,
+    private val pool: BufferPool,
+    private val onStopped: () -> Unit
+) : ImageReader.OnImageAvailableListener {
+
+    private val thread = HandlerThread("CaptureSession").apply { start() }
+    private val handler = Handler(thread.looper)
+    private val mainHandler = Handler(Looper.getMainLooper())
+
+    // Satu frame ditahan, sisanya untuk acquireLatestImage. Diganti saat layar berputar.
+    private var imageReader = newImageReader(width, height)
+    private var virtualDisplay: VirtualDisplay? = null
+
+    // Hanya diakses dari thread capture
+    private var latestImage: Image? = null
+    private val pending = mutableListOf<FrameRequest>()
+    private var stopped = false
+    private val frameTimeout = Runnable {
+        deliver()
+        scheduleTimeout()
+    }
+
+    private val projectionCallback = object : MediaProjection.Callback() {
+        override fun onStop() {
+            release()
+            thread.quitSafely()
+            mainHandler.post(onStopped)
+        }
+    }
+
+    private class FrameRequest(
+        val regions: RectangleStore,
+        val notBeforeNanos: Long,
+        val deadline: Long,
+        val trace: SaveTrace?,
+        val callback: (List<CroppedRegion>?) -> Unit
+    )
+
+    companion object {
+        // Batas menunggu frame setelah notBeforeNanos; perubahan layar yang
+        // ditunggu biasanya muncul dalam satu-dua vsync
+        const val FRESH_FRAME_TIMEOUT_MS = 500L
+        // Tanpa notBeforeNanos frame yang ditahan selalu cukup, jadi hanya
+        // menunggu frame pertama
+        private const val NO_DEADLINE = Long.MAX_VALUE
+    }
+
+    fun start() {
+        imageReader.setOnImageAvailableListener(this, handler)
+        projection.registerCallback(projectionCallback, handler)
+        virtualDisplay = projection.createVirtualDisplay(
+            "ScreenCapture",
+            width,
+            height,
+            densityDpi,
+            DisplayManager.VIRTUAL_DISPLAY_FLAG_AUTO_MIRROR,
+            imageReader.surface,
+            null,
+            handler
+        )
+    }
+
+    // Dipanggil saat layar berputar atau ukuran display berubah. VirtualDisplay yang
+    // sama dipakai ulang (resize + setSurface) dengan ImageReader baru seukuran layar;
+    // frame lama yang ukurannya sudah tidak cocok dibuang.
+    fun resize(width: Int, height: Int, densityDpi: Int) {
+        handler.post {
+            if (stopped) return@post
+            if (width == this.width && height == this.height && densityDpi == this.densityDpi) return@post
+            val reader = newImageReader(width, height)
+            reader.setOnImageAvailableListener(this, handler)
+            virtualDisplay?.resize(width, height, densityDpi)
+            virtualDisplay?.setSurface(reader.surface)
+
+            imageReader.setOnImageAvailableListener(null, null)
+            latestImage?.close()
+            latestImage = null
+            imageReader.close()
+            imageReader = reader
+            this.width = width
+            this.height = height
+            this.densityDpi = densityDpi
+        }
+    }
+
+    // Callback dipanggil di main thread dengan crop tiap region dari frame berikutnya
+    // (null kalau sesi berhenti). Region di luar layar dilewati.
+    // Dengan notBeforeNanos (basis System.nanoTime, sama dengan timestamp Image) hanya
+    // frame yang dibuat sesudahnya yang dipakai, misalnya setelah panel disembunyikan;
+    // kalau frame itu tidak datang dalam FRESH_FRAME_TIMEOUT_MS callback menerima null.
+    // Trace (kalau ada) menerima tahap frame_wait, crop dan copy_pixels.
+    fun requestFrame(
+        regions: RectangleStore,
+        notBeforeNanos: Long = 0L,
+        trace: SaveTrace? = null,
+        callback: (List<CroppedRegion>?) -> Unit
+    ) {
+        // Setelah thread capture berhenti post ditolak; callback tetap harus dipanggil
+        val posted = handler.post {
+            if (stopped) {
+                mainHandler.post { callback(null) }
+                return@post
+            }
+            val deadline = if (notBeforeNanos > 0) SystemClock.uptimeMillis() + FRESH_FRAME_TIMEOUT_MS else NO_DEADLINE
+            trace?.begin(SaveTrace.FRAME_WAIT)
+            pending.add(FrameRequest(regions, notBeforeNanos, deadline, trace, callback))
+            // Frame yang sudah ditahan mungkin sudah cukup baru
+            deliver()
+            scheduleTimeout()
+        }
+        if (!posted) {
+            mainHandler.post { callback(null) }
+        }
+    }
+
+    override fun onImageAvailable(reader: ImageReader) {
+        val image = try {
+            reader.acquireLatestImage()
+        } catch (e: IllegalStateException) {
+            null
+        } ?: return
+
+        latestImage?.close()
+        latestImage = image
+        deliver()
+        scheduleTimeout()
+    }
+
+    // Permintaan dilayani dari frame yang ditahan kalau frame itu cukup baru. Setelah
+    // batas waktunya lewat permintaan dijawab null: frame lama bisa masih memuat
+    // panel yang sedang disembunyikan.
+    private fun deliver() {
+        if (pending.isEmpty()) return
+        val image = latestImage
+        val now = SystemClock.uptimeMillis()
+
+        val ready = pending.filter { request ->
+            (image != null && image.timestamp >= request.notBeforeNanos) || now >= request.deadline
+        }
+        if (ready.isEmpty()) return
+        pending.removeAll(ready)
+        val deliveries = ready.map { request ->
+            request.trace?.end(SaveTrace.FRAME_WAIT)
+            val crops = if (image != null && image.timestamp >= request.notBeforeNanos) {
+                crop(image, request.regions, request.trace)
+            } else {
+                null
+            }
+            request to crops
+        }
+        mainHandler.post { deliveries.forEach { (request, crops) -> request.callback(crops) } }
+    }
+
+    private fun newImageReader(width: Int, height: Int): ImageReader {
+        return ImageReader.newInstance(width, height, PixelFormat.RGBA_8888, 3)
+    }
+
+    private fun scheduleTimeout() {
+        handler.removeCallbacks(frameTimeout)
+        val deadline = pending.minOfOrNull { it.deadline } ?: return
+        if (deadline != NO_DEADLINE) {
+            handler.postAtTime(frameTimeout, deadline)
+        }
+    }
+
+    // Baris tiap region dibaca langsung dari buffer plane ke buffer seukuran region,
+    // tanpa bitmap layar penuh di tengahnya
+    private fun crop(image: Image, regions: RectangleStore, trace: SaveTrace?): List<CroppedRegion> {
+        val plane = image.planes[0]
+        val crops = ArrayList<CroppedRegion>(regions.size)
+        regions.forEach { id ->
+            val region = RegionCropper.clip(
+                regions.left(id), regions.top(id), regions.right(id), regions.bottom(id), image.width, image.height
+            ) ?: return@forEach
+            val byteCount = RegionCropper.byteCount(region, plane.pixelStride)
+            val pixels = pool.acquireBuffer(byteCount)
+            SaveTrace.section(trace, SaveTrace.CROP) {
+                RegionCropper.copyRegion(plane.buffer, plane.rowStride, plane.pixelStride, region, pixels)
+            }
+            pixels.rewind()
+
+            val bitmap = pool.acquireBitmap(region.width, region.height)
+            SaveTrace.section(trace, SaveTrace.COPY_PIXELS) {
+                bitmap.copyPixelsFromBuffer(pixels)
+            }
+            trace?.addBytes(SaveTrace.CROP, byteCount.toLong())
+            pool.releaseBuffer(pixels)
+            crops.add(CroppedRegion(regions.number(id), bitmap))
+        }
+        return crops
+    }
+
+    private fun release() {
+        if (stopped) return
+        stopped = true
+        handler.removeCallbacks(frameTimeout)
+        virtualDisplay?.release()
+        virtualDisplay = null
+        imageReader.setOnImageAvailableListener(null, null)
+        latestImage?.close()
+        latestImage = null
+        imageReader.close()
+
+        val callbacks = pending.toList()
+        pending.clear()
+        mainHandler.post { callbacks.forEach { it.callback(null) } }
+    }
+
+    fun stop() {
+        handler.post {
+            projection.unregisterCallback(projectionCallback)
+            release()
+            projection.stop()
+            thread.quitSafely()
+        }
+    }
+}
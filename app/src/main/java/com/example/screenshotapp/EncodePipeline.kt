@@ -0,0 +1,178 @@
+package com.example.screenshotapp
+
+import android.app.NotificationManager
+import android.content.Context
+import android.os.Handler
+import android.os.Looper
+import android.os.SystemClock
+import android.util.Log
+import android.widget.Toast
+import androidx.core.app.NotificationCompat
+import java.io.File
+import java.io.FileOutputStream
+import java.util.concurrent.ExecutorService
+import java.util.concurrent.Executors
+import java.util.concurrent.atomic.AtomicInteger
+import java.util.concurrent.atomic.AtomicLong
+
+// Encode + tulis file di worker pool seukuran jumlah core, supaya
+// main thread (dan overlay) tidak pernah menunggu compress.
+// Progres ditampilkan di satu notifikasi, lalu satu ringkasan di akhir.
+class EncodePipeline(
+    private val context: Context,
+    private val pool: BufferPool,
+    workers: Int = Runtime.getRuntime().availableProcessors()
+) {
+
+    private val executor: ExecutorService = Executors.newFixedThreadPool(workers.coerceAtLeast(1))
+    private val mainHandler = Handler(Looper.getMainLooper())
+    private val notificationManager = context.getSystemService(NotificationManager::class.java)
+
+    companion object {
+        const val NOTIFICATION_ID = 2
+        const val CHANNEL_ID = "screenshot_service"
+
+        // Batas frekuensi update notifikasi progres
+        const val PROGRESS_INTERVAL_MS = 200L
+
+        // Satu baris per save: waktu encode dan ukuran output per encoder
+        const val STATS_FILE = "encode_stats.csv"
+    }
+
+    private inner class Batch(val total: Int, val dir: File, val settings: EncoderSettings, val trace: SaveTrace?) {
+        val startTime = SystemClock.elapsedRealtime()
+        val done = AtomicInteger(0)
+        val failed = AtomicInteger(0)
+        val encodeNanos = AtomicLong(0)
+        val bytes = AtomicLong(0)
+        @Volatile var lastProgress = 0L
+    }
+
+    // Bitmap tiap region dikembalikan ke pool setelah ditulis
+    fun save(regions: List<CroppedRegion>, dir: File, baseName: String, settings: EncoderSettings, trace: SaveTrace? = null) {
+        if (regions.isEmpty()) {
+            trace?.finish()
+            return
+        }
+
+        val batch = Batch(regions.size, dir, settings, trace)
+        showProgress(batch, 0)
+        regions.forEach { region ->
+            executor.execute { encode(batch, region, baseName) }
+        }
+    }
+
+    // Jalankan pekerjaan lain (misalnya frame burst) di worker pool yang sama
+    fun execute(task: () -> Unit) {
+        executor.execute(task)
+    }
+
+    // Encode satu region ke file dan kembalikan jumlah byte yang ditulis; waktu encode
+    // ditambahkan ke encodeNanos. Bitmap selalu dikembalikan ke pool.
+    fun writeRegion(
+        region: CroppedRegion,
+        file: File,
+        settings: EncoderSettings,
+        encodeNanos: AtomicLong,
+        trace: SaveTrace? = null
+    ): Long {
+        try {
+            val bytes = SaveTrace.section(trace, SaveTrace.WRITE) {
+                FileOutputStream(file).use { fos ->
+                    val start = System.nanoTime()
+                    SaveTrace.section(trace, SaveTrace.ENCODE) {
+                        settings.encoder.encode(region.bitmap, settings.quality, fos, pool)
+                    }
+                    encodeNanos.addAndGet(System.nanoTime() - start)
+                    fos.channel.position()
+                }
+            }
+            trace?.addBytes(SaveTrace.WRITE, bytes)
+            return bytes
+        } finally {
+            pool.releaseBitmap(region.bitmap)
+        }
+    }
+
+    private fun encode(batch: Batch, region: CroppedRegion, baseName: String) {
+        try {
+            val fileName = batch.settings.encoder.fileName(baseName, region.number, region.bitmap)
+            batch.bytes.addAndGet(
+                writeRegion(region, File(batch.dir, fileName), batch.settings, batch.encodeNanos, batch.trace)
+            )
+        } catch (e: Exception) {
+            e.printStackTrace()
+            batch.failed.incrementAndGet()
+        }
+
+        val done = batch.done.incrementAndGet()
+        if (done == batch.total) {
+            showSummary(batch)
+        } else {
+            val now = SystemClock.elapsedRealtime()
+            if (now - batch.lastProgress >= PROGRESS_INTERVAL_MS) {
+                batch.lastProgress = now
+                showProgress(batch, done)
+            }
+        }
+    }
+
+    private fun showProgress(batch: Batch, done: Int) {
+        val notification = NotificationCompat.Builder(context, CHANNEL_ID)
+            .setContentTitle("Menyimpan screenshot")
+            .setContentText("$done / ${batch.total}")
+            .setSmallIcon(android.R.drawable.ic_menu_save)
+            .setProgress(batch.total, done, false)
+            .setOnlyAlertOnce(true)
+            .setOngoing(true)
+            .build()
+        notificationManager.notify(NOTIFICATION_ID, notification)
+    }
+
+    private fun showSummary(batch: Batch) {
+        val saved = batch.total - batch.failed.get()
+        val wallMs = SystemClock.elapsedRealtime() - batch.startTime
+        val encodeMs = batch.encodeNanos.get() / 1_000_000
+        val text = if (batch.failed.get() == 0) {
+            "Tersimpan $saved gambar ${batch.settings.encoder.label}, ${batch.bytes.get() / 1024} KB " +
+                "dalam ${String.format("%.1f", wallMs / 1000.0)} detik"
+        } else {
+            "Tersimpan $saved dari ${batch.total} gambar, ${batch.failed.get()} gagal"
+        }
+        recordStats(batch, saved, encodeMs, wallMs)
+        batch.trace?.finish()
+
+        val notification = NotificationCompat.Builder(context, CHANNEL_ID)
+            .setContentTitle("Screenshot selesai")
+            .setContentText(text)
+            .setSmallIcon(android.R.drawable.ic_menu_save)
+            .setAutoCancel(true)
+            .build()
+        notificationManager.notify(NOTIFICATION_ID, notification)
+        Log.d("EncodePipeline", "$text, $pool")
+        mainHandler.post { Toast.makeText(context, text, Toast.LENGTH_SHORT).show() }
+    }
+
+    private fun recordStats(batch: Batch, saved: Int, encodeMs: Long, wallMs: Long) {
+        try {
+            val file = File(batch.dir, STATS_FILE)
+            val header = if (file.exists()) "" else "timestamp,encoder,quality,images,bytes,encode_ms,wall_ms\n"
+            val quality = if (batch.settings.encoder.usesQuality) batch.settings.quality.toString() else ""
+            synchronized(this) {
+                file.appendText(header + "${System.currentTimeMillis()},${batch.settings.encoder.name},$quality," +
+                    "$saved,${batch.bytes.get()},$encodeMs,$wallMs\n")
+            }
+        } catch (e: Exception) {
+            e.printStackTrace()
+        }
+    }
+
+    // Setelah shutdown executor menolak task baru (RejectedExecutionException)
+    val isShutdown: Boolean
+        get() = executor.isShutdown
+
+    fun shutdown() {
+        // Antrean yang sudah masuk tetap diselesaikan
+        executor.shutdown()
+    }
+}
@@ -3,24 +3,20 @@ package com.example.screenshotapp
 import android.app.*
 import android.content.Context
 import android.content.Intent
+import android.content.res.Configuration
 import android.graphics.*
-import android.hardware.display.DisplayManager
-import android.hardware.display.VirtualDisplay
-import android.media.Image
-import android.media.ImageReader
-import android.media.projection.MediaProjection
 import android.media.projection.MediaProjectionManager
 import android.os.Build
 import android.os.Handler
 import android.os.IBinder
 import android.os.Looper
+import android.os.SystemClock
 import android.util.DisplayMetrics
+import android.util.Log
 import android.view.*
 import android.widget.*
 import androidx.core.app.NotificationCompat
 import java.io.File
-import java.io.FileOutputStream
-import java.nio.ByteBuffer
 
 class FloatingWindowService : Service() {
 
@@ -31,18 +27,44 @@ class FloatingWindowService : Service() {
     private lateinit var overlayParams: WindowManager.LayoutParams
     
     private var isOverlayVisible = false
-    private val rectangles = mutableListOf<RectangleData>()
+    // Satu store dipakai bersama canvas; capture mendapat salinannya
+    private val rectangleStore = RectangleStore()
     private var currentRectIndex = 1
     private var imageName = "screenshot"
+    private var encoderSettings = EncoderSettings()
     
-    private var mediaProjection: MediaProjection? = null
-    private var imageReader: ImageReader? = null
-    private var virtualDisplay: VirtualDisplay? = null
+    // Dibuat sekali per izin MediaProjection, dipakai ulang untuk setiap save
+    private var captureSession: CaptureSession? = null
+    private var pendingSave = false
+    private var pendingSaveTrace: SaveTrace? = null
+    private var saveCount = 0
+    private var pendingBurst = false
+    // Save yang sedang menunggu frame; Save lain diabaikan sampai selesai supaya
+    // panel tidak dimunculkan lagi di tengah capture berikutnya
+    private var captureInProgress = false
+    private var burstCapture: BurstCapture? = null
+    private lateinit var encodePipeline: EncodePipeline
+    
+    // Bitmap dan buffer crop dipakai ulang antar save
+    val bufferPool = BufferPool()
+    
+    private val mainHandler = Handler(Looper.getMainLooper())
+    // Panel tidak boleh tetap tersembunyi kalau frame tidak pernah datang
+    private val restoreAfterCapture = Runnable { showAfterCapture() }
+    
+    // Layout disimpan ke journal setiap edit dan dimuat lagi saat service start
+    private lateinit var layoutStorage: LayoutStorage
     
     companion object {
         const val MEDIA_PROJECTION_REQUEST_CODE = 200
-        var mediaProjectionResultCode: Int = 0
-        var mediaProjectionData: Intent? = null
+        const val ACTION_PROJECTION_GRANTED = "com.example.screenshotapp.PROJECTION_GRANTED"
+        const val ACTION_PROJECTION_DENIED = "com.example.screenshotapp.PROJECTION_DENIED"
+        
+        // Batas menunggu commit frame tanpa panel, dan batas total panel disembunyikan
+        const val HIDE_TIMEOUT_MS = 200L
+        const val CAPTURE_RESTORE_TIMEOUT_MS = 2000L
+        const val EXTRA_RESULT_CODE = "result_code"
+        const val EXTRA_RESULT_DATA = "result_data"
     }
 
     override fun onCreate() {
@@ -51,9 +73,35 @@ class FloatingWindowService : Service() {
         startForeground(1, createNotification())
         
         windowManager = getSystemService(Context.WINDOW_SERVICE) as WindowManager
+        encodePipeline = EncodePipeline(this, bufferPool)
+        restoreLayout()
         createFloatingButtons()
     }
 
+    override fun onStartCommand(intent: Intent?, flags: Int, startId: Int): Int {
+        if (intent?.action == ACTION_PROJECTION_GRANTED) {
+            val data = intent.getParcelableExtra<Intent>(EXTRA_RESULT_DATA)
+            if (data != null) {
+                startCaptureSession(intent.getIntExtra(EXTRA_RESULT_CODE, 0), data)
+            }
+            if (pendingSave) {
+                pendingSave = false
+                captureAndSaveScreenshots()
+            }
+            if (pendingBurst) {
+                pendingBurst = false
+                startBurst()
+            }
+        } else if (intent?.action == ACTION_PROJECTION_DENIED) {
+            // Tanpa ini save/burst lama ikut jalan saat izin diberikan lain kali
+            pendingSave = false
+            pendingSaveTrace = null
+            pendingBurst = false
+            Toast.makeText(this, "Izin capture layar ditolak", Toast.LENGTH_SHORT).show()
+        }
+        return START_NOT_STICKY
+    }
+
     private fun createFloatingButtons() {
         floatingView = LayoutInflater.from(this).inflate(R.layout.floating_buttons, null)
         
@@ -82,7 +130,10 @@ class FloatingWindowService : Service() {
     private fun setupButtonListeners() {
         val btnCrop = floatingView.findViewById<Button>(R.id.btnCrop)
         val btnSave = floatingView.findViewById<Button>(R.id.btnSave)
+        val btnBurst = floatingView.findViewById<Button>(R.id.btnBurst)
         val btnName = floatingView.findViewById<Button>(R.id.btnName)
+        val btnFormat = floatingView.findViewById<Button>(R.id.btnFormat)
+        val btnLoad = floatingView.findViewById<Button>(R.id.btnLoad)
         val btnClose = floatingView.findViewById<Button>(R.id.btnClose)
         
         btnCrop.setOnClickListener {
@@ -92,17 +143,35 @@ class FloatingWindowService : Service() {
         }
         
         btnSave.setOnClickListener {
-            if (rectangles.isNotEmpty()) {
+            if (!rectangleStore.isEmpty()) {
                 captureAndSaveScreenshots()
             } else {
                 Toast.makeText(this, "Buat rectangle terlebih dahulu", Toast.LENGTH_SHORT).show()
             }
         }
         
+        btnBurst.setOnClickListener {
+            if (burstCapture?.isRunning == true) {
+                burstCapture?.stop()
+            } else if (!rectangleStore.isEmpty()) {
+                startBurst()
+            } else {
+                Toast.makeText(this, "Buat rectangle terlebih dahulu", Toast.LENGTH_SHORT).show()
+            }
+        }
+        
         btnName.setOnClickListener {
             showNameDialog()
         }
         
+        btnFormat.setOnClickListener {
+            showFormatDialog()
+        }
+        
+        btnLoad.setOnClickListener {
+            showLayoutDialog()
+        }
+        
         btnClose.setOnClickListener {
             stopSelf()
         }
@@ -137,14 +206,18 @@ class FloatingWindowService : Service() {
         val canvas = overlayView.findViewById<OverlayCanvas>(R.id.overlayCanvas)
         val btnDone = overlayView.findViewById<Button>(R.id.btnDone)
         
-        canvas.setRectangles(rectangles)
+        canvas.setStore(rectangleStore)
         canvas.setRectNumberStart(currentRectIndex)
-        canvas.onRectangleCreated = { rectData ->
-            rectangles.add(rectData)
+        canvas.onRectangleCreated = { id ->
             currentRectIndex++
+            layoutStorage.put(rectangleStore, id)
+            layoutStorage.putMeta(layoutMeta())
+        }
+        canvas.onRectangleDeleted = { id ->
+            layoutStorage.remove(id)
         }
-        canvas.onRectangleDeleted = { rectData ->
-            rectangles.remove(rectData)
+        canvas.onRectangleChanged = { id ->
+            layoutStorage.put(rectangleStore, id)
         }
         
         btnDone.setOnClickListener {
@@ -169,6 +242,103 @@ class FloatingWindowService : Service() {
             .setView(dialogView)
             .setPositiveButton("OK") { _, _ ->
                 imageName = editText.text.toString().ifEmpty { "screenshot" }
+                layoutStorage.putMeta(layoutMeta())
+            }
+            .setNegativeButton("Batal", null)
+            .create()
+        
+        if (Build.VERSION.SDK_INT >= Build.VERSION_CODES.O) {
+            dialog.window?.setType(WindowManager.LayoutParams.TYPE_APPLICATION_OVERLAY)
+        } else {
+            dialog.window?.setType(WindowManager.LayoutParams.TYPE_PHONE)
+        }
+        
+        dialog.show()
+    }
+
+    private fun showFormatDialog() {
+        val dialogView = LayoutInflater.from(this).inflate(R.layout.dialog_format, null)
+        val spinner = dialogView.findViewById<Spinner>(R.id.spFormat)
+        val editQuality = dialogView.findViewById<EditText>(R.id.etQuality)
+        
+        val encoders = OutputEncoder.values()
+        spinner.adapter = ArrayAdapter(
+            this,
+            android.R.layout.simple_spinner_dropdown_item,
+            encoders.map { it.label }
+        )
+        spinner.setSelection(encoders.indexOf(encoderSettings.encoder))
+        editQuality.setText(encoderSettings.quality.toString())
+        
+        val dialog = AlertDialog.Builder(this, R.style.Theme_AppCompat_Dialog)
+            .setTitle("Format Gambar")
+            .setView(dialogView)
+            .setPositiveButton("OK") { _, _ ->
+                val quality = editQuality.text.toString().toIntOrNull() ?: encoderSettings.quality
+                encoderSettings = EncoderSettings(encoders[spinner.selectedItemPosition], quality.coerceIn(0, 100))
+            }
+            .setNegativeButton("Batal", null)
+            .create()
+        
+        if (Build.VERSION.SDK_INT >= Build.VERSION_CODES.O) {
+            dialog.window?.setType(WindowManager.LayoutParams.TYPE_APPLICATION_OVERLAY)
+        } else {
+            dialog.window?.setType(WindowManager.LayoutParams.TYPE_PHONE)
+        }
+        
+        dialog.show()
+    }
+
+    private fun restoreLayout() {
+        val start = SystemClock.elapsedRealtimeNanos()
+        layoutStorage = LayoutStorage(File(filesDir, "layouts"))
+        layoutStorage.restore(rectangleStore)?.let { meta ->
+            currentRectIndex = meta.nextIndex
+            imageName = meta.imageName
+        }
+        val elapsedUs = (SystemClock.elapsedRealtimeNanos() - start) / 1000
+        Log.d("FloatingWindowService", "Layout dimuat: ${rectangleStore.size} rectangle dalam $elapsedUs µs")
+    }
+
+    private fun layoutMeta(): LayoutMeta = LayoutMeta(currentRectIndex, imageName)
+
+    private fun showLayoutDialog() {
+        val presets = layoutStorage.listPresets()
+        val options = arrayOf("Simpan layout sebagai...") + presets.toTypedArray()
+        
+        val dialog = AlertDialog.Builder(this, R.style.Theme_AppCompat_Dialog)
+            .setTitle("Layout")
+            .setItems(options) { _, which ->
+                if (which == 0) {
+                    showSavePresetDialog()
+                } else {
+                    loadPreset(presets[which - 1])
+                }
+            }
+            .setNegativeButton("Batal", null)
+            .create()
+        
+        if (Build.VERSION.SDK_INT >= Build.VERSION_CODES.O) {
+            dialog.window?.setType(WindowManager.LayoutParams.TYPE_APPLICATION_OVERLAY)
+        } else {
+            dialog.window?.setType(WindowManager.LayoutParams.TYPE_PHONE)
+        }
+        
+        dialog.show()
+    }
+
+    private fun showSavePresetDialog() {
+        val dialogView = LayoutInflater.from(this).inflate(R.layout.dialog_name, null)
+        val editText = dialogView.findViewById<EditText>(R.id.etName)
+        editText.hint = "Nama layout"
+        
+        val dialog = AlertDialog.Builder(this, R.style.Theme_AppCompat_Dialog)
+            .setTitle("Simpan Layout")
+            .setView(dialogView)
+            .setPositiveButton("OK") { _, _ ->
+                val name = editText.text.toString().ifEmpty { imageName }
+                layoutStorage.savePreset(name, rectangleStore, layoutMeta())
+                Toast.makeText(this, "Layout $name disimpan", Toast.LENGTH_SHORT).show()
             }
             .setNegativeButton("Batal", null)
             .create()
@@ -182,21 +352,151 @@ class FloatingWindowService : Service() {
         dialog.show()
     }
 
+    private fun loadPreset(name: String) {
+        val meta = layoutStorage.loadPreset(name, rectangleStore)
+        if (meta == null) {
+            // Layout yang sedang dipakai dan journal-nya tidak disentuh
+            Toast.makeText(this, "Layout $name tidak bisa dibaca", Toast.LENGTH_SHORT).show()
+            return
+        }
+        currentRectIndex = meta.nextIndex
+        imageName = meta.imageName
+        Toast.makeText(this, "Layout $name: ${rectangleStore.size} rectangle", Toast.LENGTH_SHORT).show()
+        
+        // Journal sesi ikut diganti supaya restart berikutnya memuat layout ini
+        layoutStorage.rewrite(rectangleStore, layoutMeta())
+        
+        if (isOverlayVisible) {
+            val canvas = overlayView.findViewById<OverlayCanvas>(R.id.overlayCanvas)
+            canvas.setStore(rectangleStore)
+            canvas.setRectNumberStart(currentRectIndex)
+        }
+    }
+
     private fun captureAndSaveScreenshots() {
-        if (mediaProjectionData == null) {
+        if (captureInProgress) return
+        val trace = pendingSaveTrace ?: SaveTrace(
+            ++saveCount,
+            rectangleStore.size,
+            encoderSettings.encoder.name,
+            File(getExternalFilesDir(null), "traces")
+        )
+        val session = captureSession
+        if (session == null) {
+            // Waktu izin dan pembuatan VirtualDisplay masuk tahap projection
+            pendingSave = true
+            pendingSaveTrace = trace
+            trace.begin(SaveTrace.PROJECTION)
             requestMediaProjection()
             return
         }
+        pendingSaveTrace = null
+        trace.end(SaveTrace.PROJECTION)
         
-        startScreenCapture()
+        // Salinan rectangle, karena store aslinya tetap bisa diubah dari overlay
+        val regions = rectangleStore.copy()
+        captureInProgress = true
+        trace.begin(SaveTrace.HIDE)
+        hideForCapture { hiddenAt ->
+            trace.end(SaveTrace.HIDE)
+            session.requestFrame(regions, hiddenAt, trace) { crops ->
+                captureInProgress = false
+                showAfterCapture()
+                if (crops != null) {
+                    saveCroppedImages(crops, trace)
+                } else {
+                    // Sesi berhenti atau frame bersih tidak datang tepat waktu
+                    Toast.makeText(this, "Capture gagal, tekan Save lagi", Toast.LENGTH_SHORT).show()
+                }
+            }
+        }
+    }
+
+    // Panel dan overlay dibuat transparan supaya tidak ikut ter-capture. Root view sengaja
+    // tidak dibuat INVISIBLE: ViewRootImpl lalu berhenti menggambar window itu dan commit
+    // callback tidak pernah datang. onHidden dipanggil sekali dengan waktu setelah frame
+    // transparan di-commit (frame capture sesudahnya dijamin bersih), atau setelah
+    // HIDE_TIMEOUT_MS kalau sinyal itu tidak datang.
+    private fun hideForCapture(onHidden: (Long) -> Unit) {
+        val views = mutableListOf(floatingView)
+        if (isOverlayVisible) views.add(overlayView)
         
-        Handler(Looper.getMainLooper()).postDelayed({
-            val bitmap = captureScreen()
-            if (bitmap != null) {
-                saveCroppedImages(bitmap)
-                stopScreenCapture()
+        var remaining = views.size
+        var done = false
+        val finish = Runnable {
+            if (!done) {
+                done = true
+                onHidden(System.nanoTime())
+            }
+        }
+        mainHandler.postDelayed(restoreAfterCapture, CAPTURE_RESTORE_TIMEOUT_MS)
+        mainHandler.postDelayed(finish, HIDE_TIMEOUT_MS)
+        views.forEach { view ->
+            view.alpha = 0f
+            whenFrameCommitted(view) {
+                remaining--
+                if (remaining == 0) {
+                    mainHandler.removeCallbacks(finish)
+                    finish.run()
+                }
+            }
+        }
+    }
+
+    private fun showAfterCapture() {
+        mainHandler.removeCallbacks(restoreAfterCapture)
+        floatingView.alpha = 1f
+        if (isOverlayVisible) {
+            overlayView.alpha = 1f
+        }
+    }
+
+    private fun whenFrameCommitted(view: View, action: () -> Unit) {
+        if (Build.VERSION.SDK_INT >= Build.VERSION_CODES.Q) {
+            view.viewTreeObserver.registerFrameCommitCallback { action() }
+            view.invalidate()
+        } else {
+            // Tanpa commit callback: frame berikutnya setelah frame yang menggambar
+            // view transparan, saat itu buffer-nya sudah diserahkan ke compositor
+            Choreographer.getInstance().postFrameCallback {
+                Choreographer.getInstance().postFrameCallback { action() }
             }
-        }, 500)
+        }
+    }
+
+    private fun startBurst() {
+        val session = captureSession
+        if (session == null) {
+            pendingBurst = true
+            requestMediaProjection()
+            return
+        }
+        
+        val dir = File(getExternalFilesDir(null), "Screenshots")
+        if (!dir.exists()) dir.mkdirs()
+        
+        val btnBurst = floatingView.findViewById<Button>(R.id.btnBurst)
+        btnBurst.text = "STOP"
+        
+        val burst = BurstCapture(
+            session,
+            encodePipeline,
+            bufferPool,
+            rectangleStore.copy(),
+            dir,
+            imageName,
+            encoderSettings
+        ) { stats ->
+            btnBurst.text = "BURST"
+            burstCapture = null
+            Toast.makeText(
+                this,
+                "Burst selesai: ${stats.captured} frame, ${stats.dropped} di-drop, ${stats.bytes / 1024} KB",
+                Toast.LENGTH_LONG
+            ).show()
+        }
+        burstCapture = burst
+        burst.start()
     }
 
     private fun requestMediaProjection() {
@@ -205,85 +505,41 @@ class FloatingWindowService : Service() {
         startActivity(intent)
     }
 
-    private fun startScreenCapture() {
+    private fun startCaptureSession(resultCode: Int, data: Intent) {
+        // Intent hasil izin hanya berlaku sekali, jadi langsung dipakai di sini
+        captureSession?.stop()
+        
         val metrics = DisplayMetrics()
         windowManager.defaultDisplay.getMetrics(metrics)
         
-        imageReader = ImageReader.newInstance(
-            metrics.widthPixels,
-            metrics.heightPixels,
-            PixelFormat.RGBA_8888,
-            2
-        )
-        
         val projectionManager = getSystemService(Context.MEDIA_PROJECTION_SERVICE) as MediaProjectionManager
-        mediaProjection = projectionManager.getMediaProjection(mediaProjectionResultCode, mediaProjectionData!!)
-        
-        virtualDisplay = mediaProjection?.createVirtualDisplay(
-            "ScreenCapture",
-            metrics.widthPixels,
-            metrics.heightPixels,
-            metrics.densityDpi,
-            DisplayManager.VIRTUAL_DISPLAY_FLAG_AUTO_MIRROR,
-            imageReader?.surface,
-            null,
-            null
-        )
-    }
-
-    private fun captureScreen(): Bitmap? {
-        val image = imageReader?.acquireLatestImage() ?: return null
-        
-        val planes = image.planes
-        val buffer: ByteBuffer = planes[0].buffer
-        val pixelStride = planes[0].pixelStride
-        val rowStride = planes[0].rowStride
-        val rowPadding = rowStride - pixelStride * image.width
-        
-        val bitmap = Bitmap.createBitmap(
-            image.width + rowPadding / pixelStride,
-            image.height,
-            Bitmap.Config.ARGB_8888
-        )
-        bitmap.copyPixelsFromBuffer(buffer)
-        image.close()
+        val projection = projectionManager.getMediaProjection(resultCode, data) ?: return
         
-        return Bitmap.createBitmap(bitmap, 0, 0, image.width, image.height)
+        lateinit var session: CaptureSession
+        session = CaptureSession(projection, metrics.widthPixels, metrics.heightPixels, metrics.densityDpi, bufferPool) {
+            if (captureSession === session) {
+                captureSession = null
+            }
+        }
+        session.start()
+        captureSession = session
     }
 
-    private fun saveCroppedImages(bitmap: Bitmap) {
+    private fun saveCroppedImages(regions: List<CroppedRegion>, trace: SaveTrace) {
+        // Frame bisa datang setelah Close: service sudah destroy dan pipeline berhenti
+        if (encodePipeline.isShutdown) {
+            regions.forEach { bufferPool.releaseBitmap(it.bitmap) }
+            return
+        }
         val dir = File(getExternalFilesDir(null), "Screenshots")
         if (!dir.exists()) dir.mkdirs()
         
-        rectangles.forEach { rect ->
-            try {
-                val croppedBitmap = Bitmap.createBitmap(
-                    bitmap,
-                    rect.left.toInt(),
-                    rect.top.toInt(),
-                    (rect.right - rect.left).toInt(),
-                    (rect.bottom - rect.top).toInt()
-                )
-                
-                val fileName = "${imageName}_${String.format("%03d", rect.number)}.png"
-                val file = File(dir, fileName)
-                val fos = FileOutputStream(file)
-                croppedBitmap.compress(Bitmap.CompressFormat.PNG, 100, fos)
-                fos.close()
-                
-                Toast.makeText(this, "Saved: $fileName", Toast.LENGTH_SHORT).show()
-            } catch (e: Exception) {
-                e.printStackTrace()
-            }
-        }
-        
-        bitmap.recycle()
+        encodePipeline.save(regions, dir, imageName, encoderSettings, trace)
     }
 
-    private fun stopScreenCapture() {
-        virtualDisplay?.release()
-        mediaProjection?.stop()
-        imageReader?.close()
+    private fun stopCaptureSession() {
+        captureSession?.stop()
+        captureSession = null
     }
 
     private fun setupDraggable(view: View, params: WindowManager.LayoutParams) {
@@ -292,6 +548,13 @@ class FloatingWindowService : Service() {
         var initialTouchX = 0f
         var initialTouchY = 0f
         
+        // updateViewLayout adalah panggilan lintas proses; cukup sekali per frame
+        val layoutUpdate = FrameCoalescer {
+            if (view.isAttachedToWindow) {
+                windowManager.updateViewLayout(view, params)
+            }
+        }
+        
         view.setOnTouchListener { _, event ->
             when (event.action) {
                 MotionEvent.ACTION_DOWN -> {
@@ -304,9 +567,14 @@ class FloatingWindowService : Service() {
                 MotionEvent.ACTION_MOVE -> {
                     params.x = initialX + (event.rawX - initialTouchX).toInt()
                     params.y = initialY + (event.rawY - initialTouchY).toInt()
-                    windowManager.updateViewLayout(view, params)
+                    layoutUpdate.request(event.historySize + 1)
                     true
                 }
+                MotionEvent.ACTION_UP -> {
+                    layoutUpdate.flush()
+                    Log.d("FloatingWindowService", "Drag: ${layoutUpdate.requested} sampel, ${layoutUpdate.applied} update")
+                    false
+                }
                 else -> false
             }
         }
@@ -326,7 +594,7 @@ class FloatingWindowService : Service() {
 
     private fun createNotification(): Notification {
         return NotificationCompat.Builder(this, "screenshot_service")
-            .setContentTitle("Screenshot App")
+            .setContentTitle(getString(R.string.app_name))
             .setContentText("Service berjalan")
             .setSmallIcon(android.R.drawable.ic_menu_camera)
             .build()
@@ -340,16 +608,27 @@ class FloatingWindowService : Service() {
         if (isOverlayVisible) {
             windowManager.removeView(overlayView)
         }
-        stopScreenCapture()
+        mainHandler.removeCallbacksAndMessages(null)
+        burstCapture?.stop()
+        stopCaptureSession()
+        encodePipeline.shutdown()
+        bufferPool.clear()
+        layoutStorage.close()
+    }
+
+    // Layar berputar: sesi capture menyesuaikan ukuran frame tanpa minta izin lagi
+    override fun onConfigurationChanged(newConfig: Configuration) {
+        super.onConfigurationChanged(newConfig)
+        val session = captureSession ?: return
+        val metrics = DisplayMetrics()
+        windowManager.defaultDisplay.getMetrics(metrics)
+        session.resize(metrics.widthPixels, metrics.heightPixels, metrics.densityDpi)
+    }
+
+    override fun onTrimMemory(level: Int) {
+        super.onTrimMemory(level)
+        bufferPool.onTrimMemory(level)
     }
 
     override fun onBind(intent: Intent?): IBinder? = null
 }
-
-data class RectangleData(
-    var left: Float,
-    var top: Float,
-    var right: Float,
-    var bottom: Float,
-    var number: Int
-)
\ No newline at end of file
@@ -0,0 +1,46 @@
+package com.example.screenshotapp
+
+import android.view.Choreographer
+
+// Menggabungkan banyak permintaan update (misalnya ACTION_MOVE dari panel sentuh
+// 240 Hz) menjadi paling banyak satu update per frame Choreographer.
+// requested menghitung sampel yang masuk, applied menghitung update yang dijalankan.
+class FrameCoalescer(private val apply: () -> Unit) : Choreographer.FrameCallback {
+
+    private var scheduled = false
+
+    var requested = 0L
+        private set
+    var applied = 0L
+        private set
+
+    val coalesced: Long
+        get() = requested - applied
+
+    fun request(samples: Int = 1) {
+        requested += samples
+        if (!scheduled) {
+            scheduled = true
+            Choreographer.getInstance().postFrameCallback(this)
+        }
+    }
+
+    // Jalankan update yang tertunda sekarang juga, misalnya saat ACTION_UP
+    fun flush() {
+        if (!scheduled) return
+        Choreographer.getInstance().removeFrameCallback(this)
+        doFrame(0L)
+    }
+
+    fun cancel() {
+        if (!scheduled) return
+        Choreographer.getInstance().removeFrameCallback(this)
+        scheduled = false
+    }
+
+    override fun doFrame(frameTimeNanos: Long) {
+        scheduled = false
+        applied++
+        apply()
+    }
+}
\ No newline at end of file
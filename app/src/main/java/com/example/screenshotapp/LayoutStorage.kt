@@ -0,0 +1,241 @@
+package com.example.screenshotapp
+
+import android.util.SparseIntArray
+import java.io.File
+import java.io.FileInputStream
+import java.io.FileOutputStream
+import java.nio.ByteBuffer
+import java.nio.ByteOrder
+import java.nio.channels.FileChannel
+
+class LayoutMeta(val nextIndex: Int, val imageName: String)
+
+// Persistensi layout rectangle dalam format biner ringkas (little-endian):
+// header MAGIC + VERSION, lalu record PUT/REMOVE/META.
+// session.journal ditambah satu record setiap edit, jadi kalau service dibunuh
+// paling banyak record terakhir yang terpotong. Saat service start journal
+// di-replay lewat memory map lalu ditulis ulang ringkas (satu PUT per rectangle).
+// Preset bernama memakai format yang sama di presets/<nama>.layout.
+class LayoutStorage(private val dir: File) {
+
+    companion object {
+        private const val MAGIC = 0x59414c52 // "RLAY"
+        private const val VERSION = 1
+        private const val OP_PUT: Byte = 1
+        private const val OP_REMOVE: Byte = 2
+        private const val OP_META: Byte = 3
+        private const val PUT_BYTES = 24
+        private const val PRESET_EXTENSION = "layout"
+    }
+
+    private val journalFile = File(dir, "session.journal")
+    private val presetDir = File(dir, "presets")
+    private var journal: FileChannel? = null
+
+    // Dipakai ulang untuk setiap record PUT/REMOVE
+    private val record = ByteBuffer.allocate(1 + PUT_BYTES).order(ByteOrder.LITTLE_ENDIAN)
+
+    // Isi store dengan sesi terakhir; null kalau belum ada journal yang valid
+    fun restore(store: RectangleStore): LayoutMeta? {
+        val meta = if (journalFile.exists()) read(journalFile, store) else null
+        rewrite(store, meta ?: LayoutMeta(1, "screenshot"))
+        return meta
+    }
+
+    fun put(store: RectangleStore, id: Int) {
+        record.clear()
+        record.put(OP_PUT)
+        putRectangle(record, store, id)
+        append(record)
+    }
+
+    fun remove(id: Int) {
+        record.clear()
+        record.put(OP_REMOVE)
+        record.putInt(id)
+        append(record)
+    }
+
+    fun putMeta(meta: LayoutMeta) {
+        append(metaRecord(meta))
+    }
+
+    // Ganti isi journal dengan keadaan sekarang, misalnya setelah preset dimuat
+    fun rewrite(store: RectangleStore, meta: LayoutMeta) {
+        journal?.close()
+        journal = null
+        writeSnapshot(journalFile, store, meta)
+        journal = FileOutputStream(journalFile, true).channel
+    }
+
+    fun listPresets(): List<String> {
+        val files = presetDir.listFiles { file -> file.extension == PRESET_EXTENSION } ?: return emptyList()
+        return files.map { it.nameWithoutExtension }.sorted()
+    }
+
+    fun savePreset(name: String, store: RectangleStore, meta: LayoutMeta) {
+        if (!presetDir.exists()) presetDir.mkdirs()
+        writeSnapshot(presetFile(name), store, meta)
+    }
+
+    // Preset di-replay ke store sementara dulu; isi store baru diganti kalau preset
+    // terbaca utuh. Null (dan store tidak berubah) kalau file tidak ada atau rusak.
+    fun loadPreset(name: String, store: RectangleStore): LayoutMeta? {
+        val file = presetFile(name)
+        if (!file.exists()) return null
+        val scratch = RectangleStore()
+        val meta = read(file, scratch, strict = true) ?: return null
+        store.clear()
+        scratch.forEach { id ->
+            store.add(scratch.left(id), scratch.top(id), scratch.right(id), scratch.bottom(id), scratch.number(id))
+        }
+        return meta
+    }
+
+    fun close() {
+        journal?.force(false)
+        journal?.close()
+        journal = null
+    }
+
+    private fun presetFile(name: String): File {
+        val safeName = name.replace(Regex("[^A-Za-z0-9_-]"), "_")
+        return File(presetDir, "$safeName.$PRESET_EXTENSION")
+    }
+
+    // Record ditulis langsung ke file tanpa buffer di proses, jadi tetap ada
+    // walaupun proses dibunuh sesudahnya
+    private fun append(buffer: ByteBuffer) {
+        val channel = journal ?: return
+        buffer.flip()
+        try {
+            while (buffer.hasRemaining()) {
+                channel.write(buffer)
+            }
+        } catch (e: Exception) {
+            e.printStackTrace()
+        }
+    }
+
+    // strict: record terpotong atau rusak membuat seluruh file ditolak (untuk preset,
+    // yang selalu ditulis utuh); tanpa strict sisa record diabaikan (ujung journal)
+    private fun read(file: File, store: RectangleStore, strict: Boolean = false): LayoutMeta? {
+        return try {
+            FileInputStream(file).channel.use { channel ->
+                val buffer = channel.map(FileChannel.MapMode.READ_ONLY, 0, channel.size())
+                replay(buffer.order(ByteOrder.LITTLE_ENDIAN), store, strict)
+            }
+        } catch (e: Exception) {
+            e.printStackTrace()
+            null
+        }
+    }
+
+    private fun replay(buffer: ByteBuffer, store: RectangleStore, strict: Boolean): LayoutMeta? {
+        if (buffer.remaining() < 8 || buffer.int != MAGIC || buffer.int != VERSION) return null
+
+        // ID di file belum tentu sama dengan ID baru di store
+        val ids = SparseIntArray()
+        var meta: LayoutMeta? = null
+        var truncated = false
+        loop@ while (buffer.hasRemaining()) {
+            when (buffer.get()) {
+                OP_PUT -> {
+                    if (buffer.remaining() < PUT_BYTES) {
+                        truncated = true
+                        break@loop
+                    }
+                    val key = buffer.int
+                    val left = buffer.float
+                    val top = buffer.float
+                    val right = buffer.float
+                    val bottom = buffer.float
+                    val number = buffer.int
+                    val id = ids.get(key, RectangleStore.NO_ID)
+                    if (store.contains(id)) {
+                        store.setBounds(id, left, top, right, bottom)
+                        store.setNumber(id, number)
+                    } else {
+                        ids.put(key, store.add(left, top, right, bottom, number))
+                    }
+                }
+                OP_REMOVE -> {
+                    if (buffer.remaining() < 4) {
+                        truncated = true
+                        break@loop
+                    }
+                    val key = buffer.int
+                    store.remove(ids.get(key, RectangleStore.NO_ID))
+                    ids.delete(key)
+                }
+                OP_META -> {
+                    if (buffer.remaining() < 6) {
+                        truncated = true
+                        break@loop
+                    }
+                    val nextIndex = buffer.int
+                    val length = buffer.short.toInt() and 0xffff
+                    if (buffer.remaining() < length) {
+                        truncated = true
+                        break@loop
+                    }
+                    val name = ByteArray(length)
+                    buffer.get(name)
+                    meta = LayoutMeta(nextIndex, String(name, Charsets.UTF_8))
+                }
+                else -> {
+                    truncated = true
+                    break@loop
+                }
+            }
+        }
+        if (truncated && strict) return null
+        return meta ?: LayoutMeta(1, "screenshot")
+    }
+
+    // Ditulis ke file sementara lalu di-rename, supaya file lama tetap utuh kalau gagal di tengah
+    private fun writeSnapshot(file: File, store: RectangleStore, meta: LayoutMeta) {
+        if (!dir.exists()) dir.mkdirs()
+        val metaBytes = metaRecord(meta)
+        metaBytes.flip()
+        val buffer = ByteBuffer.allocate(8 + metaBytes.remaining() + store.size * (1 + PUT_BYTES))
+            .order(ByteOrder.LITTLE_ENDIAN)
+        buffer.putInt(MAGIC)
+        buffer.putInt(VERSION)
+        buffer.put(metaBytes)
+        store.forEach { id ->
+            buffer.put(OP_PUT)
+            putRectangle(buffer, store, id)
+        }
+        buffer.flip()
+
+        val temp = File(file.path + ".tmp")
+        FileOutputStream(temp).use { out ->
+            while (buffer.hasRemaining()) {
+                out.channel.write(buffer)
+            }
+            out.fd.sync()
+        }
+        temp.renameTo(file)
+    }
+
+    private fun putRectangle(buffer: ByteBuffer, store: RectangleStore, id: Int) {
+        buffer.putInt(id)
+        buffer.putFloat(store.left(id))
+        buffer.putFloat(store.top(id))
+        buffer.putFloat(store.right(id))
+        buffer.putFloat(store.bottom(id))
+        buffer.putInt(store.number(id))
+    }
+
+    private fun metaRecord(meta: LayoutMeta): ByteBuffer {
+        val name = meta.imageName.toByteArray(Charsets.UTF_8)
+        val length = minOf(name.size, 0xffff)
+        val buffer = ByteBuffer.allocate(1 + 4 + 2 + length).order(ByteOrder.LITTLE_ENDIAN)
+        buffer.put(OP_META)
+        buffer.putInt(meta.nextIndex)
+        buffer.putShort(length.toShort())
+        buffer.put(name, 0, length)
+        return buffer
+    }
+}
@@ -24,8 +24,17 @@ class MediaProjectionActivity : AppCompatActivity() {
         
         if (requestCode == FloatingWindowService.MEDIA_PROJECTION_REQUEST_CODE) {
             if (resultCode == Activity.RESULT_OK && data != null) {
-                FloatingWindowService.mediaProjectionResultCode = resultCode
-                FloatingWindowService.mediaProjectionData = data
+                // Serahkan izin ke service; sesi capture dibuat sekali di sana
+                val intent = Intent(this, FloatingWindowService::class.java)
+                    .setAction(FloatingWindowService.ACTION_PROJECTION_GRANTED)
+                    .putExtra(FloatingWindowService.EXTRA_RESULT_CODE, resultCode)
+                    .putExtra(FloatingWindowService.EXTRA_RESULT_DATA, data)
+                startService(intent)
+            } else {
+                // Izin ditolak: save/burst yang menunggu izin dibatalkan
+                val intent = Intent(this, FloatingWindowService::class.java)
+                    .setAction(FloatingWindowService.ACTION_PROJECTION_DENIED)
+                startService(intent)
             }
             finish()
         }
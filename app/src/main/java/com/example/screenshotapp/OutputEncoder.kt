@@ -0,0 +1,48 @@
+package com.example.screenshotapp
+
+import android.graphics.Bitmap
+import android.os.Build
+import java.io.FileOutputStream
+
+// Format output yang bisa dipilih per sesi. RAW_RGBA menulis piksel apa adanya
+// (tanpa header, ukuran ada di nama file) untuk diproses di luar device.
+enum class OutputEncoder(val label: String, val extension: String, val usesQuality: Boolean) {
+    JPEG("JPEG", "jpg", true),
+    WEBP_LOSSY("WebP lossy", "webp", true),
+    WEBP_LOSSLESS("WebP lossless", "webp", false),
+    PNG("PNG", "png", false),
+    RAW_RGBA("RGBA mentah", "rgba", false);
+
+    fun fileName(baseName: String, number: Int, bitmap: Bitmap, frame: Int? = null): String {
+        val size = if (this == RAW_RGBA) bitmap.width to bitmap.height else null
+        return FileNaming.fileName(baseName, number, extension, frame, size)
+    }
+
+    fun encode(bitmap: Bitmap, quality: Int, out: FileOutputStream, pool: BufferPool) {
+        when (this) {
+            JPEG -> bitmap.compress(Bitmap.CompressFormat.JPEG, quality, out)
+            WEBP_LOSSY -> bitmap.compress(webpFormat(lossless = false), quality, out)
+            WEBP_LOSSLESS -> bitmap.compress(webpFormat(lossless = true), 100, out)
+            PNG -> bitmap.compress(Bitmap.CompressFormat.PNG, 100, out)
+            RAW_RGBA -> {
+                val pixels = pool.acquireBuffer(bitmap.byteCount)
+                bitmap.copyPixelsToBuffer(pixels)
+                pixels.flip()
+                while (pixels.hasRemaining()) {
+                    out.channel.write(pixels)
+                }
+                pool.releaseBuffer(pixels)
+            }
+        }
+    }
+
+    @Suppress("DEPRECATION")
+    private fun webpFormat(lossless: Boolean): Bitmap.CompressFormat {
+        // Sebelum Android 11 hanya ada WEBP; quality 100 di sana tetap lossy
+        if (Build.VERSION.SDK_INT < Build.VERSION_CODES.R) return Bitmap.CompressFormat.WEBP
+        return if (lossless) Bitmap.CompressFormat.WEBP_LOSSLESS else Bitmap.CompressFormat.WEBP_LOSSY
+    }
+}
+
+// Pengaturan encoder satu sesi; default mengutamakan throughput
+data class EncoderSettings(val encoder: OutputEncoder = OutputEncoder.JPEG, val quality: Int = 90)
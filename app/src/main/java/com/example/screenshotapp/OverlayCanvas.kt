@@ -5,8 +5,13 @@ import android.content.Context
 import android.graphics.Canvas
 import android.graphics.Color
 import android.graphics.Paint
+import android.graphics.Picture
+import android.graphics.Rect
 import android.os.Build
+import android.os.Debug
+import android.os.SystemClock
 import android.util.AttributeSet
+import android.util.SparseArray
 import android.view.LayoutInflater
 import android.view.MotionEvent
 import android.view.View
@@ -35,68 +40,235 @@ class OverlayCanvas @JvmOverloads constructor(
         color = Color.argb(50, 255, 0, 0)
         style = Paint.Style.FILL
     }
+    
+    private val handlePaint = Paint().apply {
+        color = Color.BLUE
+        style = Paint.Style.FILL
+    }
+    
+    private val debugPaint = Paint().apply {
+        color = Color.YELLOW
+        textSize = 32f
+        style = Paint.Style.FILL
+    }
+    
+    // Label "001", "002", ... per nomor, dibuat sekali saja
+    private val labels = SparseArray<String>()
+    
+    // Rectangle yang tidak sedang digeser/di-resize direkam sekali ke Picture dan
+    // diputar ulang tiap frame; hanya rectangle aktif yang digambar live di atasnya.
+    // Replay Picture di hardware canvas baru didukung sejak Android 6.0.
+    private val staticLayer = Picture()
+    private var staticLayerValid = false
+    private val useStaticLayer = Build.VERSION.SDK_INT >= Build.VERSION_CODES.M
+    
+    // Area yang perlu digambar ulang saat drag, dipakai ulang tanpa alokasi
+    private val dirty = Rect()
+    
+    // Statistik per frame: jumlah alokasi dan waktu gambar. Mati secara default karena
+    // alloc counting berlaku untuk seluruh proses; nyalakan dengan
+    // ./gradlew assembleDebug -PoverlayDebugStats=true
+    var debugStats = BuildConfig.OVERLAY_DEBUG_STATS
+        set(value) {
+            field = value
+            if (!value) stopAllocCounting()
+            invalidate()
+        }
+    var lastFrameAllocations = 0
+        private set
+    var lastFrameDrawNanos = 0L
+        private set
+    private val debugText = StringBuilder(64)
+    private var allocCounting = false
 
-    private var rectangles = mutableListOf<RectangleData>()
-    private var currentRect: RectangleData? = null
+    // Store dipakai bersama dengan FloatingWindowService; canvas hanya memegang ID
+    private var store = RectangleStore()
+    private var staticLayerVersion = -1
+    
+    // Rectangle yang sedang digambar, belum masuk store
+    private var drawLeft = 0f
+    private var drawTop = 0f
+    private var drawRight = 0f
+    private var drawBottom = 0f
     private var startX = 0f
     private var startY = 0f
     private var isDrawing = false
     
-    private var selectedRect: RectangleData? = null
+    // Hit test lewat grid; diperbarui saat rectangle dibuat, selesai digeser/di-resize, atau dihapus
+    private var index = SpatialIndex(store)
+    
+    private var selectedId = RectangleStore.NO_ID
     private var isDragging = false
     private var isResizing = false
+    private var resizeCorner: Corner? = null
     private var dragOffsetX = 0f
     private var dragOffsetY = 0f
     
+    // ACTION_MOVE (beserta sampel historisnya) digabung menjadi satu update per frame;
+    // posisi sampel terakhir yang dipakai
+    private var moveX = 0f
+    private var moveY = 0f
+    private val moveUpdate = FrameCoalescer { applyMove(moveX, moveY) }
+    
     private var lastTapTime = 0L
-    private var lastTapRect: RectangleData? = null
+    private var lastTapId = RectangleStore.NO_ID
     
     private var rectNumberStart = 1
     
-    var onRectangleCreated: ((RectangleData) -> Unit)? = null
-    var onRectangleDeleted: ((RectangleData) -> Unit)? = null
+    var onRectangleCreated: ((Int) -> Unit)? = null
+    var onRectangleDeleted: ((Int) -> Unit)? = null
+    // Rectangle selesai digeser, di-resize, atau diberi nomor baru
+    var onRectangleChanged: ((Int) -> Unit)? = null
 
-    fun setRectangles(rects: MutableList<RectangleData>) {
-        rectangles = rects
-        invalidate()
+    fun setStore(rectangles: RectangleStore) {
+        store = rectangles
+        index = SpatialIndex(rectangles)
+        index.rebuild()
+        invalidateStaticLayer()
     }
     
     fun setRectNumberStart(start: Int) {
         rectNumberStart = start
     }
 
+    @Suppress("DEPRECATION")
+    private fun stopAllocCounting() {
+        if (allocCounting) {
+            Debug.stopAllocCounting()
+            allocCounting = false
+        }
+    }
+    
+    override fun onDetachedFromWindow() {
+        super.onDetachedFromWindow()
+        stopAllocCounting()
+    }
+    
+    @Suppress("DEPRECATION")
     override fun onDraw(canvas: Canvas) {
         super.onDraw(canvas)
         
-        rectangles.forEach { rect ->
-            canvas.drawRect(rect.left, rect.top, rect.right, rect.bottom, fillPaint)
-            canvas.drawRect(rect.left, rect.top, rect.right, rect.bottom, paint)
-            
-            val number = String.format("%03d", rect.number)
-            val textX = rect.left + 10
-            val textY = rect.top + 50
-            canvas.drawText(number, textX, textY, textPaint)
-            
-            drawResizeHandles(canvas, rect)
+        if (debugStats && !allocCounting) {
+            Debug.startAllocCounting()
+            allocCounting = true
+        }
+        val allocStart = if (debugStats) Debug.getThreadAllocCount() else 0
+        val drawStart = SystemClock.elapsedRealtimeNanos()
+        
+        if (useStaticLayer) {
+            // Perubahan store dari luar (selain rectangle aktif) juga membuat layer basi
+            val changedOutside = selectedId == RectangleStore.NO_ID && staticLayerVersion != store.version
+            if (!staticLayerValid || changedOutside) recordStaticLayer()
+            canvas.drawPicture(staticLayer)
+            if (store.contains(selectedId)) drawRectangle(canvas, selectedId)
+        } else {
+            drawRectangles(canvas, RectangleStore.NO_ID)
         }
         
-        currentRect?.let { rect ->
-            canvas.drawRect(rect.left, rect.top, rect.right, rect.bottom, fillPaint)
-            canvas.drawRect(rect.left, rect.top, rect.right, rect.bottom, paint)
+        if (isDrawing) {
+            canvas.drawRect(drawLeft, drawTop, drawRight, drawBottom, fillPaint)
+            canvas.drawRect(drawLeft, drawTop, drawRight, drawBottom, paint)
+        }
+        
+        if (debugStats) {
+            lastFrameDrawNanos = SystemClock.elapsedRealtimeNanos() - drawStart
+            lastFrameAllocations = Debug.getThreadAllocCount() - allocStart
+            drawDebugStats(canvas)
         }
     }
     
-    private fun drawResizeHandles(canvas: Canvas, rect: RectangleData) {
-        val handleSize = 30f
-        val handlePaint = Paint().apply {
-            color = Color.BLUE
-            style = Paint.Style.FILL
+    // Iterasi store inline, tanpa Iterator per frame
+    @Suppress("DEPRECATION")
+    private fun drawRectangles(canvas: Canvas, skip: Int) {
+        val margin = SpatialIndex.HANDLE_SIZE
+        store.forEach { id ->
+            if (id != skip && !canvas.quickReject(store.left(id) - margin, store.top(id) - margin,
+                    store.right(id) + margin, store.bottom(id) + margin, Canvas.EdgeType.AA)) {
+                drawRectangle(canvas, id)
+            }
         }
+    }
+    
+    private fun recordStaticLayer() {
+        val recording = staticLayer.beginRecording(width, height)
+        drawRectangles(recording, selectedId)
+        staticLayer.endRecording()
+        staticLayerValid = true
+        staticLayerVersion = store.version
+    }
+    
+    // Dipanggil setiap kali himpunan rectangle statis berubah
+    private fun invalidateStaticLayer() {
+        staticLayerValid = false
+        invalidate()
+    }
+    
+    override fun onSizeChanged(w: Int, h: Int, oldw: Int, oldh: Int) {
+        super.onSizeChanged(w, h, oldw, oldh)
+        staticLayerValid = false
+    }
+    
+    private fun drawRectangle(canvas: Canvas, id: Int) {
+        val left = store.left(id)
+        val top = store.top(id)
+        val right = store.right(id)
+        val bottom = store.bottom(id)
+        canvas.drawRect(left, top, right, bottom, fillPaint)
+        canvas.drawRect(left, top, right, bottom, paint)
+        
+        val textX = left + 10
+        val textY = top + 50
+        canvas.drawText(label(store.number(id)), textX, textY, textPaint)
+        
+        drawResizeHandles(canvas, left, top, right, bottom)
+    }
+    
+    private fun label(number: Int): String {
+        return labels.get(number) ?: String.format("%03d", number).also { labels.put(number, it) }
+    }
+    
+    private fun drawResizeHandles(canvas: Canvas, left: Float, top: Float, right: Float, bottom: Float) {
+        val handleSize = SpatialIndex.HANDLE_SIZE
         
-        canvas.drawCircle(rect.left, rect.top, handleSize, handlePaint)
-        canvas.drawCircle(rect.right, rect.top, handleSize, handlePaint)
-        canvas.drawCircle(rect.left, rect.bottom, handleSize, handlePaint)
-        canvas.drawCircle(rect.right, rect.bottom, handleSize, handlePaint)
+        canvas.drawCircle(left, top, handleSize, handlePaint)
+        canvas.drawCircle(right, top, handleSize, handlePaint)
+        canvas.drawCircle(left, bottom, handleSize, handlePaint)
+        canvas.drawCircle(right, bottom, handleSize, handlePaint)
+    }
+    
+    private fun drawDebugStats(canvas: Canvas) {
+        debugText.setLength(0)
+        debugText.append("alloc ").append(lastFrameAllocations)
+            .append("  draw ").append(lastFrameDrawNanos / 1000).append(" us")
+            .append("  move ").append(moveUpdate.requested).append('/').append(moveUpdate.applied)
+        canvas.drawText(debugText, 0, debugText.length, 20f, height - 20f, debugPaint)
+    }
+    
+    // Tandai ulang hanya area lama + baru dari rectangle yang bergerak, termasuk
+    // handle dan label yang bisa keluar dari batas rectangle
+    private fun addDamage(left: Float, top: Float, right: Float, bottom: Float) {
+        val margin = SpatialIndex.HANDLE_SIZE + paint.strokeWidth
+        val x0 = minOf(left, right)
+        val y0 = minOf(top, bottom)
+        val labelRight = x0 + 10 + textPaint.textSize * 4
+        val labelBottom = y0 + 50 + textPaint.textSize / 2
+        dirty.union(
+            (x0 - margin).toInt(),
+            (y0 - margin).toInt(),
+            (maxOf(left, right, labelRight) + margin).toInt() + 1,
+            (maxOf(top, bottom, labelBottom) + margin).toInt() + 1
+        )
+    }
+    
+    @Suppress("DEPRECATION")
+    private fun invalidateDamage() {
+        if (dirty.isEmpty) return
+        if (debugStats) {
+            // Teks statistik di bawah layar ikut diperbarui
+            dirty.union(0, height - 60, width, height)
+        }
+        invalidate(dirty.left, dirty.top, dirty.right, dirty.bottom)
+        dirty.setEmpty()
     }
 
     override fun onTouchEvent(event: MotionEvent): Boolean {
@@ -105,156 +277,153 @@ class OverlayCanvas @JvmOverloads constructor(
                 val x = event.x
                 val y = event.y
                 
-                val tappedRect = findRectangleAt(x, y)
-                if (tappedRect != null) {
+                val tappedId = index.findRectangleAt(x, y)
+                if (tappedId != RectangleStore.NO_ID) {
                     val currentTime = System.currentTimeMillis()
-                    if (currentTime - lastTapTime < 300 && tappedRect == lastTapRect) {
-                        showRectangleOptions(tappedRect)
+                    if (currentTime - lastTapTime < 300 && tappedId == lastTapId) {
+                        showRectangleOptions(tappedId)
                         lastTapTime = 0
-                        lastTapRect = null
+                        lastTapId = RectangleStore.NO_ID
                         return true
                     }
                     lastTapTime = currentTime
-                    lastTapRect = tappedRect
+                    lastTapId = tappedId
                     
-                    val resizeCorner = findResizeCorner(x, y, tappedRect)
-                    if (resizeCorner != null) {
-                        selectedRect = tappedRect
+                    val corner = index.findCorner(x, y, tappedId)
+                    if (corner != null) {
+                        selectedId = tappedId
+                        invalidateStaticLayer()
                         isResizing = true
+                        resizeCorner = corner
                         startX = x
                         startY = y
                     } else {
-                        selectedRect = tappedRect
+                        selectedId = tappedId
+                        invalidateStaticLayer()
                         isDragging = true
-                        dragOffsetX = x - tappedRect.left
-                        dragOffsetY = y - tappedRect.top
+                        dragOffsetX = x - store.left(tappedId)
+                        dragOffsetY = y - store.top(tappedId)
                     }
                 } else {
                     startX = x
                     startY = y
-                    currentRect = RectangleData(x, y, x, y, rectNumberStart)
+                    drawLeft = x
+                    drawTop = y
+                    drawRight = x
+                    drawBottom = y
                     isDrawing = true
                 }
             }
             
             MotionEvent.ACTION_MOVE -> {
-                val x = event.x
-                val y = event.y
-                
-                when {
-                    isDrawing -> {
-                        currentRect?.right = x
-                        currentRect?.bottom = y
-                        invalidate()
-                    }
-                    isDragging -> {
-                        selectedRect?.let { rect ->
-                            val width = rect.right - rect.left
-                            val height = rect.bottom - rect.top
-                            rect.left = x - dragOffsetX
-                            rect.top = y - dragOffsetY
-                            rect.right = rect.left + width
-                            rect.bottom = rect.top + height
-                            invalidate()
-                        }
-                    }
-                    isResizing -> {
-                        selectedRect?.let { rect ->
-                            val dx = x - startX
-                            val dy = y - startY
-                            
-                            when (findResizeCorner(startX, startY, rect)) {
-                                "topLeft" -> {
-                                    rect.left += dx
-                                    rect.top += dy
-                                }
-                                "topRight" -> {
-                                    rect.right += dx
-                                    rect.top += dy
-                                }
-                                "bottomLeft" -> {
-                                    rect.left += dx
-                                    rect.bottom += dy
-                                }
-                                "bottomRight" -> {
-                                    rect.right += dx
-                                    rect.bottom += dy
-                                }
-                            }
-                            
-                            startX = x
-                            startY = y
-                            invalidate()
-                        }
-                    }
-                }
+                moveX = event.x
+                moveY = event.y
+                moveUpdate.request(event.historySize + 1)
             }
             
             MotionEvent.ACTION_UP -> {
+                moveUpdate.flush()
                 if (isDrawing) {
-                    currentRect?.let { rect ->
-                        normalizeRect(rect)
-                        rectangles.add(rect)
-                        onRectangleCreated?.invoke(rect)
-                        rectNumberStart++
-                    }
-                    currentRect = null
+                    val id = store.addNormalized(drawLeft, drawTop, drawRight, drawBottom, rectNumberStart)
+                    index.insert(id)
+                    staticLayerValid = false
+                    onRectangleCreated?.invoke(id)
+                    rectNumberStart++
                     isDrawing = false
                 }
                 
-                isDragging = false
-                isResizing = false
-                selectedRect = null
-                invalidate()
+                finishGesture()
+            }
+            
+            MotionEvent.ACTION_CANCEL -> {
+                moveUpdate.cancel()
+                isDrawing = false
+                finishGesture()
             }
         }
         return true
     }
     
-    private fun normalizeRect(rect: RectangleData) {
-        if (rect.left > rect.right) {
-            val temp = rect.left
-            rect.left = rect.right
-            rect.right = temp
-        }
-        if (rect.top > rect.bottom) {
-            val temp = rect.top
-            rect.top = rect.bottom
-            rect.bottom = temp
-        }
-    }
-    
-    private fun findRectangleAt(x: Float, y: Float): RectangleData? {
-        return rectangles.lastOrNull { rect ->
-            x >= rect.left && x <= rect.right && y >= rect.top && y <= rect.bottom
+    private fun applyMove(x: Float, y: Float) {
+        when {
+            isDrawing -> {
+                addDamage(drawLeft, drawTop, drawRight, drawBottom)
+                drawRight = x
+                drawBottom = y
+                addDamage(drawLeft, drawTop, drawRight, drawBottom)
+                invalidateDamage()
+            }
+            isDragging && store.contains(selectedId) -> {
+                val id = selectedId
+                addDamage(store.left(id), store.top(id), store.right(id), store.bottom(id))
+                val width = store.right(id) - store.left(id)
+                val height = store.bottom(id) - store.top(id)
+                val left = x - dragOffsetX
+                val top = y - dragOffsetY
+                store.setBounds(id, left, top, left + width, top + height)
+                addDamage(left, top, left + width, top + height)
+                invalidateDamage()
+            }
+            isResizing && store.contains(selectedId) -> {
+                val id = selectedId
+                var left = store.left(id)
+                var top = store.top(id)
+                var right = store.right(id)
+                var bottom = store.bottom(id)
+                addDamage(left, top, right, bottom)
+                val dx = x - startX
+                val dy = y - startY
+                
+                when (resizeCorner) {
+                    Corner.TOP_LEFT -> {
+                        left += dx
+                        top += dy
+                    }
+                    Corner.TOP_RIGHT -> {
+                        right += dx
+                        top += dy
+                    }
+                    Corner.BOTTOM_LEFT -> {
+                        left += dx
+                        bottom += dy
+                    }
+                    Corner.BOTTOM_RIGHT -> {
+                        right += dx
+                        bottom += dy
+                    }
+                    null -> {}
+                }
+                store.setBounds(id, left, top, right, bottom)
+                
+                startX = x
+                startY = y
+                addDamage(left, top, right, bottom)
+                invalidateDamage()
+            }
         }
     }
     
-    private fun findResizeCorner(x: Float, y: Float, rect: RectangleData): String? {
-        val handleSize = 30f
-        
-        return when {
-            isNear(x, rect.left, handleSize) && isNear(y, rect.top, handleSize) -> "topLeft"
-            isNear(x, rect.right, handleSize) && isNear(y, rect.top, handleSize) -> "topRight"
-            isNear(x, rect.left, handleSize) && isNear(y, rect.bottom, handleSize) -> "bottomLeft"
-            isNear(x, rect.right, handleSize) && isNear(y, rect.bottom, handleSize) -> "bottomRight"
-            else -> null
+    private fun finishGesture() {
+        if ((isDragging || isResizing) && store.contains(selectedId)) {
+            index.update(selectedId)
+            onRectangleChanged?.invoke(selectedId)
         }
+        isDragging = false
+        isResizing = false
+        resizeCorner = null
+        selectedId = RectangleStore.NO_ID
+        invalidateStaticLayer()
     }
     
-    private fun isNear(value: Float, target: Float, threshold: Float): Boolean {
-        return Math.abs(value - target) <= threshold
-    }
-    
-    private fun showRectangleOptions(rect: RectangleData) {
+    private fun showRectangleOptions(id: Int) {
         val options = arrayOf("Renumber", "Delete")
         
         val builder = AlertDialog.Builder(context, androidx.appcompat.R.style.Theme_AppCompat_Dialog)
-        builder.setTitle("Rectangle ${String.format("%03d", rect.number)}")
+        builder.setTitle("Rectangle ${String.format("%03d", store.number(id))}")
         builder.setItems(options) { _, which ->
             when (which) {
-                0 -> showRenumberDialog(rect)
-                1 -> deleteRectangle(rect)
+                0 -> showRenumberDialog(id)
+                1 -> deleteRectangle(id)
             }
         }
         
@@ -269,10 +438,10 @@ class OverlayCanvas @JvmOverloads constructor(
         dialog.show()
     }
     
-    private fun showRenumberDialog(rect: RectangleData) {
+    private fun showRenumberDialog(id: Int) {
         val dialogView = LayoutInflater.from(context).inflate(R.layout.dialog_name, null)
         val editText = dialogView.findViewById<EditText>(R.id.etName)
-        editText.setText(rect.number.toString())
+        editText.setText(store.number(id).toString())
         editText.hint = "Nomor baru"
         
         val dialog = AlertDialog.Builder(context, androidx.appcompat.R.style.Theme_AppCompat_Dialog)
@@ -280,9 +449,10 @@ class OverlayCanvas @JvmOverloads constructor(
             .setView(dialogView)
             .setPositiveButton("OK") { _, _ ->
                 val newNumber = editText.text.toString().toIntOrNull()
-                if (newNumber != null && newNumber > 0) {
-                    rect.number = newNumber
-                    invalidate()
+                if (newNumber != null && newNumber > 0 && store.contains(id)) {
+                    store.setNumber(id, newNumber)
+                    onRectangleChanged?.invoke(id)
+                    invalidateStaticLayer()
                 }
             }
             .setNegativeButton("Batal", null)
@@ -297,9 +467,10 @@ class OverlayCanvas @JvmOverloads constructor(
         dialog.show()
     }
     
-    private fun deleteRectangle(rect: RectangleData) {
-        rectangles.remove(rect)
-        onRectangleDeleted?.invoke(rect)
-        invalidate()
+    private fun deleteRectangle(id: Int) {
+        if (!store.remove(id)) return
+        index.remove(id)
+        onRectangleDeleted?.invoke(id)
+        invalidateStaticLayer()
     }
 }
\ No newline at end of file
@@ -0,0 +1,119 @@
+package com.example.screenshotapp
+
+import android.os.Build
+import android.os.Trace
+import android.util.Log
+import org.json.JSONObject
+import java.io.File
+
+// Timing per tahap untuk satu save, dari tombol Save sampai file terakhir ditulis.
+// Tiap tahap mencatat total waktu (System.nanoTime), jumlah kejadian dan byte,
+// dan muncul sebagai trace section di Perfetto. Tahap encode dan write terjadi
+// paralel di worker, jadi totalnya bisa lebih besar dari waktu save itu sendiri;
+// write mencakup encode karena compress langsung menulis ke file.
+// Hasil tiap save ditulis ke traces/last_save.json dan ditambahkan ke
+// traces/save_traces.jsonl di getExternalFilesDir.
+class SaveTrace(val id: Int, private val rectangles: Int, private val encoder: String, private val dir: File) {
+
+    companion object {
+        const val PROJECTION = "projection"
+        const val HIDE = "hide"
+        const val FRAME_WAIT = "frame_wait"
+        const val CROP = "crop"
+        const val COPY_PIXELS = "copy_pixels"
+        const val ENCODE = "encode"
+        const val WRITE = "write"
+
+        const val LAST_FILE = "last_save.json"
+        const val HISTORY_FILE = "save_traces.jsonl"
+
+        // Section sinkron di thread pemanggil; trace null berarti hanya section Perfetto
+        inline fun <T> section(trace: SaveTrace?, stage: String, block: () -> T): T {
+            Trace.beginSection(stage)
+            val start = System.nanoTime()
+            try {
+                return block()
+            } finally {
+                trace?.record(stage, System.nanoTime() - start)
+                Trace.endSection()
+            }
+        }
+    }
+
+    private class Stage {
+        var nanos = 0L
+        var count = 0
+        var bytes = 0L
+    }
+
+    private val startNanos = System.nanoTime()
+    private val stages = LinkedHashMap<String, Stage>()
+    private val started = HashMap<String, Long>()
+
+    // Tahap yang mulai dan selesai di thread atau callback berbeda
+    @Synchronized
+    fun begin(stage: String) {
+        if (Build.VERSION.SDK_INT >= Build.VERSION_CODES.Q) {
+            Trace.beginAsyncSection(stage, id)
+        }
+        started[stage] = System.nanoTime()
+    }
+
+    // Tidak melakukan apa-apa kalau tahap itu tidak pernah dimulai
+    @Synchronized
+    fun end(stage: String) {
+        val start = started.remove(stage) ?: return
+        if (Build.VERSION.SDK_INT >= Build.VERSION_CODES.Q) {
+            Trace.endAsyncSection(stage, id)
+        }
+        record(stage, System.nanoTime() - start)
+    }
+
+    @Synchronized
+    fun record(stage: String, nanos: Long) {
+        val entry = stages.getOrPut(stage) { Stage() }
+        entry.nanos += nanos
+        entry.count++
+    }
+
+    @Synchronized
+    fun addBytes(stage: String, bytes: Long) {
+        stages.getOrPut(stage) { Stage() }.bytes += bytes
+    }
+
+    @Synchronized
+    fun toJson(): JSONObject {
+        val json = JSONObject()
+        json.put("id", id)
+        json.put("timestamp", System.currentTimeMillis())
+        json.put("rectangles", rectangles)
+        json.put("encoder", encoder)
+        json.put("total_ms", (System.nanoTime() - startNanos) / 1_000_000.0)
+
+        val stageJson = JSONObject()
+        stages.forEach { (name, stage) ->
+            stageJson.put(name, JSONObject().apply {
+                put("ms", stage.nanos / 1_000_000.0)
+                put("count", stage.count)
+                put("bytes", stage.bytes)
+            })
+        }
+        json.put("stages", stageJson)
+        return json
+    }
+
+    // Dipanggil sekali setelah file terakhir ditulis
+    fun finish() {
+        val json = toJson()
+        Log.d("SaveTrace", json.toString())
+        try {
+            if (!dir.exists()) dir.mkdirs()
+            synchronized(SaveTrace::class.java) {
+                File(dir, LAST_FILE).writeText(json.toString(2))
+                File(dir, HISTORY_FILE).appendText(json.toString() + "\n")
+            }
+        } catch (e: Exception) {
+            e.printStackTrace()
+        }
+    }
+}
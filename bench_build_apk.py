@@ -0,0 +1,175 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import build_apk
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+def tree_size(root):
+    total = 0
+    files = 0
+    for dirpath, dirnames, filenames in os.walk(root):
+        for name in filenames:
+            total += os.path.getsize(os.path.join(dirpath, name))
+            files += 1
+    return files, total
+
+def sample(make_run, repeat):
+    # Waktu diukur tanpa tracemalloc; satu run tambahan khusus untuk peak memory
+    seconds = []
+    for i in range(repeat):
+        run = make_run(i)
+        start = time.perf_counter()
+        run()
+        seconds.append(time.perf_counter() - start)
+    run = make_run(repeat)
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+def summarize(seconds, peak, files, written_bytes):
+    best = min(seconds)
+    return {
+        'seconds_min': best,
+        'seconds_median': statistics.median(seconds),
+        'files': files,
+        'bytes': written_bytes,
+        'files_per_second': files / best if best else None,
+        'peak_memory_bytes': peak,
+    }
+
+def bench_import(repeat):
+    # Waktu import build_apk di proses baru; template tidak boleh ikut dimuat
+    code = 'import time; t = time.perf_counter(); import build_apk; print(time.perf_counter() - t)'
+    seconds = [float(subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                                    cwd=os.path.dirname(os.path.abspath(__file__))).stdout)
+               for _ in range(repeat)]
+    return {'seconds_min': min(seconds), 'seconds_median': statistics.median(seconds)}
+
+def bench_steps(workdir, repeat):
+    # Waktu render + tulis dan jumlah byte per langkah registry
+    steps = {}
+    outputs = build_apk.list_outputs()
+    build_apk.make_directories(outputs, workdir)
+    for o in outputs:
+        seconds = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            build_apk.write_output(o, workdir)
+            seconds.append(time.perf_counter() - start)
+        steps[o.path] = {
+            'template': o.template,
+            'seconds_min': min(seconds),
+            'seconds_median': statistics.median(seconds),
+            'bytes': os.path.getsize(os.path.join(workdir, o.path)),
+        }
+    return steps
+
+def bench_cold(workdir, repeat, jobs):
+    config = build_apk.Config(jobs=jobs)
+
+    def make_run(i):
+        # Cache template dikosongkan di luar pengukuran, supaya tiap run cold ikut
+        # membaca dan mem-parse template seperti proses baru
+        build_apk._TEMPLATES.clear()
+        target = os.path.join(workdir, f'cold-{i}')
+        return lambda: build_apk.generate(target, config)
+    seconds, peak = sample(make_run, repeat)
+    return summarize(seconds, peak, *tree_size(os.path.join(workdir, 'cold-0')))
+
+def bench_warm(workdir, repeat, jobs):
+    target = os.path.join(workdir, 'warm')
+    build_apk.generate(target, build_apk.Config(jobs=jobs))
+    config = build_apk.Config(incremental=True, jobs=jobs)
+    seconds, peak = sample(lambda i: lambda: build_apk.generate(target, config), repeat)
+    # Run warm tidak menulis apa pun; files/s dihitung dari file yang diperiksa
+    return summarize(seconds, peak, len(build_apk.REGISTRY), 0)
+
+def synthetic_variants(count):
+    return [build_apk.Variant(package=f'com.example.variant{n:03d}', label=f'Variant {n:03d}',
+                              colors={'purple_500': f'#FF{n % 256:02X}00EE'}, name=f'variant-{n:03d}')
+            for n in range(count)]
+
+def bench_variants(workdir, repeat, jobs, count):
+    variants = synthetic_variants(count)
+
+    def make_run(i):
+        out_dir = os.path.join(workdir, f'variants-{i}')
+        return lambda: build_apk.generate_variants(variants, out_dir, jobs=jobs)
+    seconds, peak = sample(make_run, repeat)
+    # Peak memory hanya mencakup proses induk; worker berjalan di proses terpisah
+    return summarize(seconds, peak, *tree_size(os.path.join(workdir, 'variants-0')))
+
+def run_benchmarks(repeat=5, jobs=None, variants=10):
+    workdir = tempfile.mkdtemp(prefix='bench_build_apk-')
+    try:
+        steps_dir = os.path.join(workdir, 'steps')
+        os.mkdir(steps_dir)
+        return {
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'repeat': repeat,
+            'jobs': jobs,
+            'import': bench_import(repeat),
+            'steps': bench_steps(steps_dir, repeat),
+            'runs': {
+                'cold': bench_cold(workdir, repeat, jobs),
+                'warm': bench_warm(workdir, repeat, jobs),
+                f'variants_{variants}': bench_variants(workdir, repeat, jobs, variants),
+            },
+        }
+    finally:
+        shutil.rmtree(workdir)
+
+def compare(result, baseline, threshold):
+    # Bandingkan seconds_min tiap run dengan hasil commit lain
+    regressions = []
+    for name, run in result['runs'].items():
+        old = baseline.get('runs', {}).get(name)
+        if old and old['seconds_min'] and run['seconds_min'] > old['seconds_min'] * (1 + threshold):
+            regressions.append(f"{name}: {old['seconds_min']:.4f}s -> {run['seconds_min']:.4f}s")
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark generator build_apk.py")
+    parser.add_argument('--repeat', type=int, default=5, help="jumlah pengulangan tiap skenario")
+    parser.add_argument('--jobs', type=int, default=None, help="jumlah thread generator")
+    parser.add_argument('--variants', type=int, default=10, help="jumlah varian sintetis untuk generate batch")
+    parser.add_argument('--output', help="tulis hasil JSON ke file ini (default: stdout)")
+    parser.add_argument('--compare', help="file JSON hasil commit lain sebagai pembanding")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="batas perlambatan relatif sebelum dianggap regresi")
+    args = parser.parse_args()
+
+    result = run_benchmarks(repeat=args.repeat, jobs=args.jobs, variants=args.variants)
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            regressions = compare(result, json.load(f), args.threshold)
+        for line in regressions:
+            print(f"⚠️ Regresi: {line}", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
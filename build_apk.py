@@ -1,1620 +1,755 @@
 import os
-import shutil
+import sys
 
-def create_screenshot_app():
-    print("🚀 Membuat project Android Screenshot App...")
-    
-    # Hapus file dan folder lama jika ada
-    files_to_remove = ['gradlew', 'gradlew.bat', 'build.gradle', 'settings.gradle', 'gradle.properties']
-    folders_to_remove = ['app', 'gradle', 'build']
-    
-    for file in files_to_remove:
-        if os.path.exists(file):
-            os.remove(file)
-            print(f"🗑️ Menghapus file: {file}")
-    
-    for folder in folders_to_remove:
-        if os.path.exists(folder):
-            shutil.rmtree(folder)
-            print(f"🗑️ Menghapus folder: {folder}")
-    
-    # Struktur direktori lengkap
-    directories = [
-        'app/src/main/java/com/example/screenshotapp',
-        'app/src/main/res/layout',
-        'app/src/main/res/values',
-        'app/src/main/res/drawable',
-        'gradle/wrapper'
-    ]
-    
-    # Buat semua direktori
-    for directory in directories:
-        os.makedirs(directory, exist_ok=True)
-        print(f"📁 Created directory: {directory}")
-    
-    # Buat semua file dengan versi yang diperbarui
-    create_gradle_properties()
-    create_main_activity()
-    create_floating_window_service()
-    create_overlay_canvas()
-    create_media_projection_activity()
-    create_activity_main_xml()
-    create_floating_buttons_xml()
-    create_overlay_layout_xml()
-    create_dialog_name_xml()
-    create_android_manifest()
-    create_app_build_gradle()
-    create_project_build_gradle()
-    create_settings_gradle()
-    create_gradle_wrapper_properties()
-    create_gradle_wrapper()
-    create_gradle_wrapper_bat()  # File batch untuk Windows
-    create_proguard_rules()
-    create_strings_xml()
-    create_colors_xml()
-    create_ic_launcher()
-    create_ic_launcher_foreground()
-    create_readme()
-    
-    print("\n✅ Semua file dan folder berhasil dibuat!")
-    print("📁 Struktur project lengkap di direktori saat ini!")
-    print("\n🔧 Untuk build APK, jalankan:")
-    print("chmod +x gradlew")
-    print("./gradlew assembleDebug")
-    print("\n📱 APK akan tersedia di: app/build/outputs/apk/debug/")
-def create_gradle_properties():
-    content = '''org.gradle.jvmargs=-Xmx2048m -Dfile.encoding=UTF-8
-android.useAndroidX=true
-android.enableJetifier=true
-android.nonTransitiveRClass=true
-org.gradle.parallel=true
-org.gradle.caching=true
-org.gradle.configureondemand=true
-kotlin.code.style=official
-'''
-    
-    file_path = 'gradle.properties'
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-    print(f"📄 Created file: {file_path}")
-
-def create_gradle_wrapper_properties():
-    content = '''distributionBase=GRADLE_USER_HOME
-distributionPath=wrapper/dists
-distributionUrl=https\\://services.gradle.org/distributions/gradle-8.2-bin.zip
-networkTimeout=10000
-validateDistributionUrl=true
-zipStoreBase=GRADLE_USER_HOME
-zipStorePath=wrapper/dists
-'''
-    
-    file_path = 'gradle/wrapper/gradle-wrapper.properties'
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-    print(f"📄 Created file: {file_path}")
-
-def create_gradle_wrapper_bat():
-    content = '''@rem
-@rem Copyright 2015 the original author or authors.
-@rem
-@rem Licensed under the Apache License, Version 2.0 (the "License");
-@rem you may not use this file except in compliance with the License.
-@rem You may obtain a copy of the License at
-@rem
-@rem      https://www.apache.org/licenses/LICENSE-2.0
-@rem
-@rem Unless required by applicable law or agreed to in writing, software
-@rem distributed under the License is distributed on an "AS IS" BASIS,
-@rem WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
-@rem See the License for the specific language governing permissions and
-@rem limitations under the License.
-@rem
-
-@if "%DEBUG%"=="" @echo off
-@rem ##########################################################################
-@rem
-@rem  Gradle startup script for Windows
-@rem
-@rem ##########################################################################
-
-@rem Set local scope for the variables with windows NT shell
-if "%OS%"=="Windows_NT" setlocal
-
-set DIRNAME=%~dp0
-if "%DIRNAME%"=="" set DIRNAME=.
-@rem This is normally unused
-set APP_BASE_NAME=%~n0
-set APP_HOME=%DIRNAME%
-
-@rem Resolve any "." and ".." in APP_HOME to make it shorter.
-for %%i in ("%APP_HOME%") do set APP_HOME=%%~fi
-
-@rem Add default JVM options here. You can also use JAVA_OPTS and GRADLE_OPTS to pass JVM options to this script.
-set DEFAULT_JVM_OPTS="-Xmx64m" "-Xms64m"
-
-@rem Find java.exe
-if defined JAVA_HOME goto findJavaFromJavaHome
-
-set JAVA_EXE=java.exe
-%JAVA_EXE% -version >NUL 2>&1
-if %ERRORLEVEL% equ 0 goto execute
-
-echo.
-echo ERROR: JAVA_HOME is not set and no 'java' command could be found in your PATH.
-echo.
-echo Please set the JAVA_HOME variable in your environment to match the
-echo location of your Java installation.
-
-goto fail
-
-:findJavaFromJavaHome
-set JAVA_HOME=%JAVA_HOME:"=%
-set JAVA_EXE=%JAVA_HOME%/bin/java.exe
-
-if exist "%JAVA_EXE%" goto execute
-
-echo.
-echo ERROR: JAVA_HOME is set to an invalid directory: %JAVA_HOME%
-echo.
-echo Please set the JAVA_HOME variable in your environment to match the
-echo location of your Java installation.
-
-goto fail
-
-:execute
-@rem Setup the command line
-
-set CLASSPATH=%APP_HOME%\gradle\wrapper\gradle-wrapper.jar
-
-
-@rem Execute Gradle
-"%JAVA_EXE%" %DEFAULT_JVM_OPTS% %JAVA_OPTS% %GRADLE_OPTS% -classpath "%CLASSPATH%" org.gradle.wrapper.GradleWrapperMain %*
-
-:end
-@rem End local scope for the variables with windows NT shell
-if %ERRORLEVEL% equ 0 goto mainEnd
-
-:fail
-rem Set variable GRADLE_EXIT_CONSOLE if you need the _script_ return code instead of
-rem the _cmd_ / _process_ return code!
-set EXIT_CODE=%ERRORLEVEL%
-if %EXIT_CODE% equ 0 set EXIT_CODE=1
-if not ""=="%GRADLE_EXIT_CONSOLE%" exit %EXIT_CODE%
-exit /b %EXIT_CODE%
-
-:mainEnd
-if "%OS%"=="Windows_NT" endlocal
-
-:omega
-'''
-    
-    file_path = 'gradlew.bat'
-    with open(file_path, 'w', newline='\r\n') as f:
-        f.write(content)
-    print(f"📄 Created file: {file_path}")
-
-def create_main_activity():
-    content = '''package com.example.screenshotapp
-
-import android.Manifest
-import android.content.Intent
-import android.content.pm.PackageManager
-import android.net.Uri
-import android.os.Build
-import android.os.Bundle
-import android.provider.Settings
-import android.widget.Toast
-import androidx.appcompat.app.AppCompatActivity
-import androidx.core.app.ActivityCompat
-import androidx.core.content.ContextCompat
-
-class MainActivity : AppCompatActivity() {
-    
-    private val PERMISSION_REQUEST_CODE = 100
-    private val OVERLAY_PERMISSION_REQUEST_CODE = 101
+# Import modul ini harus murah: template dibaca dari folder templates/ saat
+# pertama dipakai, dan modul stdlib yang berat baru di-import di fungsi yang butuh.
 
-    override fun onCreate(savedInstanceState: Bundle?) {
-        super.onCreate(savedInstanceState)
-        setContentView(R.layout.activity_main)
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
 
-        checkPermissions()
-    }
+# Prefix folder staging yang dibuat di samping project saat generate ulang penuh
+STAGING_PREFIX = '.build_apk-'
 
-    private fun checkPermissions() {
-        val permissions = mutableListOf<String>()
+# Folder yang isinya sepenuhnya milik generator; file lain di sini dianggap basi
+GENERATED_DIRS = ['app/src', 'core/src']
 
-        if (ContextCompat.checkSelfPermission(this, Manifest.permission.WRITE_EXTERNAL_STORAGE) 
-            != PackageManager.PERMISSION_GRANTED) {
-            if (Build.VERSION.SDK_INT < Build.VERSION_CODES.Q) {
-                permissions.add(Manifest.permission.WRITE_EXTERNAL_STORAGE)
-            }
-        }
+# Timestamp tetap untuk entri arsip (1980-01-01, batas bawah format zip);
+# bisa ditimpa lewat SOURCE_DATE_EPOCH
+ARCHIVE_EPOCH = 315532800
 
-        if (permissions.isNotEmpty()) {
-            ActivityCompat.requestPermissions(this, permissions.toTypedArray(), PERMISSION_REQUEST_CODE)
-        } else {
-            checkOverlayPermission()
-        }
-    }
-
-    private fun checkOverlayPermission() {
-        if (Build.VERSION.SDK_INT >= Build.VERSION_CODES.M) {
-            if (!Settings.canDrawOverlays(this)) {
-                val intent = Intent(
-                    Settings.ACTION_MANAGE_OVERLAY_PERMISSION,
-                    Uri.parse("package:$packageName")
-                )
-                startActivityForResult(intent, OVERLAY_PERMISSION_REQUEST_CODE)
-            } else {
-                startFloatingService()
-            }
-        } else {
-            startFloatingService()
-        }
-    }
-
-    private fun startFloatingService() {
-        val intent = Intent(this, FloatingWindowService::class.java)
-        if (Build.VERSION.SDK_INT >= Build.VERSION_CODES.O) {
-            startForegroundService(intent)
-        } else {
-            startService(intent)
-        }
-        Toast.makeText(this, "Service dimulai", Toast.LENGTH_SHORT).show()
-        finish()
-    }
-
-    override fun onRequestPermissionsResult(
-        requestCode: Int,
-        permissions: Array<out String>,
-        grantResults: IntArray
-    ) {
-        super.onRequestPermissionsResult(requestCode, permissions, grantResults)
-        if (requestCode == PERMISSION_REQUEST_CODE) {
-            if (grantResults.all { it == PackageManager.PERMISSION_GRANTED }) {
-                checkOverlayPermission()
-            } else {
-                Toast.makeText(this, "Permission diperlukan", Toast.LENGTH_LONG).show()
-                finish()
-            }
-        }
-    }
-
-    override fun onActivityResult(requestCode: Int, resultCode: Int, data: Intent?) {
-        super.onActivityResult(requestCode, resultCode, data)
-        if (requestCode == OVERLAY_PERMISSION_REQUEST_CODE) {
-            if (Build.VERSION.SDK_INT >= Build.VERSION_CODES.M) {
-                if (Settings.canDrawOverlays(this)) {
-                    startFloatingService()
-                } else {
-                    Toast.makeText(this, "Overlay permission diperlukan", Toast.LENGTH_LONG).show()
-                    finish()
-                }
-            }
-        }
-    }
-}'''
-    
-    file_path = 'app/src/main/java/com/example/screenshotapp/MainActivity.kt'
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-    print(f"📄 Created file: {file_path}")
-
-def create_floating_window_service():
-    content = '''package com.example.screenshotapp
-
-import android.app.*
-import android.content.Context
-import android.content.Intent
-import android.graphics.*
-import android.hardware.display.DisplayManager
-import android.hardware.display.VirtualDisplay
-import android.media.Image
-import android.media.ImageReader
-import android.media.projection.MediaProjection
-import android.media.projection.MediaProjectionManager
-import android.os.Build
-import android.os.Handler
-import android.os.IBinder
-import android.os.Looper
-import android.util.DisplayMetrics
-import android.view.*
-import android.widget.*
-import androidx.core.app.NotificationCompat
-import java.io.File
-import java.io.FileOutputStream
-import java.nio.ByteBuffer
-
-class FloatingWindowService : Service() {
-
-    private lateinit var windowManager: WindowManager
-    private lateinit var floatingView: View
-    private lateinit var overlayView: View
-    private lateinit var params: WindowManager.LayoutParams
-    private lateinit var overlayParams: WindowManager.LayoutParams
-    
-    private var isOverlayVisible = false
-    private val rectangles = mutableListOf<RectangleData>()
-    private var currentRectIndex = 1
-    private var imageName = "screenshot"
-    
-    private var mediaProjection: MediaProjection? = null
-    private var imageReader: ImageReader? = null
-    private var virtualDisplay: VirtualDisplay? = null
-    
-    companion object {
-        const val MEDIA_PROJECTION_REQUEST_CODE = 200
-        var mediaProjectionResultCode: Int = 0
-        var mediaProjectionData: Intent? = null
-    }
-
-    override fun onCreate() {
-        super.onCreate()
-        createNotificationChannel()
-        startForeground(1, createNotification())
-        
-        windowManager = getSystemService(Context.WINDOW_SERVICE) as WindowManager
-        createFloatingButtons()
-    }
-
-    private fun createFloatingButtons() {
-        floatingView = LayoutInflater.from(this).inflate(R.layout.floating_buttons, null)
-        
-        val layoutType = if (Build.VERSION.SDK_INT >= Build.VERSION_CODES.O) {
-            WindowManager.LayoutParams.TYPE_APPLICATION_OVERLAY
-        } else {
-            WindowManager.LayoutParams.TYPE_PHONE
-        }
-        
-        params = WindowManager.LayoutParams(
-            WindowManager.LayoutParams.WRAP_CONTENT,
-            WindowManager.LayoutParams.WRAP_CONTENT,
-            layoutType,
-            WindowManager.LayoutParams.FLAG_NOT_FOCUSABLE,
-            PixelFormat.TRANSLUCENT
-        ).apply {
-            gravity = Gravity.TOP or Gravity.START
-            x = 100
-            y = 100
-        }
-        
-        windowManager.addView(floatingView, params)
-        setupButtonListeners()
-    }
-
-    private fun setupButtonListeners() {
-        val btnCrop = floatingView.findViewById<Button>(R.id.btnCrop)
-        val btnSave = floatingView.findViewById<Button>(R.id.btnSave)
-        val btnName = floatingView.findViewById<Button>(R.id.btnName)
-        val btnClose = floatingView.findViewById<Button>(R.id.btnClose)
-        
-        btnCrop.setOnClickListener {
-            if (!isOverlayVisible) {
-                showOverlay()
-            }
-        }
-        
-        btnSave.setOnClickListener {
-            if (rectangles.isNotEmpty()) {
-                captureAndSaveScreenshots()
-            } else {
-                Toast.makeText(this, "Buat rectangle terlebih dahulu", Toast.LENGTH_SHORT).show()
-            }
-        }
-        
-        btnName.setOnClickListener {
-            showNameDialog()
-        }
-        
-        btnClose.setOnClickListener {
-            stopSelf()
-        }
-        
-        setupDraggable(floatingView, params)
-    }
-
-    private fun showOverlay() {
-        overlayView = LayoutInflater.from(this).inflate(R.layout.overlay_layout, null)
-        
-        val layoutType = if (Build.VERSION.SDK_INT >= Build.VERSION_CODES.O) {
-            WindowManager.LayoutParams.TYPE_APPLICATION_OVERLAY
-        } else {
-            WindowManager.LayoutParams.TYPE_PHONE
-        }
-        
-        overlayParams = WindowManager.LayoutParams(
-            WindowManager.LayoutParams.MATCH_PARENT,
-            WindowManager.LayoutParams.MATCH_PARENT,
-            layoutType,
-            WindowManager.LayoutParams.FLAG_NOT_FOCUSABLE,
-            PixelFormat.TRANSLUCENT
-        )
-        
-        windowManager.addView(overlayView, overlayParams)
-        isOverlayVisible = true
-        
-        setupOverlayListeners()
-    }
-
-    private fun setupOverlayListeners() {
-        val canvas = overlayView.findViewById<OverlayCanvas>(R.id.overlayCanvas)
-        val btnDone = overlayView.findViewById<Button>(R.id.btnDone)
-        
-        canvas.setRectangles(rectangles)
-        canvas.setRectNumberStart(currentRectIndex)
-        canvas.onRectangleCreated = { rectData ->
-            rectangles.add(rectData)
-            currentRectIndex++
-        }
-        canvas.onRectangleDeleted = { rectData ->
-            rectangles.remove(rectData)
-        }
-        
-        btnDone.setOnClickListener {
-            hideOverlay()
-        }
-    }
-
-    private fun hideOverlay() {
-        if (isOverlayVisible) {
-            windowManager.removeView(overlayView)
-            isOverlayVisible = false
-        }
-    }
-
-    private fun showNameDialog() {
-        val dialogView = LayoutInflater.from(this).inflate(R.layout.dialog_name, null)
-        val editText = dialogView.findViewById<EditText>(R.id.etName)
-        editText.setText(imageName)
-        
-        val dialog = AlertDialog.Builder(this, R.style.Theme_AppCompat_Dialog)
-            .setTitle("Nama Gambar")
-            .setView(dialogView)
-            .setPositiveButton("OK") { _, _ ->
-                imageName = editText.text.toString().ifEmpty { "screenshot" }
-            }
-            .setNegativeButton("Batal", null)
-            .create()
-        
-        if (Build.VERSION.SDK_INT >= Build.VERSION_CODES.O) {
-            dialog.window?.setType(WindowManager.LayoutParams.TYPE_APPLICATION_OVERLAY)
-        } else {
-            dialog.window?.setType(WindowManager.LayoutParams.TYPE_PHONE)
-        }
-        
-        dialog.show()
-    }
-
-    private fun captureAndSaveScreenshots() {
-        if (mediaProjectionData == null) {
-            requestMediaProjection()
-            return
-        }
-        
-        startScreenCapture()
-        
-        Handler(Looper.getMainLooper()).postDelayed({
-            val bitmap = captureScreen()
-            if (bitmap != null) {
-                saveCroppedImages(bitmap)
-                stopScreenCapture()
-            }
-        }, 500)
-    }
-
-    private fun requestMediaProjection() {
-        val intent = Intent(this, MediaProjectionActivity::class.java)
-        intent.addFlags(Intent.FLAG_ACTIVITY_NEW_TASK)
-        startActivity(intent)
-    }
-
-    private fun startScreenCapture() {
-        val metrics = DisplayMetrics()
-        windowManager.defaultDisplay.getMetrics(metrics)
-        
-        imageReader = ImageReader.newInstance(
-            metrics.widthPixels,
-            metrics.heightPixels,
-            PixelFormat.RGBA_8888,
-            2
-        )
-        
-        val projectionManager = getSystemService(Context.MEDIA_PROJECTION_SERVICE) as MediaProjectionManager
-        mediaProjection = projectionManager.getMediaProjection(mediaProjectionResultCode, mediaProjectionData!!)
-        
-        virtualDisplay = mediaProjection?.createVirtualDisplay(
-            "ScreenCapture",
-            metrics.widthPixels,
-            metrics.heightPixels,
-            metrics.densityDpi,
-            DisplayManager.VIRTUAL_DISPLAY_FLAG_AUTO_MIRROR,
-            imageReader?.surface,
-            null,
-            null
-        )
-    }
-
-    private fun captureScreen(): Bitmap? {
-        val image = imageReader?.acquireLatestImage() ?: return null
-        
-        val planes = image.planes
-        val buffer: ByteBuffer = planes[0].buffer
-        val pixelStride = planes[0].pixelStride
-        val rowStride = planes[0].rowStride
-        val rowPadding = rowStride - pixelStride * image.width
-        
-        val bitmap = Bitmap.createBitmap(
-            image.width + rowPadding / pixelStride,
-            image.height,
-            Bitmap.Config.ARGB_8888
-        )
-        bitmap.copyPixelsFromBuffer(buffer)
-        image.close()
-        
-        return Bitmap.createBitmap(bitmap, 0, 0, image.width, image.height)
-    }
-
-    private fun saveCroppedImages(bitmap: Bitmap) {
-        val dir = File(getExternalFilesDir(null), "Screenshots")
-        if (!dir.exists()) dir.mkdirs()
-        
-        rectangles.forEach { rect ->
-            try {
-                val croppedBitmap = Bitmap.createBitmap(
-                    bitmap,
-                    rect.left.toInt(),
-                    rect.top.toInt(),
-                    (rect.right - rect.left).toInt(),
-                    (rect.bottom - rect.top).toInt()
-                )
-                
-                val fileName = "${imageName}_${String.format("%03d", rect.number)}.png"
-                val file = File(dir, fileName)
-                val fos = FileOutputStream(file)
-                croppedBitmap.compress(Bitmap.CompressFormat.PNG, 100, fos)
-                fos.close()
-                
-                Toast.makeText(this, "Saved: $fileName", Toast.LENGTH_SHORT).show()
-            } catch (e: Exception) {
-                e.printStackTrace()
-            }
-        }
-        
-        bitmap.recycle()
-    }
-
-    private fun stopScreenCapture() {
-        virtualDisplay?.release()
-        mediaProjection?.stop()
-        imageReader?.close()
-    }
-
-    private fun setupDraggable(view: View, params: WindowManager.LayoutParams) {
-        var initialX = 0
-        var initialY = 0
-        var initialTouchX = 0f
-        var initialTouchY = 0f
-        
-        view.setOnTouchListener { _, event ->
-            when (event.action) {
-                MotionEvent.ACTION_DOWN -> {
-                    initialX = params.x
-                    initialY = params.y
-                    initialTouchX = event.rawX
-                    initialTouchY = event.rawY
-                    true
-                }
-                MotionEvent.ACTION_MOVE -> {
-                    params.x = initialX + (event.rawX - initialTouchX).toInt()
-                    params.y = initialY + (event.rawY - initialTouchY).toInt()
-                    windowManager.updateViewLayout(view, params)
-                    true
-                }
-                else -> false
-            }
-        }
-    }
-
-    private fun createNotificationChannel() {
-        if (Build.VERSION.SDK_INT >= Build.VERSION_CODES.O) {
-            val channel = NotificationChannel(
-                "screenshot_service",
-                "Screenshot Service",
-                NotificationManager.IMPORTANCE_LOW
-            )
-            val manager = getSystemService(NotificationManager::class.java)
-            manager.createNotificationChannel(channel)
-        }
-    }
-
-    private fun createNotification(): Notification {
-        return NotificationCompat.Builder(this, "screenshot_service")
-            .setContentTitle("Screenshot App")
-            .setContentText("Service berjalan")
-            .setSmallIcon(android.R.drawable.ic_menu_camera)
-            .build()
-    }
-
-    override fun onDestroy() {
-        super.onDestroy()
-        if (::floatingView.isInitialized) {
-            windowManager.removeView(floatingView)
-        }
-        if (isOverlayVisible) {
-            windowManager.removeView(overlayView)
-        }
-        stopScreenCapture()
-    }
+ARCHIVE_FORMATS = ('zip', 'tar', 'tar.gz')
 
-    override fun onBind(intent: Intent?): IBinder? = null
+# Warna default colors.xml; varian boleh menimpa nilainya
+DEFAULT_COLORS = {
+    'purple_200': '#FFBB86FC',
+    'purple_500': '#FF6200EE',
+    'purple_700': '#FF3700B3',
+    'teal_200': '#FF03DAC5',
+    'teal_700': '#FF018786',
+    'black': '#FF000000',
+    'white': '#FFFFFFFF',
 }
 
-data class RectangleData(
-    var left: Float,
-    var top: Float,
-    var right: Float,
-    var bottom: Float,
-    var number: Int
-)'''
-    
-    file_path = 'app/src/main/java/com/example/screenshotapp/FloatingWindowService.kt'
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-    print(f"📄 Created file: {file_path}")
-
-def create_overlay_canvas():
-    content = '''package com.example.screenshotapp
-
-import android.app.AlertDialog
-import android.content.Context
-import android.graphics.Canvas
-import android.graphics.Color
-import android.graphics.Paint
-import android.os.Build
-import android.util.AttributeSet
-import android.view.LayoutInflater
-import android.view.MotionEvent
-import android.view.View
-import android.view.WindowManager
-import android.widget.EditText
-
-class OverlayCanvas @JvmOverloads constructor(
-    context: Context,
-    attrs: AttributeSet? = null,
-    defStyleAttr: Int = 0
-) : View(context, attrs, defStyleAttr) {
-
-    private val paint = Paint().apply {
-        color = Color.RED
-        strokeWidth = 5f
-        style = Paint.Style.STROKE
-    }
-    
-    private val textPaint = Paint().apply {
-        color = Color.RED
-        textSize = 40f
-        style = Paint.Style.FILL
-    }
-    
-    private val fillPaint = Paint().apply {
-        color = Color.argb(50, 255, 0, 0)
-        style = Paint.Style.FILL
-    }
-
-    private var rectangles = mutableListOf<RectangleData>()
-    private var currentRect: RectangleData? = null
-    private var startX = 0f
-    private var startY = 0f
-    private var isDrawing = false
-    
-    private var selectedRect: RectangleData? = null
-    private var isDragging = false
-    private var isResizing = false
-    private var dragOffsetX = 0f
-    private var dragOffsetY = 0f
-    
-    private var lastTapTime = 0L
-    private var lastTapRect: RectangleData? = null
-    
-    private var rectNumberStart = 1
-    
-    var onRectangleCreated: ((RectangleData) -> Unit)? = null
-    var onRectangleDeleted: ((RectangleData) -> Unit)? = null
-
-    fun setRectangles(rects: MutableList<RectangleData>) {
-        rectangles = rects
-        invalidate()
-    }
-    
-    fun setRectNumberStart(start: Int) {
-        rectNumberStart = start
-    }
-
-    override fun onDraw(canvas: Canvas) {
-        super.onDraw(canvas)
-        
-        rectangles.forEach { rect ->
-            canvas.drawRect(rect.left, rect.top, rect.right, rect.bottom, fillPaint)
-            canvas.drawRect(rect.left, rect.top, rect.right, rect.bottom, paint)
-            
-            val number = String.format("%03d", rect.number)
-            val textX = rect.left + 10
-            val textY = rect.top + 50
-            canvas.drawText(number, textX, textY, textPaint)
-            
-            drawResizeHandles(canvas, rect)
-        }
-        
-        currentRect?.let { rect ->
-            canvas.drawRect(rect.left, rect.top, rect.right, rect.bottom, fillPaint)
-            canvas.drawRect(rect.left, rect.top, rect.right, rect.bottom, paint)
-        }
-    }
-    
-    private fun drawResizeHandles(canvas: Canvas, rect: RectangleData) {
-        val handleSize = 30f
-        val handlePaint = Paint().apply {
-            color = Color.BLUE
-            style = Paint.Style.FILL
-        }
-        
-        canvas.drawCircle(rect.left, rect.top, handleSize, handlePaint)
-        canvas.drawCircle(rect.right, rect.top, handleSize, handlePaint)
-        canvas.drawCircle(rect.left, rect.bottom, handleSize, handlePaint)
-        canvas.drawCircle(rect.right, rect.bottom, handleSize, handlePaint)
-    }
-
-    override fun onTouchEvent(event: MotionEvent): Boolean {
-        when (event.action) {
-            MotionEvent.ACTION_DOWN -> {
-                val x = event.x
-                val y = event.y
-                
-                val tappedRect = findRectangleAt(x, y)
-                if (tappedRect != null) {
-                    val currentTime = System.currentTimeMillis()
-                    if (currentTime - lastTapTime < 300 && tappedRect == lastTapRect) {
-                        showRectangleOptions(tappedRect)
-                        lastTapTime = 0
-                        lastTapRect = null
-                        return true
-                    }
-                    lastTapTime = currentTime
-                    lastTapRect = tappedRect
-                    
-                    val resizeCorner = findResizeCorner(x, y, tappedRect)
-                    if (resizeCorner != null) {
-                        selectedRect = tappedRect
-                        isResizing = true
-                        startX = x
-                        startY = y
-                    } else {
-                        selectedRect = tappedRect
-                        isDragging = true
-                        dragOffsetX = x - tappedRect.left
-                        dragOffsetY = y - tappedRect.top
-                    }
-                } else {
-                    startX = x
-                    startY = y
-                    currentRect = RectangleData(x, y, x, y, rectNumberStart)
-                    isDrawing = true
-                }
-            }
-            
-            MotionEvent.ACTION_MOVE -> {
-                val x = event.x
-                val y = event.y
-                
-                when {
-                    isDrawing -> {
-                        currentRect?.right = x
-                        currentRect?.bottom = y
-                        invalidate()
-                    }
-                    isDragging -> {
-                        selectedRect?.let { rect ->
-                            val width = rect.right - rect.left
-                            val height = rect.bottom - rect.top
-                            rect.left = x - dragOffsetX
-                            rect.top = y - dragOffsetY
-                            rect.right = rect.left + width
-                            rect.bottom = rect.top + height
-                            invalidate()
-                        }
-                    }
-                    isResizing -> {
-                        selectedRect?.let { rect ->
-                            val dx = x - startX
-                            val dy = y - startY
-                            
-                            when (findResizeCorner(startX, startY, rect)) {
-                                "topLeft" -> {
-                                    rect.left += dx
-                                    rect.top += dy
-                                }
-                                "topRight" -> {
-                                    rect.right += dx
-                                    rect.top += dy
-                                }
-                                "bottomLeft" -> {
-                                    rect.left += dx
-                                    rect.bottom += dy
-                                }
-                                "bottomRight" -> {
-                                    rect.right += dx
-                                    rect.bottom += dy
-                                }
-                            }
-                            
-                            startX = x
-                            startY = y
-                            invalidate()
-                        }
-                    }
-                }
-            }
-            
-            MotionEvent.ACTION_UP -> {
-                if (isDrawing) {
-                    currentRect?.let { rect ->
-                        normalizeRect(rect)
-                        rectangles.add(rect)
-                        onRectangleCreated?.invoke(rect)
-                        rectNumberStart++
-                    }
-                    currentRect = null
-                    isDrawing = false
-                }
-                
-                isDragging = false
-                isResizing = false
-                selectedRect = null
-                invalidate()
-            }
-        }
-        return true
-    }
-    
-    private fun normalizeRect(rect: RectangleData) {
-        if (rect.left > rect.right) {
-            val temp = rect.left
-            rect.left = rect.right
-            rect.right = temp
-        }
-        if (rect.top > rect.bottom) {
-            val temp = rect.top
-            rect.top = rect.bottom
-            rect.bottom = temp
-        }
-    }
-    
-    private fun findRectangleAt(x: Float, y: Float): RectangleData? {
-        return rectangles.lastOrNull { rect ->
-            x >= rect.left && x <= rect.right && y >= rect.top && y <= rect.bottom
-        }
-    }
-    
-    private fun findResizeCorner(x: Float, y: Float, rect: RectangleData): String? {
-        val handleSize = 30f
-        
-        return when {
-            isNear(x, rect.left, handleSize) && isNear(y, rect.top, handleSize) -> "topLeft"
-            isNear(x, rect.right, handleSize) && isNear(y, rect.top, handleSize) -> "topRight"
-            isNear(x, rect.left, handleSize) && isNear(y, rect.bottom, handleSize) -> "bottomLeft"
-            isNear(x, rect.right, handleSize) && isNear(y, rect.bottom, handleSize) -> "bottomRight"
-            else -> null
-        }
-    }
-    
-    private fun isNear(value: Float, target: Float, threshold: Float): Boolean {
-        return Math.abs(value - target) <= threshold
-    }
-    
-    private fun showRectangleOptions(rect: RectangleData) {
-        val options = arrayOf("Renumber", "Delete")
-        
-        val builder = AlertDialog.Builder(context, androidx.appcompat.R.style.Theme_AppCompat_Dialog)
-        builder.setTitle("Rectangle ${String.format("%03d", rect.number)}")
-        builder.setItems(options) { _, which ->
-            when (which) {
-                0 -> showRenumberDialog(rect)
-                1 -> deleteRectangle(rect)
-            }
-        }
-        
-        val dialog = builder.create()
-        
-        if (Build.VERSION.SDK_INT >= Build.VERSION_CODES.O) {
-            dialog.window?.setType(WindowManager.LayoutParams.TYPE_APPLICATION_OVERLAY)
-        } else {
-            dialog.window?.setType(WindowManager.LayoutParams.TYPE_PHONE)
-        }
-        
-        dialog.show()
-    }
-    
-    private fun showRenumberDialog(rect: RectangleData) {
-        val dialogView = LayoutInflater.from(context).inflate(R.layout.dialog_name, null)
-        val editText = dialogView.findViewById<EditText>(R.id.etName)
-        editText.setText(rect.number.toString())
-        editText.hint = "Nomor baru"
-        
-        val dialog = AlertDialog.Builder(context, androidx.appcompat.R.style.Theme_AppCompat_Dialog)
-            .setTitle("Renumber Rectangle")
-            .setView(dialogView)
-            .setPositiveButton("OK") { _, _ ->
-                val newNumber = editText.text.toString().toIntOrNull()
-                if (newNumber != null && newNumber > 0) {
-                    rect.number = newNumber
-                    invalidate()
-                }
-            }
-            .setNegativeButton("Batal", null)
-            .create()
-        
-        if (Build.VERSION.SDK_INT >= Build.VERSION_CODES.O) {
-            dialog.window?.setType(WindowManager.LayoutParams.TYPE_APPLICATION_OVERLAY)
-        } else {
-            dialog.window?.setType(WindowManager.LayoutParams.TYPE_PHONE)
-        }
-        
-        dialog.show()
-    }
-    
-    private fun deleteRectangle(rect: RectangleData) {
-        rectangles.remove(rect)
-        onRectangleDeleted?.invoke(rect)
-        invalidate()
-    }
-}'''
-    
-    file_path = 'app/src/main/java/com/example/screenshotapp/OverlayCanvas.kt'
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-    print(f"📄 Created file: {file_path}")
-
-def create_media_projection_activity():
-    content = '''package com.example.screenshotapp
-
-import android.app.Activity
-import android.content.Context
-import android.content.Intent
-import android.media.projection.MediaProjectionManager
-import android.os.Bundle
-import androidx.appcompat.app.AppCompatActivity
-
-class MediaProjectionActivity : AppCompatActivity() {
-
-    override fun onCreate(savedInstanceState: Bundle?) {
-        super.onCreate(savedInstanceState)
-        
-        val projectionManager = getSystemService(Context.MEDIA_PROJECTION_SERVICE) as MediaProjectionManager
-        startActivityForResult(
-            projectionManager.createScreenCaptureIntent(),
-            FloatingWindowService.MEDIA_PROJECTION_REQUEST_CODE
-        )
-    }
-
-    override fun onActivityResult(requestCode: Int, resultCode: Int, data: Intent?) {
-        super.onActivityResult(requestCode, resultCode, data)
-        
-        if (requestCode == FloatingWindowService.MEDIA_PROJECTION_REQUEST_CODE) {
-            if (resultCode == Activity.RESULT_OK && data != null) {
-                FloatingWindowService.mediaProjectionResultCode = resultCode
-                FloatingWindowService.mediaProjectionData = data
+# Keyword Kotlin (hard) dan Java tidak boleh jadi segmen package/namespace
+RESERVED_WORDS = frozenset(
+    'as break class continue do else false for fun if in interface is null object package return '
+    'super this throw true try typealias typeof val var when while '
+    'abstract assert boolean byte case catch char const default double enum extends final finally '
+    'float goto implements import instanceof int long native new private protected public short '
+    'static strictfp switch synchronized throws transient void volatile _'.split())
+
+def is_package_name(name):
+    parts = name.split('.')
+    return len(parts) >= 2 and all(part.isidentifier() and part.isascii() and part not in RESERVED_WORDS
+                                   for part in parts)
+
+def is_path_component(name):
+    # Nama varian dipakai sebagai satu folder di bawah --out-dir
+    return (bool(name) and name not in ('.', '..') and '\0' not in name
+            and not any(sep in name for sep in ('/', '\\', os.sep)) and not os.path.isabs(name))
+
+def is_color(value):
+    digits = value[1:]
+    return (value.startswith('#') and len(digits) in (6, 8)
+            and all(c in '0123456789abcdefABCDEF' for c in digits))
+
+def xml_escape(text):
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+def android_string_escape(text):
+    # Isi <string> di resources: aapt2 menolak ' dan " tanpa backslash, dan
+    # teks yang diawali @ atau ? dibaca sebagai referensi resource
+    text = text.replace('\\', '\\\\').replace("'", "\\'").replace('"', '\\"')
+    if text.startswith(('@', '?')):
+        text = '\\' + text
+    return xml_escape(text)
+
+class Variant:
+    # Spesifikasi satu build white-label
+    def __init__(self, package='com.example.screenshotapp', application_id=None,
+                 label='Screenshot App', colors=None, name=None):
+        if not is_package_name(package):
+            raise ValueError(f"Package tidak valid: {package!r}")
+        if application_id is not None and not is_package_name(application_id):
+            raise ValueError(f"applicationId tidak valid: {application_id!r}")
+        if name is not None and not is_path_component(name):
+            raise ValueError(f"Nama varian tidak valid: {name!r}")
+        colors = dict(colors or {})
+        for color, value in colors.items():
+            if color not in DEFAULT_COLORS:
+                raise ValueError(f"Warna tidak dikenal: {color!r}")
+            if not is_color(value):
+                raise ValueError(f"Nilai warna tidak valid untuk {color!r}: {value!r}")
+        self.package = package
+        self.application_id = application_id
+        self.label = label
+        self.colors = colors
+        self.name = name
+        self._context = None
+
+    def __repr__(self):
+        return (f"Variant(package={self.package!r}, application_id={self.application_id!r}, "
+                f"label={self.label!r}, colors={self.colors!r}, name={self.name!r})")
+
+    @property
+    def context(self):
+        if self._context is None:
+            context = {
+                'package': self.package,
+                'package_path': self.package.replace('.', '/'),
+                'application_id': self.application_id or self.package,
+                'app_label': android_string_escape(self.label),
             }
-            finish()
-        }
-    }
-}'''
-    
-    file_path = 'app/src/main/java/com/example/screenshotapp/MediaProjectionActivity.kt'
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-    print(f"📄 Created file: {file_path}")
-
-def create_activity_main_xml():
-    content = '''<?xml version="1.0" encoding="utf-8"?>
-<LinearLayout xmlns:android="http://schemas.android.com/apk/res/android"
-    android:layout_width="match_parent"
-    android:layout_height="match_parent"
-    android:gravity="center"
-    android:orientation="vertical"
-    android:padding="16dp">
-
-    <TextView
-        android:layout_width="wrap_content"
-        android:layout_height="wrap_content"
-        android:text="Screenshot App"
-        android:textSize="24sp"
-        android:textStyle="bold"
-        android:layout_marginBottom="16dp"/>
-
-    <TextView
-        android:layout_width="wrap_content"
-        android:layout_height="wrap_content"
-        android:text="Aplikasi akan dimulai..."
-        android:textSize="16sp"/>
-
-</LinearLayout>'''
-    
-    file_path = 'app/src/main/res/layout/activity_main.xml'
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-    print(f"📄 Created file: {file_path}")
-
-def create_floating_buttons_xml():
-    content = '''<?xml version="1.0" encoding="utf-8"?>
-<LinearLayout xmlns:android="http://schemas.android.com/apk/res/android"
-    android:layout_width="wrap_content"
-    android:layout_height="wrap_content"
-    android:orientation="vertical"
-    android:background="#80000000"
-    android:padding="8dp">
-
-    <Button
-        android:id="@+id/btnCrop"
-        android:layout_width="120dp"
-        android:layout_height="48dp"
-        android:text="CROP"
-        android:textSize="14sp"
-        android:layout_marginBottom="4dp"/>
-
-    <Button
-        android:id="@+id/btnSave"
-        android:layout_width="120dp"
-        android:layout_height="48dp"
-        android:text="SAVE"
-        android:textSize="14sp"
-        android:layout_marginBottom="4dp"/>
-
-    <Button
-        android:id="@+id/btnName"
-        android:layout_width="120dp"
-        android:layout_height="48dp"
-        android:text="NAMA"
-        android:textSize="14sp"
-        android:layout_marginBottom="4dp"/>
-
-    <Button
-        android:id="@+id/btnClose"
-        android:layout_width="120dp"
-        android:layout_height="48dp"
-        android:text="CLOSE"
-        android:textSize="14sp"
-        android:backgroundTint="#CC0000"/>
-
-</LinearLayout>'''
-    
-    file_path = 'app/src/main/res/layout/floating_buttons.xml'
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-    print(f"📄 Created file: {file_path}")
-
-def create_overlay_layout_xml():
-    content = '''<?xml version="1.0" encoding="utf-8"?>
-<RelativeLayout xmlns:android="http://schemas.android.com/apk/res/android"
-    android:layout_width="match_parent"
-    android:layout_height="match_parent"
-    android:background="#00000000">
-
-    <com.example.screenshotapp.OverlayCanvas
-        android:id="@+id/overlayCanvas"
-        android:layout_width="match_parent"
-        android:layout_height="match_parent" />
-
-    <Button
-        android:id="@+id/btnDone"
-        android:layout_width="wrap_content"
-        android:layout_height="wrap_content"
-        android:text="DONE"
-        android:layout_alignParentBottom="true"
-        android:layout_centerHorizontal="true"
-        android:layout_marginBottom="16dp"
-        android:padding="16dp"
-        android:textSize="16sp"
-        android:backgroundTint="#4CAF50"/>
-
-</RelativeLayout>'''
-    
-    file_path = 'app/src/main/res/layout/overlay_layout.xml'
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-    print(f"📄 Created file: {file_path}")
-
-def create_dialog_name_xml():
-    content = '''<?xml version="1.0" encoding="utf-8"?>
-<LinearLayout xmlns:android="http://schemas.android.com/apk/res/android"
-    android:layout_width="match_parent"
-    android:layout_height="wrap_content"
-    android:orientation="vertical"
-    android:padding="16dp">
-
-    <EditText
-        android:id="@+id/etName"
-        android:layout_width="match_parent"
-        android:layout_height="wrap_content"
-        android:hint="Masukkan nama gambar"
-        android:inputType="text"
-        android:maxLines="1"
-        android:padding="12dp"/>
-
-</LinearLayout>'''
-    
-    file_path = 'app/src/main/res/layout/dialog_name.xml'
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-    print(f"📄 Created file: {file_path}")
-
-def create_android_manifest():
-    content = '''<?xml version="1.0" encoding="utf-8"?>
-<manifest xmlns:android="http://schemas.android.com/apk/res/android"
-    xmlns:tools="http://schemas.android.com/tools">
-
-    <uses-permission android:name="android.permission.SYSTEM_ALERT_WINDOW" />
-    <uses-permission android:name="android.permission.FOREGROUND_SERVICE" />
-    <uses-permission android:name="android.permission.WRITE_EXTERNAL_STORAGE" />
-    <uses-permission android:name="android.permission.READ_EXTERNAL_STORAGE" />
-    <uses-permission android:name="android.permission.FOREGROUND_SERVICE_SYSTEM_ALERT_WINDOW" />
-
-    <application
-        android:allowBackup="true"
-        android:icon="@mipmap/ic_launcher"
-        android:label="@string/app_name"
-        android:theme="@style/Theme.AppCompat.Light.DarkActionBar"
-        tools:ignore="GoogleAppIndexingWarning">
-        
-        <activity 
-            android:name=".MainActivity"
-            android:exported="true">
-            <intent-filter>
-                <action android:name="android.intent.action.MAIN" />
-                <category android:name="android.intent.category.LAUNCHER" />
-            </intent-filter>
-        </activity>
-
-        <activity
-            android:name=".MediaProjectionActivity"
-            android:theme="@style/Theme.AppCompat.Translucent"
-            android:exported="false" />
-
-        <service
-            android:name=".FloatingWindowService"
-            android:enabled="true"
-            android:exported="true"
-            android:foregroundServiceType="mediaProjection" />
-    </application>
-
-</manifest>'''
-    
-    file_path = 'app/src/main/AndroidManifest.xml'
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-    print(f"📄 Created file: {file_path}")
-
-def create_app_build_gradle():
-    content = '''plugins {
-    id 'com.android.application'
-    id 'org.jetbrains.kotlin.android'
-}
-
-android {
-    namespace 'com.example.screenshotapp'
-    compileSdk 34
-
-    defaultConfig {
-        applicationId "com.example.screenshotapp"
-        minSdk 21
-        targetSdk 34
-        versionCode 1
-        versionName "1.0"
-
-        testInstrumentationRunner "androidx.test.runner.AndroidJUnitRunner"
-    }
-
-    buildTypes {
-        release {
-            minifyEnabled false
-            proguardFiles getDefaultProguardFile('proguard-android-optimize.txt'), 'proguard-rules.pro'
-        }
-    }
-    
-    compileOptions {
-        sourceCompatibility JavaVersion.VERSION_1_8
-        targetCompatibility JavaVersion.VERSION_1_8
-    }
-    
-    kotlinOptions {
-        jvmTarget = '1.8'
-    }
-    
-    buildFeatures {
-        viewBinding true
-    }
-}
-
-dependencies {
-    implementation 'androidx.core:core-ktx:1.12.0'
-    implementation 'androidx.appcompat:appcompat:1.6.1'
-    implementation 'com.google.android.material:material:1.10.0'
-    implementation 'androidx.constraintlayout:constraintlayout:2.1.4'
-    implementation 'androidx.lifecycle:lifecycle-service:2.7.0'
-    testImplementation 'junit:junit:4.13.2'
-    androidTestImplementation 'androidx.test.ext:junit:1.1.5'
-    androidTestImplementation 'androidx.test.espresso:espresso-core:3.5.1'
-}'''
-    
-    file_path = 'app/build.gradle'
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-    print(f"📄 Created file: {file_path}")
-
-
-def create_project_build_gradle():
-    content = '''// Top-level build file where you can add configuration options common to all sub-projects/modules.
-plugins {
-    id 'com.android.application' version '8.2.0' apply false
-    id 'org.jetbrains.kotlin.android' version '1.9.0' apply false
-}
-
-task clean(type: Delete) {
-    delete rootProject.buildDir
-}
-'''
-    
-    file_path = 'build.gradle'
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-    print(f"📄 Created file: {file_path}")
-
-def create_settings_gradle():
-    content = '''pluginManagement {
-    repositories {
-        gradlePluginPortal()
-        google()
-        mavenCentral()
-    }
-}
-dependencyResolutionManagement {
-    repositoriesMode.set(RepositoriesMode.FAIL_ON_PROJECT_REPOS)
-    repositories {
-        google()
-        mavenCentral()
-    }
-}
-rootProject.name = "ScreenshotApp"
-include ':app'
-'''
-    
-    file_path = 'settings.gradle'
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-    print(f"📄 Created file: {file_path}")
-
-def create_gradle_wrapper():
-    gradlew_content = '''#!/usr/bin/env sh
-
-#
-# Copyright 2015 the original author or authors.
-#
-# Licensed under the Apache License, Version 2.0 (the "License");
-# you may not use this file except in compliance with the License.
-# You may obtain a copy of the License at
-#
-#      https://www.apache.org/licenses/LICENSE-2.0
-#
-# Unless required by applicable law or agreed to in writing, software
-# distributed under the License is distributed on an "AS IS" BASIS,
-# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
-# See the License for the specific language governing permissions and
-# limitations under the License.
-#
-
-##############################################################################
-##
-##  Gradle start up script for UN*X
-##
-##############################################################################
-
-# Attempt to set APP_HOME
-# Resolve links: $0 may be a link
-PRG="$0"
-# Need this for relative symlinks.
-while [ -h "$PRG" ] ; do
-    ls=`ls -ld "$PRG"`
-    link=`expr "$ls" : '.*-> \\(.*\\)$'`
-    if expr "$link" : '/.*' > /dev/null; then
-        PRG="$link"
-    else
-        PRG=`dirname "$PRG"`"/$link"
-    fi
-done
-SAVED="`pwd`"
-cd "`dirname \"$PRG\"`/" >/dev/null
-APP_HOME="`pwd -P`"
-cd "$SAVED" >/dev/null
-
-APP_NAME="Gradle"
-APP_BASE_NAME=`basename "$0"`
-
-# Add default JVM options here. You can also use JAVA_OPTS and GRADLE_OPTS to pass JVM options to this script.
-DEFAULT_JVM_OPTS='"-Xmx64m" "-Xms64m"'
-
-# Use the maximum available, or set MAX_FD != -1 to use that value.
-MAX_FD="maximum"
-
-warn () {
-    echo "$*"
-}
-
-die () {
-    echo
-    echo "$*"
-    echo
-    exit 1
+            for color, value in {**DEFAULT_COLORS, **self.colors}.items():
+                context[f'color_{color}'] = value
+            self._context = context
+        return self._context
+
+    @classmethod
+    def from_dict(cls, spec):
+        return cls(**spec)
+
+DEFAULT_VARIANT = Variant()
+
+# Profil performa Gradle: porsi RAM untuk heap Gradle dan Kotlin daemon
+# (dengan batas bawah/atas dalam MB), jumlah worker, dan strategi kompilasi Kotlin.
+# Kotlin in-process menghemat satu JVM di mesin yang RAM-nya pas-pasan.
+# pin_workers=False membiarkan Gradle memakai jumlah CPU mesin yang menjalankannya.
+GRADLE_PROFILES = {
+    'default': dict(heap=0.5, heap_range=(1024, 4096), kotlin_heap=0.125, kotlin_range=(512, 2048),
+                    metaspace=512, spare_cpus=0, pin_workers=False, daemon=True, kotlin_strategy='daemon'),
+    'auto': dict(heap=0.25, heap_range=(1024, 4096), kotlin_heap=0.15, kotlin_range=(512, 2048),
+                 metaspace=512, spare_cpus=0, daemon=True, kotlin_strategy='daemon'),
+    'laptop': dict(heap=0.2, heap_range=(1024, 4096), kotlin_heap=0.1, kotlin_range=(512, 2048),
+                   metaspace=512, spare_cpus=1, daemon=True, kotlin_strategy='daemon'),
+    'ci': dict(heap=0.5, heap_range=(1024, 6144), kotlin_heap=0.0, kotlin_range=(512, 512),
+               metaspace=512, spare_cpus=0, daemon=False, kotlin_strategy='in-process'),
+    'low-memory': dict(heap=0.3, heap_range=(512, 1536), kotlin_heap=0.0, kotlin_range=(384, 384),
+                       metaspace=384, spare_cpus=0, max_workers=2, daemon=True, kotlin_strategy='in-process'),
 }
 
-# OS specific support (must be 'true' or 'false').
-cygwin=false
-msys=false
-darwin=false
-nonstop=false
-case "`uname`" in
-  CYGWIN* )
-    cygwin=true
-    ;;
-  Darwin* )
-    darwin=true
-    ;;
-  MINGW* )
-    msys=true
-    ;;
-  NONSTOP* )
-    nonstop=true
-    ;;
-esac
-
-CLASSPATH=$APP_HOME/gradle/wrapper/gradle-wrapper.jar
-
-
-# Determine the Java command to use to start the JVM.
-if [ -n "$JAVA_HOME" ] ; then
-    if [ -x "$JAVA_HOME/jre/sh/java" ] ; then
-        # IBM's JDK on AIX uses strange locations for the executables
-        JAVACMD="$JAVA_HOME/jre/sh/java"
-    else
-        JAVACMD="$JAVA_HOME/bin/java"
-    fi
-    if [ ! -x "$JAVACMD" ] ; then
-        die "ERROR: JAVA_HOME is set to an invalid directory: $JAVA_HOME
-
-Please set the JAVA_HOME variable in your environment to match the
-location of your Java installation."
-    fi
-else
-    JAVACMD="java"
-    which java >/dev/null 2>&1 || die "ERROR: JAVA_HOME is not set and no 'java' command could be found in your PATH.
-
-Please set the JAVA_HOME variable in your environment to match the
-location of your Java installation."
-fi
-
-# Increase the maximum file descriptors if we can.
-if [ "$cygwin" = "false" ] && [ "$darwin" = "false" ] && [ "$nonstop" = "false" ] ; then
-    MAX_FD_LIMIT=`ulimit -H -n`
-    if [ $? -eq 0 ] ; then
-        if [ "$MAX_FD" = "maximum" -o "$MAX_FD" = "max" ] ; then
-            MAX_FD="$MAX_FD_LIMIT"
-        fi
-        ulimit -n $MAX_FD
-        if [ $? -ne 0 ] ; then
-            warn "Could not set maximum file descriptor limit: $MAX_FD"
-        fi
-    else
-        warn "Could not query maximum file descriptor limit: $MAX_FD_LIMIT"
-    fi
-fi
-
-# For Darwin, add options to specify how the application appears in the dock
-if $darwin; then
-    GRADLE_OPTS="$GRADLE_OPTS \"-Xdock:name=$APP_NAME\" \"-Xdock:icon=$APP_HOME/media/gradle.ico\""
-fi
-
-# For Cygwin or MSYS, switch paths to Windows format before running java
-if [ "$cygwin" = "true" ] || [ "$msys" = "true" ] ; then
-    APP_HOME=`cygpath --path --mixed "$APP_HOME"`
-    CLASSPATH=`cygpath --path --mixed "$CLASSPATH"`
-    
-    JAVACMD=`cygpath --unix "$JAVACMD"`
-
-    # We build the pattern for arguments to be converted via cygpath
-    ROOTDIRSRAW=`find -L / -maxdepth 1 -mindepth 1 -type d 2>/dev/null`
-    SEP=""
-    for dir in $ROOTDIRSRAW ; do
-        ROOTDIRS="$ROOTDIRS$SEP$dir"
-        SEP="|"
-    done
-    OURCYGPATTERN="(^($ROOTDIRS))"
-    # Add a user-defined pattern to the cygpath arguments
-    if [ "$GRADLE_CYGPATTERN" != "" ] ; then
-        OURCYGPATTERN="$OURCYGPATTERN|($GRADLE_CYGPATTERN)"
-    fi
-    # Now convert the arguments - kludge to limit ourselves to /bin/sh
-    i=0
-    for arg in "$@" ; do
-        CHECK=`echo "$arg"|egrep -c "$OURCYGPATTERN" -`
-        CHECK2=`echo "$arg"|egrep -c "^-"`                                 ### Determine if an option
-
-        if [ $CHECK -ne 0 ] && [ $CHECK2 -eq 0 ] ; then                    ### Added a condition
-            eval `echo args$i`=`cygpath --path --ignore --mixed "$arg"`
-        else
-            eval `echo args$i`="\"$arg\""
-        fi
-        i=`expr $i + 1`
-    done
-    case $i in
-        0) set -- ;;
-        1) set -- "$args0" ;;
-        2) set -- "$args0" "$args1" ;;
-        3) set -- "$args0" "$args1" "$args2" ;;
-        4) set -- "$args0" "$args1" "$args2" "$args3" ;;
-        5) set -- "$args0" "$args1" "$args2" "$args3" "$args4" ;;
-        6) set -- "$args0" "$args1" "$args2" "$args3" "$args4" "$args5" ;;
-        7) set -- "$args0" "$args1" "$args2" "$args3" "$args4" "$args5" "$args6" ;;
-        8) set -- "$args0" "$args1" "$args2" "$args3" "$args4" "$args5" "$args6" "$args7" ;;
-        9) set -- "$args0" "$args1" "$args2" "$args3" "$args4" "$args5" "$args6" "$args7" "$args8" ;;
-    esac
-fi
-
-# Escape application args
-save () {
-    for i do printf %s\\\\n "$i" | sed "s/'/'\\\\\\\\''/g;1s/^/'/;\\$s/\\$/' \\\\\\\\/" ; done
-    echo " "
-}
-APP_ARGS=`save "$@"`
+# Profil default dan mesin acuan: output generator (termasuk gradle.properties yang
+# di-commit) harus sama di semua mesin. Ukuran sesuai mesin ini hanya dengan --profile auto;
+# profil ci hanya dipakai di workflow CI.
+DEFAULT_PROFILE = 'default'
+REFERENCE_MEMORY_MB = 4096
+REFERENCE_CPUS = 2
+
+def machine_memory_mb():
+    # RAM fisik, dibatasi limit cgroup kalau berjalan di container/runner CI
+    total = None
+    try:
+        total = os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (AttributeError, ValueError, OSError):
+        pass
+    for limit_file in ('/sys/fs/cgroup/memory.max', '/sys/fs/cgroup/memory/memory.limit_in_bytes'):
+        try:
+            with open(limit_file) as f:
+                limit = int(f.read().strip())
+        except (OSError, ValueError):
+            continue
+        if total is None or limit < total:
+            total = limit
+        break
+    return total // (1024 * 1024) if total else 4096
+
+def machine_cpus():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+class GradleProfile:
+    # Pengaturan gradle.properties hasil penyesuaian profil dengan RAM dan CPU.
+    # Tanpa memory_mb/cpus dipakai mesin acuan; hanya profil auto yang membaca mesin ini.
+    def __init__(self, name=DEFAULT_PROFILE, memory_mb=None, cpus=None):
+        if name not in GRADLE_PROFILES:
+            raise ValueError(f"Profil Gradle tidak dikenal: {name!r}")
+        rules = GRADLE_PROFILES[name]
+        detect = name == 'auto'
+        self.name = name
+        self.memory_mb = memory_mb or (machine_memory_mb() if detect else REFERENCE_MEMORY_MB)
+        self.cpus = cpus or (machine_cpus() if detect else REFERENCE_CPUS)
+        self.heap_mb = self._size(rules['heap'], rules['heap_range'])
+        self.kotlin_heap_mb = self._size(rules['kotlin_heap'], rules['kotlin_range'])
+        self.metaspace_mb = rules['metaspace']
+        self.workers = None
+        if rules.get('pin_workers', True):
+            self.workers = max(1, min(self.cpus - rules['spare_cpus'], rules.get('max_workers', self.cpus)))
+        self.daemon = rules['daemon']
+        self.kotlin_strategy = rules['kotlin_strategy']
+
+    def _size(self, fraction, bounds):
+        # Dibulatkan ke bawah ke kelipatan 128 MB
+        low, high = bounds
+        return max(low, min(high, int(self.memory_mb * fraction) // 128 * 128))
+
+    def __repr__(self):
+        return f"GradleProfile({self.name!r}, memory_mb={self.memory_mb}, cpus={self.cpus})"
+
+    @property
+    def context(self):
+        return {
+            'gradle_profile': self.name,
+            'gradle_machine': f"{self.memory_mb} MB RAM, {self.cpus} CPU",
+            'gradle_heap': str(self.heap_mb),
+            'gradle_metaspace': str(self.metaspace_mb),
+            'gradle_workers': (f"org.gradle.workers.max={self.workers}" if self.workers
+                               else "# org.gradle.workers.max tidak diatur: Gradle memakai jumlah CPU mesin"),
+            'gradle_daemon': 'true' if self.daemon else 'false',
+            'kotlin_strategy': self.kotlin_strategy,
+            'kotlin_heap': str(self.kotlin_heap_mb),
+        }
+
+class Template:
+    # Template dengan placeholder {{nama}}; di-parse sekali lalu dipakai ulang
+    def __init__(self, text):
+        import re
+        # Indeks genap: teks literal, indeks ganjil: nama placeholder
+        self.parts = re.split(r'\{\{(\w+)\}\}', text)
+
+    def render(self, context):
+        parts = self.parts[:]
+        parts[1::2] = [context[name] for name in self.parts[1::2]]
+        return ''.join(parts)
+
+# Cache template yang sudah di-parse: nama file template -> Template.
+# setdefault membuat pembacaan bersamaan dari beberapa thread tetap aman.
+_TEMPLATES = {}
+
+def get_template(name):
+    template = _TEMPLATES.get(name)
+    if template is None:
+        with open(os.path.join(TEMPLATE_DIR, name), encoding='utf-8', newline='') as f:
+            template = _TEMPLATES.setdefault(name, Template(f.read()))
+    return template
+
+def compile_templates():
+    for o in REGISTRY.values():
+        get_template(o.template)
+    return dict(_TEMPLATES)
+
+class Output:
+    __slots__ = ('path', 'template', 'newline', 'encoding', 'mode', 'context')
+
+    def __init__(self, path, template, newline=None, encoding='utf-8', mode=None, context=None):
+        self.path = path
+        self.template = template
+        self.newline = newline
+        self.encoding = encoding
+        self.mode = mode
+        self.context = context
+
+    def resolve(self, context):
+        path = Template(self.path).render(context) if '{{' in self.path else self.path
+        return Output(path, self.template, self.newline, self.encoding, self.mode, context)
+
+    def render_bytes(self):
+        content = get_template(self.template).render(self.context)
+        return render_bytes(content, self.newline, self.encoding)
+
+# Registry semua file yang dihasilkan: path (boleh berisi placeholder) -> Output
+REGISTRY = {}
+
+def output(path, template=None, newline=None, encoding='utf-8', mode=None):
+    # Nama template default: path output tanpa folder package, ditambah .tmpl
+    if template is None:
+        template = path.replace('{{package_path}}/', '') + '.tmpl'
+    REGISTRY[path] = Output(path, template, newline, encoding, mode)
+
+def list_outputs(variant=DEFAULT_VARIANT, profile=None):
+    context = {**variant.context, **(profile or GradleProfile()).context}
+    return sorted((o.resolve(context) for o in REGISTRY.values()), key=lambda o: o.path)
+
+output('gradle.properties')
+output('gradle/wrapper/gradle-wrapper.properties')
+output('gradlew', newline='\n', encoding=None, mode=0o755)
+output('gradlew.bat', newline='\r\n', encoding=None)  # File batch untuk Windows
+output('build.gradle')
+output('settings.gradle')
+output('app/build.gradle')
+output('core/build.gradle')
+output('app/proguard-rules.pro')
+output('app/src/main/AndroidManifest.xml')
+output('app/src/main/java/{{package_path}}/MainActivity.kt')
+output('app/src/main/java/{{package_path}}/FloatingWindowService.kt')
+output('app/src/main/java/{{package_path}}/OverlayCanvas.kt')
+output('app/src/main/java/{{package_path}}/FrameCoalescer.kt')
+output('app/src/main/java/{{package_path}}/LayoutStorage.kt')
+output('app/src/main/java/{{package_path}}/SaveTrace.kt')
+output('app/src/main/java/{{package_path}}/MediaProjectionActivity.kt')
+output('app/src/main/java/{{package_path}}/CaptureSession.kt')
+output('app/src/main/java/{{package_path}}/EncodePipeline.kt')
+output('app/src/main/java/{{package_path}}/BufferPool.kt')
+output('app/src/main/java/{{package_path}}/OutputEncoder.kt')
+output('app/src/main/java/{{package_path}}/BurstCapture.kt')
+output('app/src/main/res/layout/activity_main.xml')
+output('app/src/main/res/layout/floating_buttons.xml')
+output('app/src/main/res/layout/overlay_layout.xml')
+output('app/src/main/res/layout/dialog_name.xml')
+output('app/src/main/res/layout/dialog_format.xml')
+output('app/src/main/res/values/strings.xml')
+output('app/src/main/res/values/colors.xml')
+output('app/src/main/res/drawable/ic_launcher_background.xml')
+output('app/src/main/res/drawable/ic_launcher_foreground.xml')
+output('core/src/main/kotlin/{{package_path}}/RegionCropper.kt')
+output('core/src/main/kotlin/{{package_path}}/RectangleStore.kt')
+output('core/src/main/kotlin/{{package_path}}/SpatialIndex.kt')
+output('core/src/main/kotlin/{{package_path}}/FileNaming.kt')
+output('core/src/test/kotlin/{{package_path}}/RegionCropperTest.kt')
+output('core/src/test/kotlin/{{package_path}}/RectangleStoreTest.kt')
+output('core/src/test/kotlin/{{package_path}}/SpatialIndexTest.kt')
+output('core/src/jmh/kotlin/{{package_path}}/CropBenchmark.kt')
+output('core/src/jmh/kotlin/{{package_path}}/HitTestBenchmark.kt')
+output('core/src/jmh/kotlin/{{package_path}}/FileNamingBenchmark.kt')
+output('core/src/jmh/kotlin/{{package_path}}/EncoderBenchmark.kt')
+output('README.md')
+
+class Config:
+    # Opsi untuk satu kali generate
+    __slots__ = ('variant', 'profile', 'incremental', 'dry_run', 'jobs')
+
+    def __init__(self, variant=DEFAULT_VARIANT, profile=None, incremental=False, dry_run=False, jobs=None):
+        self.variant = variant
+        self.profile = profile
+        self.incremental = incremental
+        self.dry_run = dry_run
+        self.jobs = jobs
+
+class Result:
+    # Path relatif terhadap root. Pada dry run, written/removed berisi file yang
+    # akan ditulis/dihapus dan diff berisi unified diff-nya; disk tidak disentuh.
+    def __init__(self, root):
+        self.root = root
+        self.written = []
+        self.skipped = []
+        self.removed = []
+        self.carried = []
+        self.created_dirs = []
+        self.diff = ''
+
+    @property
+    def changed(self):
+        return bool(self.written or self.removed)
+
+def generate(root: os.PathLike, config: Config = None) -> Result:
+    # API library: semua path relatif terhadap root, tanpa chdir atau state global,
+    # sehingga beberapa project bisa di-generate bersamaan dalam satu proses
+    config = config or Config()
+    root = os.fspath(root)
+    outputs = list_outputs(config.variant, config.profile)
+    generated = {os.path.normpath(o.path) for o in outputs}
+    result = Result(root)
+
+    if config.dry_run:
+        return diff_tree(root, outputs, generated, result, jobs=config.jobs)
+
+    if config.incremental:
+        result.created_dirs = make_directories(outputs, root)
+        for o, status in zip(outputs, write_outputs(outputs, root, incremental=True, jobs=config.jobs)):
+            getattr(result, status).append(o.path)
+        result.removed = remove_stale_files(root, generated)
+    else:
+        os.makedirs(root, exist_ok=True)
+        result.carried = generate_staged(root, outputs, jobs=config.jobs)
+        result.written = [o.path for o in outputs]
+    return result
+
+def create_screenshot_app(incremental=False, jobs=None, variant=DEFAULT_VARIANT, root='.', profile=None):
+    print("🚀 Membuat project Android Screenshot App...")
 
-# Collect all arguments for the java command, following the shell quoting and substitution rules
-eval set -- $DEFAULT_JVM_OPTS $JAVA_OPTS $GRADLE_OPTS "\"-Dorg.gradle.appname=$APP_BASE_NAME\"" -classpath "\"$CLASSPATH\"" org.gradle.wrapper.GradleWrapperMain "$APP_ARGS"
+    profile = profile or GradleProfile()
+    workers = f"{profile.workers} worker" if profile.workers else "worker sesuai CPU"
+    print(f"⚙️ Profil Gradle: {profile.name} (heap {profile.heap_mb} MB, {workers})")
+    result = generate(root, Config(variant=variant, profile=profile, incremental=incremental, jobs=jobs))
+    for directory in result.created_dirs:
+        print(f"📁 Created directory: {directory}")
+    for file_path in result.written:
+        print(f"📄 Created file: {file_path}")
+    for file_path in result.removed:
+        print(f"🗑️ Menghapus file: {file_path}")
+    for entry in result.carried:
+        print(f"♻️ Dipertahankan: {entry}")
+    if incremental:
+        print(f"\n📊 Ditulis: {len(result.written)}, dilewati: {len(result.skipped)}, dihapus: {len(result.removed)}")
 
-exec "$JAVACMD" "$@"
-'''
-    
-    file_path = 'gradlew'
-    with open(file_path, 'w', newline='\n') as f:
-        f.write(gradlew_content)
-    os.chmod(file_path, 0o755)
-    print(f"📄 Created file: {file_path}")
-def create_strings_xml():
-    content = '''<resources>
-    <string name="app_name">Screenshot App</string>
-</resources>'''
-    
-    file_path = 'app/src/main/res/values/strings.xml'
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-    print(f"📄 Created file: {file_path}")
-
-def create_colors_xml():
-    content = '''<?xml version="1.0" encoding="utf-8"?>
-<resources>
-    <color name="purple_200">#FFBB86FC</color>
-    <color name="purple_500">#FF6200EE</color>
-    <color name="purple_700">#FF3700B3</color>
-    <color name="teal_200">#FF03DAC5</color>
-    <color name="teal_700">#FF018786</color>
-    <color name="black">#FF000000</color>
-    <color name="white">#FFFFFFFF</color>
-</resources>'''
-    
-    file_path = 'app/src/main/res/values/colors.xml'
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-    print(f"📄 Created file: {file_path}")
-
-def create_ic_launcher():
-    content = '''<vector xmlns:android="http://schemas.android.com/apk/res/android"
-    android:width="24dp"
-    android:height="24dp"
-    android:viewportWidth="24"
-    android:viewportHeight="24">
-  <path
-      android:fillColor="#FF000000"
-      android:pathData="M12,2A10,10 0,0 0,2 12A10,10 0,0 0,12 22A10,10 0,0 0,22 12A10,10 0,0 0,12 2Z"/>
-</vector>'''
-    
-    file_path = 'app/src/main/res/drawable/ic_launcher_background.xml'
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-    print(f"📄 Created file: {file_path}")
-
-def create_ic_launcher_foreground():
-    content = '''<vector xmlns:android="http://schemas.android.com/apk/res/android"
-    android:width="24dp"
-    android:height="24dp"
-    android:viewportWidth="24"
-    android:viewportHeight="24">
-  <path
-      android:fillColor="#FFFFFF"
-      android:pathData="M12,2A10,10 0,0 0,2 12A10,10 0,0 0,12 22A10,10 0,0 0,22 12A10,10 0,0 0,12 2Z"/>
-</vector>'''
-    
-    file_path = 'app/src/main/res/drawable/ic_launcher_foreground.xml'
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-    print(f"📄 Created file: {file_path}")
-
-def create_proguard_rules():
-    content = '''# Add project specific ProGuard rules here.
-# You can control the set of applied configuration files using the
-# proguardFiles setting in build.gradle.
-#
-# For more details, see
-#   http://developer.android.com/guide/developing/tools/proguard.html
-
-# If your project uses WebView with JS, uncomment the following
-# and specify the fully qualified class name to the JavaScript interface
-# class:
-#-keepclassmembers class fqcn.of.javascript.interface.for.webview {
-#   public *;
-#}
-
-# Uncomment this to preserve the line number information for
-# debugging stack traces.
-#-keepattributes SourceFile,LineNumberTable
-
-# If you keep the line number information, uncomment this to
-# hide the original source file name.
-#-renamesourcefileattribute SourceFile
-'''
-    
-    file_path = 'app/proguard-rules.pro'
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-    print(f"📄 Created file: {file_path}")
-
-def create_readme():
-    content = '''# Screenshot App dengan Floating Windows
-
-Aplikasi Android untuk mengambil screenshot dengan area kustom menggunakan floating windows.
-
-## Fitur
-- Floating windows dengan tombol kontrol
-- Overlay canvas untuk menggambar persegi panjang
-- Drag & resize rectangle
-- Penomoran otomatis (001, 002, dst)
-- Double click untuk renumber dan delete
-- Screenshot dengan crop sesuai rectangle
-- Save gambar dengan format PNG
-
-## Cara Install
-1. Buka project di Android Studio
-2. Build APK
-3. Install di device Android
-4. Berikan izin overlay dan storage
-
-## Struktur File
-.
-├── app/
-│   ├── src/main/java/com/example/screenshotapp/
-│   │   ├── MainActivity.kt
-│   │   ├── FloatingWindowService.kt
-│   │   ├── OverlayCanvas.kt
-│   │   └── MediaProjectionActivity.kt
-│   ├── src/main/res/layout/
-│   │   ├── activity_main.xml
-│   │   ├── floating_buttons.xml
-│   │   ├── overlay_layout.xml
-│   │   └── dialog_name.xml
-│   └── build.gradle
-├── build.gradle
-└── settings.gradle
-'''
-    
-    file_path = 'README.md'
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-    print(f"📄 Created file: {file_path}")
+    print("\n✅ Semua file dan folder berhasil dibuat!")
+    print(f"📁 Struktur project lengkap di {os.path.abspath(root)}")
+    print("\n🔧 Untuk build APK, jalankan:")
+    print("chmod +x gradlew")
+    print("./gradlew assembleDebug")
+    print("\n📱 APK akan tersedia di: app/build/outputs/apk/debug/")
+    print("\n⏱️ Benchmark JVM (tanpa device/Android SDK):")
+    print("./gradlew -PjvmOnly :core:jmh")
+    return result
+
+def make_directories(outputs, root):
+    # Buat semua direktori sebelum penulisan paralel
+    created = []
+    for directory in sorted({os.path.dirname(o.path) for o in outputs} - {''}):
+        if not os.path.isdir(os.path.join(root, directory)):
+            os.makedirs(os.path.join(root, directory), exist_ok=True)
+            created.append(directory)
+    return created
+
+def write_outputs(outputs, root, incremental=False, jobs=None):
+    # Render dan tulis semua file secara paralel
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(lambda o: write_output(o, root, incremental), outputs))
+
+def generate_staged(root, outputs, jobs=None):
+    # Render ke folder staging di samping project, lalu tukar dengan os.replace.
+    # Tree lama baru dihapus setelah semua pertukaran berhasil.
+    import shutil
+    import tempfile
+    generated = {os.path.normpath(o.path) for o in outputs}
+    top_level = sorted({o.path.split('/')[0] for o in outputs})
+    staging = tempfile.mkdtemp(prefix=STAGING_PREFIX, dir=root)
+    staged = os.path.join(staging, 'new')
+    trash = os.path.join(staging, 'old')
+    os.mkdir(trash)
+    carried = []
+    swapped = []
+
+    try:
+        make_directories(outputs, staged)
+        write_outputs(outputs, staged, jobs=jobs)
+
+        for entry in top_level:
+            path = os.path.join(root, entry)
+            if os.path.isdir(path) and not os.path.islink(path):
+                carry_over(root, staged, entry, generated, carried)
+
+        for entry in top_level:
+            new, path, old = (os.path.join(d, entry) for d in (staged, root, trash))
+            is_dir = is_real_dir(new) or is_real_dir(path)
+            if is_dir:
+                # Folder yang sudah ada tidak bisa ditimpa os.replace: dipindah dulu
+                if os.path.lexists(path):
+                    os.replace(path, old)
+            elif os.path.lexists(path):
+                # File langsung ditimpa secara atomik; salinan lama untuk rollback
+                keep_backup(path, old)
+            # Folder ditukar dalam dua rename, jadi di antaranya folder itu sempat
+            # tidak ada; file ditimpa dengan satu rename
+            os.replace(new, path)
+            swapped.append((entry, is_dir))
+    except BaseException:
+        # Kembalikan tree lama apa adanya. Kalau ada yang gagal dikembalikan,
+        # staging tidak dihapus supaya isinya (misalnya app/build) tidak hilang.
+        restored = True
+        for entry, is_dir in reversed(swapped):
+            new, path, old = (os.path.join(d, entry) for d in (staged, root, trash))
+            try:
+                if is_dir:
+                    os.replace(path, new)
+                    if os.path.lexists(old):
+                        os.replace(old, path)
+                elif os.path.lexists(old):
+                    os.replace(old, path)
+                else:
+                    os.remove(path)
+            except OSError:
+                restored = False
+        for entry in reversed(carried):
+            try:
+                os.replace(os.path.join(staged, entry), os.path.join(root, entry))
+            except OSError:
+                restored = False
+        if restored:
+            shutil.rmtree(staging, ignore_errors=True)
+        else:
+            print(f"⚠️ Tree lama tidak bisa dikembalikan utuh, sisanya ada di {staging}", file=sys.stderr)
+        raise
+
+    shutil.rmtree(staging)
+    return carried
+
+def is_real_dir(path):
+    return os.path.isdir(path) and not os.path.islink(path)
+
+def keep_backup(path, backup):
+    # Hard link kalau bisa (tanpa copy), selain itu salinan biasa
+    import shutil
+    try:
+        os.link(path, backup, follow_symlinks=False)
+    except (OSError, NotImplementedError):
+        shutil.copy2(path, backup, follow_symlinks=False)
+
+def carry_over(root, staged, directory, generated, moved):
+    # Pindahkan (rename, bukan copy) isi tree lama yang bukan milik generator,
+    # misalnya app/build atau gradle/wrapper/gradle-wrapper.jar. Tiap entry dicatat
+    # di moved tepat setelah dipindah, supaya rollback tetap tahu walaupun
+    # pemindahan berikutnya gagal atau terputus.
+    for name in sorted(os.listdir(os.path.join(root, directory))):
+        entry = os.path.normpath(os.path.join(directory, name))
+        src = os.path.join(root, entry)
+        if entry in generated or in_generated_dir(entry):
+            continue
+        if os.path.isdir(src) and not os.path.islink(src) and any(g.startswith(entry + os.sep) for g in generated):
+            carry_over(root, staged, entry, generated, moved)
+            continue
+        os.makedirs(os.path.join(staged, directory), exist_ok=True)
+        os.replace(src, os.path.join(staged, entry))
+        moved.append(entry)
+
+def in_generated_dir(file_path):
+    return any(file_path == top or file_path.startswith(top + os.sep)
+               for top in map(os.path.normpath, GENERATED_DIRS))
+
+def load_variants(file_path):
+    import json
+    with open(file_path, encoding='utf-8') as f:
+        return [Variant.from_dict(spec) for spec in json.load(f)]
+
+def _init_worker(templates):
+    # Template yang sudah di-parse dikirim sekali per worker, bukan per varian
+    _TEMPLATES.update(templates)
+
+def _generate_variant(variant, target, incremental, profile):
+    return generate(target, Config(variant=variant, profile=profile, incremental=incremental, jobs=1))
+
+def generate_variants(variants, out_dir='variants', incremental=False, jobs=None, profile=None):
+    # Satu tree project per varian, dikerjakan paralel di process pool
+    from concurrent.futures import ProcessPoolExecutor
+    names = [v.name or v.application_id or v.package for v in variants]
+    if len(set(names)) != len(names):
+        raise ValueError("Nama varian harus unik")
+    profile = profile or GradleProfile()
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(compile_templates(),)) as pool:
+        futures = [pool.submit(_generate_variant, v, os.path.join(out_dir, name), incremental, profile)
+                   for v, name in zip(variants, names)]
+        return [f.result() for f in futures]
+
+def render_bytes(content, newline=None, encoding='utf-8'):
+    # Sama dengan open(..., 'w', newline=newline, encoding=encoding)
+    if newline is None:
+        newline = os.linesep
+    if newline != '\n':
+        content = content.replace('\n', newline)
+    if encoding is None:
+        import locale
+        encoding = locale.getpreferredencoding(False)
+    return content.encode(encoding)
+
+def file_digest(file_path):
+    import hashlib
+    h = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            h.update(chunk)
+    return h.digest()
+
+def is_unchanged(file_path, data):
+    import hashlib
+    try:
+        if os.path.getsize(file_path) != len(data):
+            return False
+        return file_digest(file_path) == hashlib.sha256(data).digest()
+    except OSError:
+        return False
+
+def write_output(o, root, incremental=False):
+    data = o.render_bytes()
+    file_path = os.path.join(root, o.path)
+
+    if incremental and is_unchanged(file_path, data):
+        if o.mode is not None and os.stat(file_path).st_mode & 0o777 != o.mode:
+            os.chmod(file_path, o.mode)
+        return 'skipped'
+
+    with open(file_path, 'wb') as f:
+        f.write(data)
+    if o.mode is not None:
+        os.chmod(file_path, o.mode)
+    return 'written'
+
+def find_stale_files(root, generated):
+    # File di folder milik generator yang tidak lagi dihasilkan
+    stale = []
+    for top in GENERATED_DIRS:
+        for dirpath, dirnames, filenames in os.walk(os.path.join(root, top)):
+            dirnames.sort()
+            for name in sorted(filenames):
+                file_path = os.path.normpath(os.path.relpath(os.path.join(dirpath, name), root))
+                if file_path not in generated:
+                    stale.append(file_path)
+    return stale
+
+def remove_stale_files(root, generated):
+    # Hapus file basi beserta folder yang jadi kosong
+    removed = find_stale_files(root, generated)
+    for file_path in removed:
+        os.remove(os.path.join(root, file_path))
+    for top in GENERATED_DIRS:
+        for dirpath, dirnames, filenames in os.walk(os.path.join(root, top), topdown=False):
+            if os.path.normpath(dirpath) != os.path.normpath(os.path.join(root, top)) and not os.listdir(dirpath):
+                os.rmdir(dirpath)
+    return removed
+
+def render_tree(outputs, jobs=None):
+    # Render seluruh project ke memori: path -> bytes
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        return dict(zip([o.path for o in outputs], pool.map(Output.render_bytes, outputs)))
+
+def read_file(file_path):
+    try:
+        with open(file_path, 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+def diff_lines(file_path, old, new):
+    import difflib
+    old_lines = old.decode('utf-8', 'replace').splitlines(keepends=True) if old is not None else []
+    new_lines = new.decode('utf-8', 'replace').splitlines(keepends=True) if new is not None else []
+    lines = list(difflib.unified_diff(
+        old_lines, new_lines,
+        fromfile=f"a/{file_path}" if old is not None else '/dev/null',
+        tofile=f"b/{file_path}" if new is not None else '/dev/null',
+    ))
+    # Baris terakhir tanpa newline tetap harus dipisah di output diff
+    return [line if line.endswith('\n') else line + '\n\\ No newline at end of file\n' for line in lines]
+
+def diff_tree(root, outputs, generated, result, jobs=None):
+    # Bandingkan render di memori dengan isi root; file dengan ukuran dan hash sama dilewati
+    tree = render_tree(outputs, jobs)
+    lines = []
+
+    for o in outputs:
+        file_path = os.path.join(root, o.path)
+        data = tree[o.path]
+        if is_unchanged(file_path, data):
+            mode = os.stat(file_path).st_mode & 0o777
+            if o.mode is not None and mode != o.mode:
+                lines.append(f"mode {o.path}: {oct(mode)} -> {oct(o.mode)}\n")
+                result.written.append(o.path)
+            else:
+                result.skipped.append(o.path)
+            continue
+        lines += diff_lines(o.path, read_file(file_path), data)
+        result.written.append(o.path)
+
+    for file_path in find_stale_files(root, generated):
+        lines += diff_lines(file_path, read_file(os.path.join(root, file_path)), None)
+        result.removed.append(file_path)
+
+    result.diff = ''.join(lines)
+    return result
+
+def archive_format(file_path):
+    for fmt, suffixes in (('zip', ('.zip',)), ('tar.gz', ('.tar.gz', '.tgz')), ('tar', ('.tar',))):
+        if file_path.endswith(suffixes):
+            return fmt
+    raise ValueError(f"Format arsip tidak dikenal untuk {file_path!r}; gunakan --archive-format")
+
+def write_archive(fileobj, fmt='zip', config=None, prefix=''):
+    # Tulis project langsung ke stream zip/tar tanpa menyentuh filesystem.
+    # Urutan entri dan timestamp tetap, sehingga hash arsip bisa dipakai sebagai cache key.
+    config = config or Config()
+    if fmt not in ARCHIVE_FORMATS:
+        raise ValueError(f"Format arsip tidak dikenal: {fmt!r}")
+    outputs = list_outputs(config.variant, config.profile)
+    tree = render_tree(outputs, config.jobs)
+    epoch = max(int(os.environ.get('SOURCE_DATE_EPOCH', ARCHIVE_EPOCH)), ARCHIVE_EPOCH)
+    result = Result(prefix)
+
+    if fmt == 'zip':
+        import time
+        import zipfile
+        with zipfile.ZipFile(fileobj, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for o in outputs:
+                info = zipfile.ZipInfo(prefix + o.path, date_time=time.gmtime(epoch)[:6])
+                info.create_system = 3  # unix, agar bit mode terbaca
+                info.external_attr = (0o100000 | (o.mode or 0o644)) << 16
+                info.compress_type = zipfile.ZIP_DEFLATED
+                archive.writestr(info, tree[o.path])
+                result.written.append(o.path)
+        return result
+
+    import gzip
+    import io
+    import tarfile
+    stream = gzip.GzipFile(filename='', mode='wb', fileobj=fileobj, mtime=epoch) if fmt == 'tar.gz' else fileobj
+    try:
+        with tarfile.open(fileobj=stream, mode='w|', format=tarfile.PAX_FORMAT) as archive:
+            for o in outputs:
+                data = tree[o.path]
+                info = tarfile.TarInfo(prefix + o.path)
+                info.size = len(data)
+                info.mtime = epoch
+                info.mode = o.mode or 0o644
+                info.uid = info.gid = 0
+                info.uname = info.gname = ''
+                archive.addfile(info, io.BytesIO(data))
+                result.written.append(o.path)
+    finally:
+        if stream is not fileobj:
+            stream.close()
+    return result
 
 if __name__ == "__main__":
-    create_screenshot_app()
\ No newline at end of file
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate project Android Screenshot App")
+    parser.add_argument('--root', default='.',
+                        help="folder tujuan project (default: direktori saat ini)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="hanya tulis file yang berubah dan pertahankan output build")
+    parser.add_argument('--jobs', type=int, default=None,
+                        help="jumlah thread untuk render dan tulis file")
+    parser.add_argument('--list', action='store_true',
+                        help="tampilkan semua file output tanpa menulis apa pun")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="tampilkan diff terhadap direktori kerja tanpa menulis atau menghapus apa pun")
+    parser.add_argument('--variants', metavar='FILE',
+                        help="file JSON berisi daftar spesifikasi varian untuk generate batch")
+    parser.add_argument('--out-dir', default='variants',
+                        help="folder tujuan generate batch, satu subfolder per varian")
+    parser.add_argument('--archive', metavar='FILE',
+                        help="tulis project langsung ke arsip zip/tar ('-' untuk stdout) tanpa menyentuh disk")
+    parser.add_argument('--archive-format', choices=ARCHIVE_FORMATS,
+                        help="format arsip (default: dari ekstensi FILE, zip untuk stdout)")
+    parser.add_argument('--archive-prefix', default='',
+                        help="folder induk untuk semua entri arsip, misalnya ScreenshotApp/")
+    parser.add_argument('--profile', choices=sorted(GRADLE_PROFILES), default=DEFAULT_PROFILE,
+                        help=f"profil performa untuk gradle.properties (default: {DEFAULT_PROFILE}, "
+                             "hasilnya sama di semua mesin; ci untuk runner CI; auto menyesuaikan "
+                             "dengan mesin ini dan mengubah gradle.properties yang di-commit)")
+    parser.add_argument('--memory-mb', type=int,
+                        help=f"RAM yang dipakai untuk menghitung profil (default: {REFERENCE_MEMORY_MB}, "
+                             "atau deteksi otomatis untuk profil auto)")
+    parser.add_argument('--cpus', type=int,
+                        help=f"jumlah CPU yang dipakai untuk menghitung profil (default: {REFERENCE_CPUS}, "
+                             "atau deteksi otomatis untuk profil auto)")
+    args = parser.parse_args()
+    profile = GradleProfile(args.profile, args.memory_mb, args.cpus)
+    
+    if args.archive:
+        fmt = args.archive_format or ('zip' if args.archive == '-' else archive_format(args.archive))
+        config = Config(profile=profile, jobs=args.jobs)
+        if args.archive == '-':
+            write_archive(sys.stdout.buffer, fmt, config, args.archive_prefix)
+        else:
+            with open(args.archive, 'wb') as f:
+                result = write_archive(f, fmt, config, args.archive_prefix)
+            print(f"📦 {args.archive}: {len(result.written)} file", file=sys.stderr)
+    elif args.variants:
+        for result in generate_variants(load_variants(args.variants), args.out_dir,
+                                        incremental=args.incremental, jobs=args.jobs, profile=profile):
+            print(f"📦 {result.root}: {len(result.written)} file ditulis")
+    elif args.dry_run:
+        result = generate(args.root, Config(profile=profile, dry_run=True, jobs=args.jobs))
+        sys.stdout.write(result.diff)
+        changed = len(result.written) + len(result.removed)
+        print(f"📊 {changed} file akan berubah" if changed else "✅ Tidak ada perubahan", file=sys.stderr)
+        sys.exit(1 if changed else 0)
+    elif args.list:
+        for o in list_outputs(profile=profile):
+            options = f"newline={o.newline!r} encoding={o.encoding!r}"
+            if o.mode is not None:
+                options += f" mode={oct(o.mode)}"
+            print(f"{o.path}\t{o.template}\t{options}")
+    else:
+        create_screenshot_app(incremental=args.incremental, jobs=args.jobs, root=args.root, profile=profile)
@@ -0,0 +1,67 @@
+package com.example.screenshotapp
+
+import org.openjdk.jmh.annotations.Benchmark
+import org.openjdk.jmh.annotations.Param
+import org.openjdk.jmh.annotations.Scope
+import org.openjdk.jmh.annotations.Setup
+import org.openjdk.jmh.annotations.State
+import java.nio.ByteBuffer
+import java.util.Random
+
+// Crop per baris dari buffer plane (dengan padding rowStride seperti ImageReader)
+// untuk beberapa ukuran layar dan jumlah rectangle
+@State(Scope.Benchmark)
+open class CropBenchmark {
+
+    @Param("720x1600", "1080x2400", "1440x3200")
+    var screen = "1080x2400"
+
+    @Param("1", "10", "100")
+    var rectangles = 10
+
+    private lateinit var plane: ByteBuffer
+    private lateinit var dst: ByteBuffer
+    private val store = RectangleStore()
+    private var width = 0
+    private var height = 0
+    private var rowStride = 0
+
+    @Setup
+    fun setup() {
+        val (w, h) = screen.split('x').map { it.toInt() }
+        width = w
+        height = h
+        // ImageReader biasanya menambah padding di ujung baris
+        rowStride = (width * PIXEL_STRIDE + 63) / 64 * 64
+        plane = ByteBuffer.allocateDirect(rowStride * height)
+        dst = ByteBuffer.allocateDirect(width * height * PIXEL_STRIDE)
+
+        store.clear()
+        val random = Random(42)
+        repeat(rectangles) {
+            val left = random.nextInt(width - 64).toFloat()
+            val top = random.nextInt(height - 64).toFloat()
+            val right = left + 64 + random.nextInt(width / 2)
+            val bottom = top + 64 + random.nextInt(height / 4)
+            store.add(left, top, right, bottom, it + 1)
+        }
+    }
+
+    @Benchmark
+    fun cropAll(): Int {
+        var bytes = 0
+        store.forEach { id ->
+            val region = RegionCropper.clip(
+                store.left(id), store.top(id), store.right(id), store.bottom(id), width, height
+            ) ?: return@forEach
+            dst.clear()
+            RegionCropper.copyRegion(plane, rowStride, PIXEL_STRIDE, region, dst)
+            bytes += dst.position()
+        }
+        return bytes
+    }
+
+    companion object {
+        const val PIXEL_STRIDE = 4
+    }
+}
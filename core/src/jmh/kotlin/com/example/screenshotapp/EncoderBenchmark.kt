@@ -0,0 +1,76 @@
+package com.example.screenshotapp
+
+import org.openjdk.jmh.annotations.Benchmark
+import org.openjdk.jmh.annotations.Param
+import org.openjdk.jmh.annotations.Scope
+import org.openjdk.jmh.annotations.Setup
+import org.openjdk.jmh.annotations.State
+import org.openjdk.jmh.annotations.TearDown
+import java.awt.image.BufferedImage
+import java.io.ByteArrayOutputStream
+import java.io.File
+import java.io.RandomAccessFile
+import java.nio.ByteBuffer
+import java.nio.channels.FileChannel
+import java.util.Random
+import javax.imageio.ImageIO
+
+// Throughput encode per crop. Bitmap.compress hanya ada di device, jadi JPEG/PNG di
+// sini memakai ImageIO sebagai pembanding relatif; raw menulis buffer RGBA ke
+// FileChannel persis seperti OutputEncoder.RAW_RGBA.
+@State(Scope.Benchmark)
+open class EncoderBenchmark {
+
+    @Param("raw", "png", "jpeg")
+    var format = "raw"
+
+    @Param("256x256", "1080x600")
+    var size = "256x256"
+
+    private lateinit var image: BufferedImage
+    private lateinit var pixels: ByteBuffer
+    private lateinit var file: File
+    private lateinit var channel: FileChannel
+    private val out = ByteArrayOutputStream()
+
+    @Setup
+    fun setup() {
+        val (width, height) = size.split('x').map { it.toInt() }
+        // Isi acak bergradasi: tidak terlalu mudah dikompres, tidak juga noise murni
+        val random = Random(42)
+        image = BufferedImage(width, height, BufferedImage.TYPE_INT_RGB)
+        for (y in 0 until height) {
+            for (x in 0 until width) {
+                image.setRGB(x, y, (x * 255 / width shl 16) or (y * 255 / height shl 8) or random.nextInt(32))
+            }
+        }
+        pixels = ByteBuffer.allocateDirect(width * height * 4)
+        file = File.createTempFile("encode", ".rgba")
+        channel = RandomAccessFile(file, "rw").channel
+    }
+
+    @TearDown
+    fun tearDown() {
+        channel.close()
+        file.delete()
+    }
+
+    @Benchmark
+    fun encode(): Long {
+        return when (format) {
+            "raw" -> {
+                channel.position(0)
+                pixels.rewind()
+                while (pixels.hasRemaining()) {
+                    channel.write(pixels)
+                }
+                channel.position()
+            }
+            else -> {
+                out.reset()
+                ImageIO.write(image, format, out)
+                out.size().toLong()
+            }
+        }
+    }
+}
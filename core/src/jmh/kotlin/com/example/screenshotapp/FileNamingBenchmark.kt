@@ -0,0 +1,30 @@
+package com.example.screenshotapp
+
+import org.openjdk.jmh.annotations.Benchmark
+import org.openjdk.jmh.annotations.Scope
+import org.openjdk.jmh.annotations.State
+
+// Penamaan file per region; burst memanggilnya untuk setiap region di setiap frame
+@State(Scope.Benchmark)
+open class FileNamingBenchmark {
+
+    private var number = 0
+
+    @Benchmark
+    fun single(): String = FileNaming.fileName("screenshot", next(), "jpg")
+
+    @Benchmark
+    fun burstRaw(): String = FileNaming.fileName("screenshot", next(), "rgba", number / 8, 1080 to 600)
+
+    // Pola lama dengan String.format, sebagai pembanding
+    @Benchmark
+    fun stringFormat(): String {
+        val n = next()
+        return "screenshot_${String.format("%03d", n)}_f${String.format("%05d", n / 8)}.jpg"
+    }
+
+    private fun next(): Int {
+        number = (number + 1) % 1000
+        return number
+    }
+}
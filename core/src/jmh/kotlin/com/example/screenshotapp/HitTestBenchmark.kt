@@ -0,0 +1,95 @@
+package com.example.screenshotapp
+
+import org.openjdk.jmh.annotations.Benchmark
+import org.openjdk.jmh.annotations.OperationsPerInvocation
+import org.openjdk.jmh.annotations.Param
+import org.openjdk.jmh.annotations.Scope
+import org.openjdk.jmh.annotations.Setup
+import org.openjdk.jmh.annotations.State
+import java.util.Random
+
+// Hit test sentuhan lewat SpatialIndex dibanding scan linear store, untuk 10-1000 region.
+// Tiap invocation menguji POINTS titik acak, jadi skor per operasi = satu sentuhan.
+@State(Scope.Benchmark)
+open class HitTestBenchmark {
+
+    @Param("10", "100", "1000")
+    var regions = 100
+
+    private val store = RectangleStore()
+    private lateinit var index: SpatialIndex
+    private val xs = FloatArray(POINTS)
+    private val ys = FloatArray(POINTS)
+
+    @Setup
+    fun setup() {
+        store.clear()
+        val random = Random(42)
+        repeat(regions) {
+            // Sudut acak, boleh terbalik seperti hasil drag
+            val x0 = random.nextFloat() * WIDTH
+            val y0 = random.nextFloat() * HEIGHT
+            val x1 = x0 + (random.nextFloat() - 0.5f) * 400f
+            val y1 = y0 + (random.nextFloat() - 0.5f) * 400f
+            store.addNormalized(x0, y0, x1, y1, it + 1)
+        }
+        index = SpatialIndex(store)
+        index.rebuild()
+
+        for (i in 0 until POINTS) {
+            xs[i] = random.nextFloat() * WIDTH
+            ys[i] = random.nextFloat() * HEIGHT
+        }
+    }
+
+    @Benchmark
+    @OperationsPerInvocation(POINTS)
+    fun grid(): Int {
+        var hits = 0
+        for (i in 0 until POINTS) {
+            if (index.findRectangleAt(xs[i], ys[i]) != RectangleStore.NO_ID) hits++
+        }
+        return hits
+    }
+
+    @Benchmark
+    @OperationsPerInvocation(POINTS)
+    fun linearScan(): Int {
+        var hits = 0
+        for (i in 0 until POINTS) {
+            var best = RectangleStore.NO_ID
+            store.forEach { id ->
+                if (store.hitTest(id, xs[i], ys[i])) best = id
+            }
+            if (best != RectangleStore.NO_ID) hits++
+        }
+        return hits
+    }
+
+    @Benchmark
+    @OperationsPerInvocation(POINTS)
+    fun corner(): Int {
+        var hits = 0
+        for (i in 0 until POINTS) {
+            val id = index.findRectangleAt(xs[i], ys[i])
+            if (id != RectangleStore.NO_ID && index.findCorner(xs[i], ys[i], id) != null) hits++
+        }
+        return hits
+    }
+
+    // Buat rectangle baru dari drag, daftarkan ke index, lalu hapus lagi
+    @Benchmark
+    fun addAndRemove(): Int {
+        val id = store.addNormalized(900f, 700f, 300f, 200f, 0)
+        index.insert(id)
+        index.remove(id)
+        store.remove(id)
+        return id
+    }
+
+    companion object {
+        const val POINTS = 1024
+        const val WIDTH = 1080f
+        const val HEIGHT = 2400f
+    }
+}
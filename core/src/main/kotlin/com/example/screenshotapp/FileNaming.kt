@@ -0,0 +1,15 @@
+package com.example.screenshotapp
+
+// Penamaan file output: name_NNN, ditambah _fFFFFF untuk frame burst dan _WxH untuk
+// RGBA mentah (ukuran tidak ada di dalam file). Nomor tidak pernah negatif, jadi
+// cukup padStart, tanpa String.format yang mem-parse pola di setiap panggilan.
+object FileNaming {
+
+    fun fileName(baseName: String, number: Int, extension: String, frame: Int? = null, size: Pair<Int, Int>? = null): String {
+        val name = StringBuilder(baseName.length + 24)
+        name.append(baseName).append('_').append(number.toString().padStart(3, '0'))
+        if (frame != null) name.append("_f").append(frame.toString().padStart(5, '0'))
+        if (size != null) name.append('_').append(size.first).append('x').append(size.second)
+        return name.append('.').append(extension).toString()
+    }
+}
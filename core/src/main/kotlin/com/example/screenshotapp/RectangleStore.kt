@@ -0,0 +1,189 @@
+package com.example.screenshotapp
+
+// Penyimpanan rectangle dalam bentuk struct-of-arrays: koordinat dan nomor di
+// FloatArray/IntArray per slot, tanpa objek per rectangle.
+// ID stabil selama rectangle hidup (slot + generasi, jadi ID lama tidak tertukar
+// dengan rectangle baru di slot yang sama), hapus O(1) per ID, dan urutan z di
+// array terpisah (bawah ke atas) yang dipadatkan secara berkala.
+class RectangleStore(initialCapacity: Int = 64) {
+
+    companion object {
+        const val NO_ID = -1
+        private const val SLOT_BITS = 20
+        private const val SLOT_MASK = (1 shl SLOT_BITS) - 1
+    }
+
+    private var lefts = FloatArray(initialCapacity)
+    private var tops = FloatArray(initialCapacity)
+    private var rights = FloatArray(initialCapacity)
+    private var bottoms = FloatArray(initialCapacity)
+    private var numbers = IntArray(initialCapacity)
+    private var generations = IntArray(initialCapacity)
+
+    // Posisi slot di array z, -1 kalau slot kosong
+    private var zPositions = IntArray(initialCapacity) { -1 }
+    private var slotCount = 0
+    private var freeSlots = IntArray(initialCapacity)
+    private var freeCount = 0
+
+    // ID dari bawah ke atas; NO_ID menandai bekas rectangle yang sudah dihapus
+    @PublishedApi internal var order = IntArray(initialCapacity)
+    @PublishedApi internal var orderCount = 0
+    private var holes = 0
+
+    var size = 0
+        private set
+
+    // Bertambah setiap ada perubahan, untuk cache seperti layer statis
+    var version = 0
+        private set
+
+    fun isEmpty(): Boolean = size == 0
+
+    fun add(left: Float, top: Float, right: Float, bottom: Float, number: Int): Int {
+        val slot = if (freeCount > 0) freeSlots[--freeCount] else newSlot()
+        lefts[slot] = left
+        tops[slot] = top
+        rights[slot] = right
+        bottoms[slot] = bottom
+        numbers[slot] = number
+
+        if (orderCount == order.size) order = order.copyOf(maxOf(16, order.size * 2))
+        val id = slot or (generations[slot] shl SLOT_BITS)
+        zPositions[slot] = orderCount
+        order[orderCount++] = id
+        size++
+        version++
+        return id
+    }
+
+    // Sudut boleh terbalik (hasil drag ke kiri/atas); disimpan sebagai kiri-atas/kanan-bawah
+    fun addNormalized(x0: Float, y0: Float, x1: Float, y1: Float, number: Int): Int =
+        add(minOf(x0, x1), minOf(y0, y1), maxOf(x0, x1), maxOf(y0, y1), number)
+
+    fun remove(id: Int): Boolean {
+        if (!contains(id)) return false
+        val slot = id and SLOT_MASK
+        order[zPositions[slot]] = NO_ID
+        zPositions[slot] = -1
+        retireSlot(slot)
+        size--
+        holes++
+        version++
+        if (holes > 16 && holes > orderCount / 2) compact()
+        return true
+    }
+
+    fun clear() {
+        for (i in 0 until orderCount) {
+            val id = order[i]
+            if (id == NO_ID) continue
+            val slot = id and SLOT_MASK
+            zPositions[slot] = -1
+            retireSlot(slot)
+        }
+        orderCount = 0
+        holes = 0
+        size = 0
+        version++
+    }
+
+    fun contains(id: Int): Boolean {
+        if (id < 0) return false
+        val slot = id and SLOT_MASK
+        return slot < slotCount && zPositions[slot] >= 0 && generations[slot] == id ushr SLOT_BITS
+    }
+
+    fun left(id: Int): Float = lefts[id and SLOT_MASK]
+    fun top(id: Int): Float = tops[id and SLOT_MASK]
+    fun right(id: Int): Float = rights[id and SLOT_MASK]
+    fun bottom(id: Int): Float = bottoms[id and SLOT_MASK]
+    fun number(id: Int): Int = numbers[id and SLOT_MASK]
+
+    // Posisi z; makin besar makin atas
+    fun zOrder(id: Int): Int = zPositions[id and SLOT_MASK]
+
+    fun setBounds(id: Int, left: Float, top: Float, right: Float, bottom: Float) {
+        val slot = id and SLOT_MASK
+        lefts[slot] = left
+        tops[slot] = top
+        rights[slot] = right
+        bottoms[slot] = bottom
+        version++
+    }
+
+    fun setNumber(id: Int, number: Int) {
+        numbers[id and SLOT_MASK] = number
+        version++
+    }
+
+    fun hitTest(id: Int, x: Float, y: Float): Boolean {
+        val slot = id and SLOT_MASK
+        return x >= lefts[slot] && x <= rights[slot] && y >= tops[slot] && y <= bottoms[slot]
+    }
+
+    // Iterasi dari bawah ke atas tanpa alokasi
+    inline fun forEach(action: (id: Int) -> Unit) {
+        for (i in 0 until orderCount) {
+            val id = order[i]
+            if (id != NO_ID) action(id)
+        }
+    }
+
+    // Salinan lepas untuk thread lain (crop, encode); ID tetap sama
+    fun copy(): RectangleStore {
+        val copy = RectangleStore(0)
+        copy.lefts = lefts.copyOf()
+        copy.tops = tops.copyOf()
+        copy.rights = rights.copyOf()
+        copy.bottoms = bottoms.copyOf()
+        copy.numbers = numbers.copyOf()
+        copy.generations = generations.copyOf()
+        copy.zPositions = zPositions.copyOf()
+        copy.slotCount = slotCount
+        copy.freeSlots = freeSlots.copyOf()
+        copy.freeCount = freeCount
+        copy.order = order.copyOf()
+        copy.orderCount = orderCount
+        copy.holes = holes
+        copy.size = size
+        copy.version = version
+        return copy
+    }
+
+    private fun newSlot(): Int {
+        if (slotCount == lefts.size) {
+            val capacity = maxOf(16, lefts.size * 2)
+            lefts = lefts.copyOf(capacity)
+            tops = tops.copyOf(capacity)
+            rights = rights.copyOf(capacity)
+            bottoms = bottoms.copyOf(capacity)
+            numbers = numbers.copyOf(capacity)
+            generations = generations.copyOf(capacity)
+            val oldSize = zPositions.size
+            zPositions = zPositions.copyOf(capacity)
+            zPositions.fill(-1, oldSize, capacity)
+        }
+        return slotCount++
+    }
+
+    private fun retireSlot(slot: Int) {
+        // Generasi naik supaya ID lama tidak pernah valid lagi; tetap 11 bit agar ID positif
+        generations[slot] = (generations[slot] + 1) and (-1 ushr (SLOT_BITS + 1))
+        if (freeCount == freeSlots.size) freeSlots = freeSlots.copyOf(maxOf(16, freeSlots.size * 2))
+        freeSlots[freeCount++] = slot
+    }
+
+    private fun compact() {
+        var count = 0
+        for (i in 0 until orderCount) {
+            val id = order[i]
+            if (id == NO_ID) continue
+            order[count] = id
+            zPositions[id and SLOT_MASK] = count
+            count++
+        }
+        orderCount = count
+        holes = 0
+    }
+}
@@ -0,0 +1,42 @@
+package com.example.screenshotapp
+
+import java.nio.ByteBuffer
+import kotlin.math.max
+import kotlin.math.min
+
+// Area crop dalam piksel, sudah dipotong ke batas frame
+data class CropRegion(val left: Int, val top: Int, val width: Int, val height: Int)
+
+// Matematika salin-baris untuk crop langsung dari plane ImageReader.
+// Murni Kotlin/JVM tanpa kelas Android, supaya bisa diuji dengan unit test biasa.
+object RegionCropper {
+
+    // Normalisasi rectangle (boleh terbalik atau keluar layar) ke dalam frame;
+    // null kalau hasilnya kosong
+    fun clip(left: Float, top: Float, right: Float, bottom: Float, frameWidth: Int, frameHeight: Int): CropRegion? {
+        val x0 = max(0, min(left, right).toInt())
+        val y0 = max(0, min(top, bottom).toInt())
+        val x1 = min(frameWidth, max(left, right).toInt())
+        val y1 = min(frameHeight, max(top, bottom).toInt())
+        if (x1 <= x0 || y1 <= y0) return null
+        return CropRegion(x0, y0, x1 - x0, y1 - y0)
+    }
+
+    fun byteCount(region: CropRegion, pixelStride: Int): Int = region.width * region.height * pixelStride
+
+    // Salin tiap baris region dari buffer plane (baris sepanjang rowStride, piksel
+    // berjarak pixelStride) ke dst yang rapat tanpa padding. Posisi src tidak berubah;
+    // posisi dst maju sebanyak byteCount(region, pixelStride).
+    fun copyRegion(src: ByteBuffer, rowStride: Int, pixelStride: Int, region: CropRegion, dst: ByteBuffer) {
+        val rowBytes = region.width * pixelStride
+        require(dst.remaining() >= rowBytes * region.height) { "Buffer tujuan terlalu kecil" }
+
+        val view = src.duplicate()
+        for (row in 0 until region.height) {
+            val start = (region.top + row) * rowStride + region.left * pixelStride
+            view.limit(start + rowBytes)
+            view.position(start)
+            dst.put(view)
+        }
+    }
+}
@@ -0,0 +1,146 @@
+package com.example.screenshotapp
+
+import kotlin.math.abs
+import kotlin.math.floor
+import kotlin.math.max
+import kotlin.math.min
+
+enum class Corner { TOP_LEFT, TOP_RIGHT, BOTTOM_LEFT, BOTTOM_RIGHT }
+
+// Grid seragam untuk hit test rectangle dan handle sudutnya di OverlayCanvas.
+// Tiap rectangle terdaftar di semua sel yang ditutupinya, tiap handle di sel yang
+// ditutupi kotak handle-nya, sehingga satu sentuhan hanya memeriksa isi satu sel.
+// Urutan z diambil dari RectangleStore: yang paling atas menang.
+class SpatialIndex(
+    private val store: RectangleStore,
+    private val cellSize: Float = DEFAULT_CELL_SIZE,
+    private val handleSize: Float = HANDLE_SIZE
+) {
+
+    companion object {
+        const val DEFAULT_CELL_SIZE = 128f
+        const val HANDLE_SIZE = 30f
+    }
+
+    private class Entry(val id: Int) {
+        val bodyCells = ArrayList<Long>()
+        val cornerCells = ArrayList<Long>()
+    }
+
+    private val bodies = HashMap<Long, ArrayList<Entry>>()
+    private val corners = HashMap<Long, ArrayList<Entry>>()
+    private val entries = HashMap<Int, Entry>()
+
+    val size: Int
+        get() = entries.size
+
+    // Bangun ulang dari isi store, misalnya setelah layout dimuat
+    fun rebuild() {
+        bodies.clear()
+        corners.clear()
+        entries.clear()
+        store.forEach { insert(it) }
+    }
+
+    fun insert(id: Int) {
+        if (entries.containsKey(id)) return
+        val entry = Entry(id)
+        entries[id] = entry
+        addCells(entry)
+    }
+
+    fun remove(id: Int) {
+        val entry = entries.remove(id) ?: return
+        removeCells(entry)
+    }
+
+    // Dipanggil setelah rectangle digeser atau di-resize
+    fun update(id: Int) {
+        val entry = entries[id] ?: return insert(id)
+        removeCells(entry)
+        addCells(entry)
+    }
+
+    // ID rectangle paling atas yang memuat titik (x, y), atau NO_ID
+    fun findRectangleAt(x: Float, y: Float): Int {
+        val candidates = bodies[cellKey(cell(x), cell(y))] ?: return RectangleStore.NO_ID
+        var best = RectangleStore.NO_ID
+        for (entry in candidates) {
+            if (store.hitTest(entry.id, x, y)) {
+                if (best == RectangleStore.NO_ID || store.zOrder(entry.id) > store.zOrder(best)) best = entry.id
+            }
+        }
+        return best
+    }
+
+    // Handle sudut milik rectangle id yang dekat dengan titik (x, y)
+    fun findCorner(x: Float, y: Float, id: Int): Corner? {
+        val candidates = corners[cellKey(cell(x), cell(y))] ?: return null
+        if (candidates.none { it.id == id }) return null
+
+        val left = store.left(id)
+        val top = store.top(id)
+        val right = store.right(id)
+        val bottom = store.bottom(id)
+        return when {
+            isNear(x, left) && isNear(y, top) -> Corner.TOP_LEFT
+            isNear(x, right) && isNear(y, top) -> Corner.TOP_RIGHT
+            isNear(x, left) && isNear(y, bottom) -> Corner.BOTTOM_LEFT
+            isNear(x, right) && isNear(y, bottom) -> Corner.BOTTOM_RIGHT
+            else -> null
+        }
+    }
+
+    private fun addCells(entry: Entry) {
+        val left = store.left(entry.id)
+        val top = store.top(entry.id)
+        val right = store.right(entry.id)
+        val bottom = store.bottom(entry.id)
+        addRange(bodies, entry, entry.bodyCells,
+            min(left, right), min(top, bottom), max(left, right), max(top, bottom))
+
+        for (cx in floatArrayOf(left, right)) {
+            for (cy in floatArrayOf(top, bottom)) {
+                addRange(corners, entry, entry.cornerCells,
+                    cx - handleSize, cy - handleSize, cx + handleSize, cy + handleSize)
+            }
+        }
+    }
+
+    private fun addRange(
+        grid: HashMap<Long, ArrayList<Entry>>,
+        entry: Entry,
+        cells: ArrayList<Long>,
+        left: Float, top: Float, right: Float, bottom: Float
+    ) {
+        for (cx in cell(left)..cell(right)) {
+            for (cy in cell(top)..cell(bottom)) {
+                val key = cellKey(cx, cy)
+                // Handle yang berdekatan bisa berbagi sel; cukup didaftarkan sekali
+                if (grid === corners && cells.contains(key)) continue
+                grid.getOrPut(key) { ArrayList() }.add(entry)
+                cells.add(key)
+            }
+        }
+    }
+
+    private fun removeCells(entry: Entry) {
+        removeFrom(bodies, entry, entry.bodyCells)
+        removeFrom(corners, entry, entry.cornerCells)
+    }
+
+    private fun removeFrom(grid: HashMap<Long, ArrayList<Entry>>, entry: Entry, cells: ArrayList<Long>) {
+        for (key in cells) {
+            val list = grid[key] ?: continue
+            list.remove(entry)
+            if (list.isEmpty()) grid.remove(key)
+        }
+        cells.clear()
+    }
+
+    private fun isNear(value: Float, target: Float): Boolean = abs(value - target) <= handleSize
+
+    private fun cell(value: Float): Int = floor(value / cellSize).toInt()
+
+    private fun cellKey(cx: Int, cy: Int): Long = (cx.toLong() shl 32) or (cy.toLong() and 0xffffffffL)
+}
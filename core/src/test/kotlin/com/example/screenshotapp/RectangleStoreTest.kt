@@ -0,0 +1,69 @@
+package com.example.screenshotapp
+
+import org.junit.Assert.assertEquals
+import org.junit.Assert.assertFalse
+import org.junit.Assert.assertNotEquals
+import org.junit.Assert.assertTrue
+import org.junit.Test
+
+class RectangleStoreTest {
+
+    @Test
+    fun staleIdIsInvalidAfterSlotIsReused() {
+        val store = RectangleStore()
+        val old = store.add(0f, 0f, 10f, 10f, 1)
+        store.remove(old)
+        // Slot yang sama dipakai lagi dengan generasi baru
+        val new = store.add(20f, 20f, 30f, 30f, 2)
+
+        assertNotEquals(old, new)
+        assertFalse(store.contains(old))
+        assertTrue(store.contains(new))
+        assertFalse(store.remove(old))
+        assertEquals(1, store.size)
+        assertEquals(2, store.number(new))
+    }
+
+    @Test
+    fun compactionKeepsZOrder() {
+        val store = RectangleStore()
+        val ids = IntArray(40) { store.add(it.toFloat(), 0f, it + 10f, 10f, it) }
+        // 21 lubang dari 40: lebih dari 16 dan lebih dari separuh, jadi array z dipadatkan
+        val removed = ids.filterIndexed { i, _ -> i % 2 == 0 } + ids[1]
+        removed.forEach { assertTrue(store.remove(it)) }
+
+        val expected = ids.filter { it !in removed }
+        assertEquals(expected, zOrderIds(store))
+        expected.forEachIndexed { z, id -> assertEquals(z, store.zOrder(id)) }
+
+        // Rectangle baru tetap paling atas
+        val top = store.add(0f, 0f, 5f, 5f, 99)
+        assertEquals(expected.size, store.zOrder(top))
+        assertEquals(expected + top, zOrderIds(store))
+    }
+
+    @Test
+    fun addAfterClearStartsFresh() {
+        val store = RectangleStore()
+        val old = List(3) { store.add(0f, 0f, 10f, 10f, it) }
+        store.clear()
+
+        assertTrue(store.isEmpty())
+        assertTrue(zOrderIds(store).isEmpty())
+        old.forEach { assertFalse(store.contains(it)) }
+
+        val id = store.add(1f, 2f, 3f, 4f, 7)
+        assertEquals(1, store.size)
+        assertEquals(listOf(id), zOrderIds(store))
+        assertEquals(0, store.zOrder(id))
+        assertEquals(2f, store.top(id), 0f)
+        assertEquals(7, store.number(id))
+        old.forEach { assertFalse(store.contains(it)) }
+    }
+
+    private fun zOrderIds(store: RectangleStore): List<Int> {
+        val result = ArrayList<Int>()
+        store.forEach { result.add(it) }
+        return result
+    }
+}
@@ -0,0 +1,105 @@
+package com.example.screenshotapp
+
+import org.junit.Assert.assertArrayEquals
+import org.junit.Assert.assertEquals
+import org.junit.Assert.assertNull
+import org.junit.Test
+import java.nio.ByteBuffer
+
+class RegionCropperTest {
+
+    @Test
+    fun clipKeepsRegionInsideFrame() {
+        assertEquals(CropRegion(10, 20, 30, 40), RegionCropper.clip(10f, 20f, 40f, 60f, 100, 100))
+    }
+
+    @Test
+    fun clipNormalizesInvertedRectangle() {
+        assertEquals(CropRegion(10, 20, 30, 40), RegionCropper.clip(40f, 60f, 10f, 20f, 100, 100))
+    }
+
+    @Test
+    fun clipCutsRectanglePartlyOffScreen() {
+        assertEquals(CropRegion(0, 0, 20, 30), RegionCropper.clip(-10f, -5f, 20f, 30f, 100, 100))
+        assertEquals(CropRegion(90, 80, 10, 20), RegionCropper.clip(90f, 80f, 150f, 200f, 100, 100))
+    }
+
+    @Test
+    fun clipReturnsNullForEmptyOrOffScreenRectangle() {
+        assertNull(RegionCropper.clip(120f, 10f, 150f, 40f, 100, 100))
+        assertNull(RegionCropper.clip(-50f, -50f, -10f, -10f, 100, 100))
+        assertNull(RegionCropper.clip(10f, 10f, 10f, 40f, 100, 100))
+    }
+
+    @Test
+    fun copyRegionSkipsRowStridePadding() {
+        // Frame 4x3, 4 byte per piksel, 4 byte padding di ujung tiap baris
+        val src = plane(width = 4, height = 3, pixelStride = 4, rowStride = 20)
+        val region = CropRegion(1, 1, 2, 2)
+        val dst = ByteBuffer.allocate(RegionCropper.byteCount(region, 4))
+
+        RegionCropper.copyRegion(src, 20, 4, region, dst)
+
+        assertEquals(dst.capacity(), dst.position())
+        assertEquals(0, src.position())
+        assertArrayEquals(expected(region, pixelStride = 4, rowStride = 20), dst.array())
+    }
+
+    @Test
+    fun copyRegionReadsLastRowWithoutPadding() {
+        // Baris terakhir plane ImageReader bisa lebih pendek dari rowStride
+        val width = 5
+        val height = 4
+        val rowStride = 24
+        val src = plane(width, height, pixelStride = 4, rowStride = rowStride)
+        assertEquals(rowStride * (height - 1) + width * 4, src.capacity())
+        val region = CropRegion(3, 2, 2, 2)
+        val dst = ByteBuffer.allocate(RegionCropper.byteCount(region, 4))
+
+        RegionCropper.copyRegion(src, rowStride, 4, region, dst)
+
+        assertArrayEquals(expected(region, pixelStride = 4, rowStride = rowStride), dst.array())
+    }
+
+    @Test
+    fun copyRegionWritesFromCurrentDestinationPosition() {
+        val src = plane(width = 4, height = 2, pixelStride = 4, rowStride = 16)
+        val region = CropRegion(0, 0, 1, 2)
+        val dst = ByteBuffer.allocate(3 + RegionCropper.byteCount(region, 4))
+        dst.position(3)
+
+        RegionCropper.copyRegion(src, 16, 4, region, dst)
+
+        assertEquals(dst.capacity(), dst.position())
+        assertEquals(0, dst.get(0).toInt())
+        assertEquals(16, dst.get(3 + 4).toInt())
+    }
+
+    @Test(expected = IllegalArgumentException::class)
+    fun copyRegionRejectsSmallDestination() {
+        val src = plane(width = 4, height = 4, pixelStride = 4, rowStride = 16)
+        RegionCropper.copyRegion(src, 16, 4, CropRegion(0, 0, 2, 2), ByteBuffer.allocate(15))
+    }
+
+    // Plane dengan byte = offset-nya (mod 256); baris terakhir tanpa padding
+    private fun plane(width: Int, height: Int, pixelStride: Int, rowStride: Int): ByteBuffer {
+        val size = rowStride * (height - 1) + width * pixelStride
+        val buffer = ByteBuffer.allocate(size)
+        for (i in 0 until size) {
+            buffer.put(i, i.toByte())
+        }
+        return buffer
+    }
+
+    private fun expected(region: CropRegion, pixelStride: Int, rowStride: Int): ByteArray {
+        val bytes = ByteArray(region.width * region.height * pixelStride)
+        var i = 0
+        for (row in 0 until region.height) {
+            val start = (region.top + row) * rowStride + region.left * pixelStride
+            for (offset in 0 until region.width * pixelStride) {
+                bytes[i++] = (start + offset).toByte()
+            }
+        }
+        return bytes
+    }
+}
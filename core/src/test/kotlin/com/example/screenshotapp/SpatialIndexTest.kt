@@ -0,0 +1,83 @@
+package com.example.screenshotapp
+
+import org.junit.Assert.assertEquals
+import org.junit.Assert.assertNull
+import org.junit.Test
+
+// Sel 128 px dan handle 30 px (nilai default)
+class SpatialIndexTest {
+
+    private val store = RectangleStore()
+    private val index = SpatialIndex(store)
+
+    private fun add(left: Float, top: Float, right: Float, bottom: Float): Int {
+        val id = store.add(left, top, right, bottom, store.size + 1)
+        index.insert(id)
+        return id
+    }
+
+    private fun remove(id: Int) {
+        store.remove(id)
+        index.remove(id)
+    }
+
+    @Test
+    fun topmostOverlappingRectangleWins() {
+        val bottom = add(0f, 0f, 200f, 200f)
+        val top = add(50f, 50f, 150f, 150f)
+
+        assertEquals(top, index.findRectangleAt(100f, 100f))
+        assertEquals(bottom, index.findRectangleAt(10f, 10f))
+        assertEquals(RectangleStore.NO_ID, index.findRectangleAt(300f, 300f))
+
+        remove(top)
+        assertEquals(bottom, index.findRectangleAt(100f, 100f))
+    }
+
+    @Test
+    fun handleIsFoundOnBothSidesOfCellBoundary() {
+        // Sudut kiri-atas tepat di batas sel x = 128; kotak handle-nya di sel 0 dan 1
+        val id = add(128f, 20f, 300f, 250f)
+
+        assertEquals(Corner.TOP_LEFT, index.findCorner(110f, 20f, id))
+        assertEquals(Corner.TOP_LEFT, index.findCorner(140f, 40f, id))
+        // Handle kanan-bawah melintasi batas y = 256
+        assertEquals(Corner.BOTTOM_RIGHT, index.findCorner(290f, 270f, id))
+        assertEquals(Corner.BOTTOM_RIGHT, index.findCorner(310f, 240f, id))
+        assertNull(index.findCorner(200f, 130f, id))
+        assertEquals(RectangleStore.NO_ID, index.findRectangleAt(110f, 30f))
+    }
+
+    @Test
+    fun updateFollowsMovedRectangle() {
+        val id = add(0f, 0f, 100f, 100f)
+        store.setBounds(id, 500f, 500f, 600f, 600f)
+        index.update(id)
+
+        assertEquals(RectangleStore.NO_ID, index.findRectangleAt(50f, 50f))
+        assertEquals(id, index.findRectangleAt(550f, 550f))
+        assertNull(index.findCorner(0f, 0f, id))
+        assertEquals(Corner.TOP_LEFT, index.findCorner(500f, 500f, id))
+        assertEquals(1, index.size)
+    }
+
+    @Test
+    fun removeLeavesIndexConsistent() {
+        val first = add(0f, 0f, 100f, 100f)
+        val second = add(20f, 20f, 120f, 120f)
+
+        remove(second)
+        // Menghapus ID yang sudah tidak ada tidak mengubah apa pun
+        index.remove(second)
+        assertEquals(1, index.size)
+        assertEquals(first, index.findRectangleAt(90f, 90f))
+        assertEquals(RectangleStore.NO_ID, index.findRectangleAt(110f, 110f))
+        assertNull(index.findCorner(120f, 120f, second))
+        assertEquals(Corner.BOTTOM_RIGHT, index.findCorner(100f, 100f, first))
+
+        // Rebuild menghasilkan isi yang sama dengan update bertahap
+        index.rebuild()
+        assertEquals(store.size, index.size)
+        assertEquals(first, index.findRectangleAt(50f, 50f))
+    }
+}
@@ -0,0 +1,73 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import build_apk
+
+class GenerateStagedRollbackTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        build_apk.generate(self.root, build_apk.Config(jobs=1))
+        # Isi lokal yang bukan milik generator dan harus selamat saat rollback
+        for entry in ('app/build/keep/f', 'app/zzz/g'):
+            path = os.path.join(self.root, entry)
+            os.makedirs(os.path.dirname(path))
+            with open(path, 'w') as f:
+                f.write(entry)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def interrupt(self, should_fail):
+        # os.replace yang gagal untuk pasangan path tertentu, sisanya normal
+        real_replace = os.replace
+
+        def replace(src, dst):
+            error = should_fail(os.path.relpath(src, self.root), os.path.relpath(dst, self.root))
+            if error:
+                raise error
+            real_replace(src, dst)
+        return mock.patch('os.replace', replace)
+
+    def staging_dirs(self):
+        return [n for n in os.listdir(self.root) if n.startswith(build_apk.STAGING_PREFIX)]
+
+    def read(self, entry):
+        with open(os.path.join(self.root, entry)) as f:
+            return f.read()
+
+    def test_interrupted_carry_over_restores_moved_entries(self):
+        # app/build sudah dipindah ke staging, lalu proses terputus saat memindah app/zzz
+        def should_fail(src, dst):
+            return KeyboardInterrupt() if src == os.path.join('app', 'zzz') else None
+
+        with self.interrupt(should_fail), self.assertRaises(KeyboardInterrupt):
+            build_apk.generate(self.root, build_apk.Config(jobs=1))
+
+        self.assertEqual(self.read('app/build/keep/f'), 'app/build/keep/f')
+        self.assertEqual(self.read('app/zzz/g'), 'app/zzz/g')
+        self.assertEqual(self.staging_dirs(), [])
+
+    def test_failed_restore_keeps_staging(self):
+        # Rollback app/build juga gagal: staging harus tetap ada beserta isinya
+        def should_fail(src, dst):
+            if src == os.path.join('app', 'zzz'):
+                return KeyboardInterrupt()
+            if dst == os.path.join('app', 'build'):
+                return OSError("disk penuh")
+            return None
+
+        with self.interrupt(should_fail), self.assertRaises(KeyboardInterrupt):
+            build_apk.generate(self.root, build_apk.Config(jobs=1))
+
+        staging = self.staging_dirs()
+        self.assertEqual(len(staging), 1)
+        kept = os.path.join(self.root, staging[0], 'new', 'app', 'build', 'keep', 'f')
+        self.assertTrue(os.path.exists(kept))
+        self.assertEqual(self.read('app/zzz/g'), 'app/zzz/g')
+
+if __name__ == '__main__':
+    unittest.main()